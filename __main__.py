@@ -6,9 +6,14 @@ from typing import List
 from app.application.service.llm_adapter import LLMCollection
 from app.application.application_container import ApplicationContainer
 from app.infrastructure.http.app import HttpApp
+from app.infrastructure.http.static_response_cache import StaticResponseCache
 from app.infrastructure.llm.gemini_llm import GeminiLLM
+from app.infrastructure.llm.gemini_client_pool import GeminiClientPool
+from app.infrastructure.llm.hedged_llm import HedgedLLM
+from app.infrastructure.llm.ollama_llm import OllamaLLM
 from app.infrastructure.prompt.gemini_prompt import GeminiPrompt
 from app.infrastructure.matcher.full_gita_matching import FullGitaMatching
+from app.infrastructure.matcher.embedding_gita_matching import EmbeddingGitaMatching
 from app.infrastructure.repository.mysql_chapter_repository import (
     MysqlChapterRepository,
 )
@@ -19,11 +24,43 @@ from app.infrastructure.repository.mysql_verse_translation_repository import (
 from app.infrastructure.repository.mysql_gita_repository import (
     MysqlGitaRepository,
 )
+from app.infrastructure.repository.corpus_snapshot import (
+    CorpusSnapshot,
+    json_corpus_loader,
+    json_source_fingerprint,
+    mysql_source_fingerprint,
+    repository_corpus_loader,
+)
+from app.infrastructure.repository.snapshot_chapter_repository import (
+    SnapshotChapterRepository,
+)
+from app.infrastructure.repository.snapshot_verse_repository import (
+    SnapshotVerseRepository,
+)
+from app.infrastructure.repository.snapshot_verse_translation_repository import (
+    SnapshotVerseTranslationRepository,
+)
+from app.infrastructure.repository.snapshot_gita_repository import (
+    SnapshotGitaRepository,
+)
 from app.infrastructure.searcher.chapter_searcher import ChapterSearcher
 from app.infrastructure.searcher.gita_searcher import (
     GitaSearcher,
 )
+from app.infrastructure.searcher.index_factory import IndexConfig
+from app.infrastructure.cache.memory_answer_cache import MemoryAnswerCache
+from app.infrastructure.cache.semantic_answer_cache import SemanticAnswerCache
+from app.infrastructure.cache.sqlite_answer_cache import SqliteAnswerCache
+from app.infrastructure.encoder.embedding_cache import EmbeddingCache
+from app.infrastructure.encoder.encoder_registry import EncoderRegistry
 from app.infrastructure.dbclient.mysql_client import MysqlClient
+from app.infrastructure.util.env import getenv_bool, getenv_float, getenv_int
+from app.infrastructure.util.executor import (
+    BoundedExecutor,
+    cpu_executor,
+    executor_stats,
+    io_executor,
+)
 
 load_dotenv()
 
@@ -35,37 +72,250 @@ def main():
         print("Please set GEMINI_API_KEYS environment variable")
         exit()
 
+    io_executor.configure(getenv_int("EXECUTOR_IO_WORKERS", io_executor.max_workers))
+    cpu_executor.configure(
+        getenv_int("EXECUTOR_CPU_WORKERS", cpu_executor.max_workers)
+    )
+
     gemini_keys: List[str] = json.loads(env_gemini_keys)
+    # One long-lived client per key, shared by every Gemini model
+    gemini_pool = GeminiClientPool(
+        gemini_keys,
+        rpm_per_key=getenv_int("GEMINI_RPM_PER_KEY", 15),
+        cooldown_seconds=getenv_float("GEMINI_KEY_COOLDOWN", 60),
+    )
     llm = GeminiLLM(
         "gemini-2.0-flash",
-        gemini_keys,
+        gemini_pool,
     )
     llm_intent = GeminiLLM(
         "gemini-2.0-flash-lite",
-        gemini_keys,
+        gemini_pool,
     )
 
-    mysql_client = MysqlClient()
+    # Hedge slow calls and fall back on errors, e.g.
+    # LLM_FALLBACK_MODELS=gemini-2.5-flash,ollama:deepseek-r1:7b
+    fallback_models = [x for x in (getenv("LLM_FALLBACK_MODELS") or "").split(",") if x]
+    if fallback_models:
+        fallbacks = [
+            (
+                OllamaLLM(x.removeprefix("ollama:"))  # type: ignore
+                if x.startswith("ollama:")
+                else GeminiLLM(x, gemini_pool)  # type: ignore
+            )
+            for x in fallback_models
+        ]
+        hedge_options = dict(
+            timeout=getenv_float("LLM_TIMEOUT", 30),
+            chunk_timeout=getenv_float("LLM_CHUNK_TIMEOUT", 10),
+            hedge_delay=getenv_float("LLM_HEDGE_DELAY", 2),
+        )
+        llm = HedgedLLM([llm, *fallbacks], **hedge_options)
+        llm_intent = HedgedLLM([llm_intent, *fallbacks], **hedge_options)
+
+    intent_classifier = getenv("INTENT_CLASSIFIER") or "llm"
+    if intent_classifier == "embedding":
+        gita_matching = EmbeddingGitaMatching(
+            min_similarity=getenv_float("INTENT_EMBEDDING_MIN_SIMILARITY", 0.88),
+            llm_fallback=getenv_bool("INTENT_EMBEDDING_LLM_FALLBACK", False),
+            rule_fast_path=getenv_bool("INTENT_RULE_FAST_PATH", True),
+        )
+    else:
+        gita_matching = FullGitaMatching(
+            rule_fast_path=getenv_bool("INTENT_RULE_FAST_PATH", True),
+        )
+
+    # Shared by both searchers, keys include the model id
+    embedding_cache = None
+    if getenv_int("EMBEDDING_CACHE_SIZE", 10000) > 0:
+        embedding_cache = EmbeddingCache(
+            max_size=getenv_int("EMBEDDING_CACHE_SIZE", 10000),
+            ttl=getenv_float("EMBEDDING_CACHE_TTL", 0),
+            persist_path=getenv("EMBEDDING_CACHE_PATH") or None,
+        )
+
+    # Point both searchers at the same model to keep a single copy in memory
+    encoder_registry = EncoderRegistry(
+        lazy=getenv_bool("EMBEDDING_LAZY_LOAD", True),
+        backend=getenv("EMBEDDING_BACKEND") or "torch",  # type: ignore
+    )
+    chapter_model = getenv("CHAPTER_EMBEDDING_MODEL") or ChapterSearcher.DEFAULT_MODEL
+    gita_model = getenv("GITA_EMBEDDING_MODEL") or GitaSearcher.DEFAULT_MODEL
+
+    batch_window_ms = getenv_float("EMBEDDING_BATCH_WINDOW_MS", 0)
+    batch_max_size = getenv_int("EMBEDDING_BATCH_MAX_SIZE", 32)
+
+    answer_cache_backend = getenv("ANSWER_CACHE_BACKEND") or "memory"
+    answer_cache_options = dict(
+        max_size=getenv_int("ANSWER_CACHE_SIZE", 1000),
+        ttl=getenv_float("ANSWER_CACHE_TTL", 86400),
+        # Random verse intents get a different context on every call
+        skip_actions=(
+            getenv("ANSWER_CACHE_SKIP_INTENTS")
+            or "get_random_verses,get_sample_verses"
+        ).split(","),
+    )
+    answer_cache = None
+    if answer_cache_backend == "memory":
+        answer_cache = MemoryAnswerCache(**answer_cache_options)
+    elif answer_cache_backend == "sqlite":
+        answer_cache = SqliteAnswerCache(
+            path=getenv("ANSWER_CACHE_PATH") or "data/model/answer_cache.sqlite3",
+            **answer_cache_options,
+        )
+
+    corpus_source = getenv("CORPUS_SOURCE") or "mysql"
+    mysql_client = MysqlClient() if corpus_source == "mysql" else None
+    repositories = {}
+    if mysql_client:
+        repositories = dict(
+            chapter_repository=MysqlChapterRepository(client=mysql_client),
+            verse_repository=MysqlVerseRepository(client=mysql_client),
+            verse_translation_repository=MysqlVerseTranslationRepository(
+                client=mysql_client
+            ),
+            gita_repository=MysqlGitaRepository(
+                client=mysql_client,
+                use_gita_view=getenv_bool("DB_USE_GITA_VIEW", False),
+            ),
+        )
+
+    # The dataset is small and read-only, serve it from memory
+    corpus_snapshot = None
+    if corpus_source == "json" or getenv_bool("CORPUS_SNAPSHOT", True):
+        if mysql_client:
+            corpus_snapshot = CorpusSnapshot(
+                repository_corpus_loader(
+                    repositories["chapter_repository"],
+                    repositories["verse_repository"],
+                    repositories["verse_translation_repository"],
+                ),
+                source_fingerprint=mysql_source_fingerprint(mysql_client),
+                watch_interval=getenv_float("CORPUS_RELOAD_INTERVAL", 0),
+            )
+        else:
+            corpus_directory = getenv("CORPUS_JSON_DIR") or "data/3-fine-verse_number"
+            corpus_snapshot = CorpusSnapshot(
+                json_corpus_loader(corpus_directory),
+                source_fingerprint=json_source_fingerprint(corpus_directory),
+                watch_interval=getenv_float("CORPUS_RELOAD_INTERVAL", 0),
+            )
+        repositories = dict(
+            chapter_repository=SnapshotChapterRepository(corpus_snapshot),
+            verse_repository=SnapshotVerseRepository(corpus_snapshot),
+            verse_translation_repository=SnapshotVerseTranslationRepository(
+                corpus_snapshot
+            ),
+            gita_repository=SnapshotGitaRepository(corpus_snapshot),
+        )
+
     app_container = ApplicationContainer(
         # ONLY CAN USE ONE LLM INSTANCE DUE TO Out-Of-Memory
         llm_collection=LLMCollection(
             general=llm, intent_classifier=llm_intent, paraphrase=llm
         ),
-        chapter_repository=MysqlChapterRepository(client=mysql_client),
-        verse_repository=MysqlVerseRepository(client=mysql_client),
-        verse_translation_repository=MysqlVerseTranslationRepository(
-            client=mysql_client
+        **repositories,
+        chapter_searcher=ChapterSearcher(
+            index_config=IndexConfig.from_env("CHAPTER"),
+            encoder=encoder_registry.get(chapter_model),
+            embedding_cache=embedding_cache,
+            batch_window_ms=batch_window_ms,
+            batch_max_size=batch_max_size,
+        ),
+        gita_searcher=GitaSearcher(
+            index_config=IndexConfig.from_env("GITA"),
+            encoder=encoder_registry.get(gita_model),
+            embedding_cache=embedding_cache,
+            batch_window_ms=batch_window_ms,
+            batch_max_size=batch_max_size,
+            hybrid_search=getenv_bool("GITA_HYBRID_SEARCH", False),
+            hybrid_budget=getenv_int("GITA_HYBRID_BUDGET", 20),
+            rrf_k=getenv_int("GITA_RRF_K", 60),
+            lexical_short_circuit_terms=getenv_int(
+                "GITA_LEXICAL_SHORT_CIRCUIT_TERMS", 3
+            ),
+            lexical_min_score=getenv_float("GITA_LEXICAL_MIN_SCORE", 8.0),
         ),
-        gita_repository=MysqlGitaRepository(client=mysql_client),
-        chapter_searcher=ChapterSearcher(),
-        gita_searcher=GitaSearcher(),
         prompt_builder=GeminiPrompt(),
         pattern_matching_services=[
             # Still on development
-            FullGitaMatching()
+            gita_matching
         ],
+        answer_cache=answer_cache,
+    )
+    # Paraphrases reuse answers, matched on the gita searcher's query embedding
+    if answer_cache and getenv_bool("ANSWER_CACHE_SEMANTIC", False):
+        app_container.answer_cache = SemanticAnswerCache(
+            answer_cache,
+            embed=app_container.gita_searcher.encode_query,
+            min_similarity=getenv_float("ANSWER_CACHE_SEMANTIC_MIN_SIMILARITY", 0.94),
+            max_size=answer_cache_options["max_size"],
+            ttl=answer_cache_options["ttl"],
+            audit_rate=getenv_float("ANSWER_CACHE_AUDIT_RATE", 0),
+            embed_answers=app_container.gita_searcher.encode_passages,
+        )
+    app_container.stats_providers["gemini"] = gemini_pool.stats
+    if isinstance(llm, HedgedLLM):
+        app_container.stats_providers["llm_general"] = llm.stats
+        app_container.stats_providers["llm_intent"] = llm_intent.stats
+    app_container.stats_providers["executors"] = executor_stats
+    if corpus_snapshot:
+        app_container.stats_providers["corpus"] = corpus_snapshot.stats
+    app_container.stats_providers["encoders"] = encoder_registry.stats
+    if app_container.answer_cache:
+        app_container.stats_providers["answer_cache"] = app_container.answer_cache.stats
+    if embedding_cache:
+        app_container.stats_providers["embedding_cache"] = embedding_cache.stats
+    for name, searcher in (
+        ("chapter", app_container.chapter_searcher),
+        ("gita", app_container.gita_searcher),
+    ):
+        if searcher.batcher:
+            app_container.stats_providers[f"{name}_encoder_batching"] = (
+                searcher.batcher.stats
+            )
+        app_container.stats_providers[f"{name}_index"] = searcher.index_stats
+    response_cache = None
+    if getenv_bool("HTTP_RESPONSE_CACHE", True):
+        response_cache = StaticResponseCache(
+            max_age=getenv_int("HTTP_CACHE_MAX_AGE", 3600)
+        )
+        app_container.stats_providers["response_cache"] = response_cache.stats
+        # A reloaded corpus changes the payloads and their ETags
+        if corpus_snapshot:
+            corpus_snapshot.on_reload(lambda _: response_cache.clear())
+
+    speculation_workers = getenv_int("SPECULATIVE_RETRIEVAL_WORKERS", 2)
+    app = HttpApp(
+        app=app_container,
+        response_cache=response_cache,
+        # Models and indexes are loaded once and shared by forked workers
+        workers=getenv_int("HTTP_WORKERS", 1),
+        port=getenv_int("HTTP_PORT", 8000),
+        speculative_retrieval=getenv_bool("SPECULATIVE_RETRIEVAL", False),
+        # Its own small pool, a busy pool skips speculation instead of
+        # queueing searches in front of the requests' own encodes
+        executor=BoundedExecutor("speculation", speculation_workers),
+        max_speculations=speculation_workers,
+        background_index_update=getenv_bool("INDEX_BACKGROUND_UPDATE", True),
     )
-    app = HttpApp(app=app_container)
+    # Only the changed verses are re-embedded, the old index serves meanwhile
+    if corpus_snapshot:
+        corpus_snapshot.on_reload(lambda _: app.refresh_indexes())
+    if corpus_snapshot and app.workers > 1:
+        # Only the first worker watches the source and rebuilds, the others
+        # reload the corpus and the indexes it wrote once it published them
+        generation_path = (
+            getenv("CORPUS_GENERATION_PATH") or "data/model/corpus.generation"
+        )
+        corpus_snapshot.stop_watching()
+        app.on_worker_start(
+            lambda i: (
+                corpus_snapshot.watch_source(generation_path)
+                if i == 0
+                else corpus_snapshot.watch_generation(generation_path)
+            )
+        )
     app.run()
 
 
@@ -1,7 +1,11 @@
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import List
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Tuple
 
 from app.application.application_container import ApplicationContainer
+from app.application.service.searcher import Searcher
 
 from rich.console import Console  # harmfull
 from app.domain.entity.chapter_entity import ChapterEntity
@@ -13,9 +17,43 @@ class ApplicationConstruct(ABC):
     def __init__(
         self,
         app: ApplicationContainer,
+        speculative_retrieval: bool = False,
+        # Anything with `submit(func, *args)` returning a Future, keep it
+        # apart from the pools the request itself waits on
+        executor=None,
+        # Searches started ahead at once, further questions don't speculate
+        max_speculations: int = 2,
+        # Apply corpus changes to a loaded index without blocking startup
+        background_index_update: bool = True,
     ):
         self.console = Console()
         self.app: ApplicationContainer = app
+        # Run the semantic search while the intent matchers are still working,
+        # the result is thrown away when an intent answers the question
+        self.speculative_retrieval = speculative_retrieval
+        self.executor = executor
+        self.max_speculations = max_speculations
+        self.running_speculations = 0
+        self.background_index_update = background_index_update
+        # False in processes that only reload the indexes another process
+        # built, e.g. every prefork worker but the first
+        self.builds_indexes = True
+        self.speculation_lock = threading.Lock()
+        self.speculation = {
+            "runs": 0,
+            "used": 0,
+            "discarded": 0,
+            "cancelled": 0,
+            # Not started, a rule already answered or the pool was busy
+            "skipped_rule": 0,
+            "skipped_busy": 0,
+            "saved_seconds": 0.0,
+        }
+        if speculative_retrieval:
+            self.executor = executor or ThreadPoolExecutor(
+                max_workers=max_speculations
+            )
+            self.app.stats_providers["speculative_retrieval"] = self.speculation_stats
 
     def prepare_model(self):
         self.app.llm_collection.general.setup("general")
@@ -25,10 +63,7 @@ class ApplicationConstruct(ABC):
         # Load chapter model
         self.console.print("[blue][INFO][/blue] Memuat model [b]chapter[/b]...")
         chapters = self.app.chapter_repository.get_all()
-        if self.app.chapter_searcher.builded():
-            self.app.chapter_searcher.load_index()
-        else:
-            self.app.chapter_searcher.build_index(chapters)
+        self.__prepare_searcher("chapter", self.app.chapter_searcher, chapters)
 
         self.console.print(
             f"[blue][INFO][/blue] Berhasil memuat {len(chapters)} baris data."
@@ -39,14 +74,70 @@ class ApplicationConstruct(ABC):
             "[blue][INFO][/blue] Memuat model [b]verse translation[/b]..."
         )
         complete_gita = self.app.gita_repository.get_all()
-        if self.app.gita_searcher.builded():
-            self.app.gita_searcher.load_index()
-        else:
-            self.app.gita_searcher.build_index(complete_gita)
+        self.__prepare_searcher("gita", self.app.gita_searcher, complete_gita)
         self.console.print(
             f"[blue][INFO][/blue] Berhasil memuat {len(complete_gita)} baris data."
         )
 
+    def refresh_indexes(self):
+        """Bring both indexes up to date with the repositories, e.g. after a reload."""
+        if not self.builds_indexes:
+            for searcher in (self.app.chapter_searcher, self.app.gita_searcher):
+                if searcher.builded():
+                    searcher.load_index()
+            return
+
+        self.__update_index(
+            "chapter", self.app.chapter_searcher, self.app.chapter_repository.get_all()
+        )
+        self.__update_index(
+            "gita", self.app.gita_searcher, self.app.gita_repository.get_all()
+        )
+
+    def __prepare_searcher(self, name: str, searcher: Searcher, data):
+        if not searcher.builded():
+            # Still reuses the stored embeddings of unchanged entries
+            searcher.build_index(data)
+            return
+
+        searcher.load_index()
+        self.__update_index(name, searcher, data)
+
+    def __update_index(self, name: str, searcher: Searcher, data):
+        if not searcher.needs_update(data):
+            return
+
+        if not self.background_index_update:
+            self.console.print(
+                f"[yellow][INDEX][/yellow] Korpus berubah, memperbarui indeks "
+                f"[b]{name}[/b]..."
+            )
+            searcher.build_index(data)
+            return
+
+        self.console.print(
+            f"[yellow][INDEX][/yellow] Korpus berubah, indeks [b]{name}[/b] "
+            "diperbarui di latar belakang, indeks lama tetap dipakai."
+        )
+
+        def update():
+            start_time = time.perf_counter()
+            try:
+                searcher.build_index(data)
+            except Exception as e:
+                self.console.print(
+                    f"[red][INDEX][/red] Gagal memperbarui indeks {name}: {e}"
+                )
+                return
+            self.console.print(
+                f"[yellow][INDEX][/yellow] Indeks [b]{name}[/b] diperbarui dalam "
+                f"{time.perf_counter() - start_time:.1f} detik."
+            )
+
+        threading.Thread(
+            target=update, name=f"index-update-{name}", daemon=True
+        ).start()
+
     def prepare_matcher(self):
         for matcher in self.app.pattern_matching_services:
             matcher.set_app(self.app)
@@ -54,22 +145,99 @@ class ApplicationConstruct(ABC):
     def get_context(
         self, user_input: str
     ) -> List[GitaEntity | MixedGitaEntity] | PatternMatchingResult | None:
+        speculative_search = None
+        if self.speculative_retrieval:
+            speculative_search = self.__speculate(user_input)
+
         results = None
         for pattern_matching_service in self.app.pattern_matching_services:
             matching_result = pattern_matching_service.match(user_input)
             if matching_result:
                 results = pattern_matching_service.handle(user_input, matching_result)
                 if results:
+                    results.action = results.action or matching_result["action"]
                     break
 
-        if not results:
-            self.console.print(
-                "[yellow][AI][/yellow] Menggunakan model [b]FULL GITA SEARCH[/b]..."
-            )
-            results = self.app.gita_searcher.search(user_input)
+        if results:
+            if speculative_search:
+                self.__discard_speculation(speculative_search)
+            return results
+
+        self.console.print(
+            "[yellow][AI][/yellow] Menggunakan model [b]FULL GITA SEARCH[/b]..."
+        )
+        if speculative_search:
+            return self.__use_speculation(speculative_search)
+        return self.app.gita_searcher.search(user_input)
+
+    def __speculate(self, user_input: str) -> Future | None:
+        # Intents the rules recognize never fall through to the search
+        if any(x.fast_match(user_input) for x in self.app.pattern_matching_services):
+            with self.speculation_lock:
+                self.speculation["skipped_rule"] += 1
+            return None
 
+        with self.speculation_lock:
+            if self.running_speculations >= self.max_speculations:
+                self.speculation["skipped_busy"] += 1
+                return None
+            self.running_speculations += 1
+        future = self.executor.submit(self.__timed_search, user_input)
+        future.add_done_callback(self.__speculation_done)
+        return future
+
+    def __speculation_done(self, _: Future):
+        with self.speculation_lock:
+            self.running_speculations -= 1
+
+    def __timed_search(
+        self, user_input: str
+    ) -> Tuple[List[GitaEntity | MixedGitaEntity], float]:
+        start_time = time.perf_counter()
+        results = self.app.gita_searcher.search(user_input)
+        return results, time.perf_counter() - start_time
+
+    def __use_speculation(
+        self, speculative_search: Future
+    ) -> List[GitaEntity | MixedGitaEntity]:
+        start_time = time.perf_counter()
+        results, search_seconds = speculative_search.result()
+        waited_seconds = time.perf_counter() - start_time
+        with self.speculation_lock:
+            self.speculation["runs"] += 1
+            self.speculation["used"] += 1
+            # Sequentially the whole search would have run after the matchers
+            self.speculation["saved_seconds"] += max(
+                0.0, search_seconds - waited_seconds
+            )
         return results
 
+    def __discard_speculation(self, speculative_search: Future):
+        cancelled = speculative_search.cancel()
+        with self.speculation_lock:
+            self.speculation["runs"] += 1
+            self.speculation["discarded"] += 1
+            self.speculation["cancelled"] += int(cancelled)
+
+    def speculation_stats(self) -> dict:
+        with self.speculation_lock:
+            used = self.speculation["used"]
+            return {
+                **self.speculation,
+                "running": self.running_speculations,
+                "saved_seconds": round(self.speculation["saved_seconds"], 3),
+                "avg_saved_ms": (
+                    round(self.speculation["saved_seconds"] / used * 1000, 1)
+                    if used
+                    else 0.0
+                ),
+            }
+
+    def get_stats(self) -> dict:
+        return {
+            name: provider() for name, provider in self.app.stats_providers.items()
+        }
+
     @abstractmethod
     def run(self):
         pass
@@ -1,5 +1,5 @@
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List
 
 from app.application.repository.chapter_repository import ChapterRepository
 from app.application.repository.verse_repository import VerseRepository
@@ -9,6 +9,7 @@ from app.application.repository.verse_translation_repository import (
 from app.application.repository.gita_repository import (
     GitaRepository,
 )
+from app.application.service.answer_cache import AnswerCache
 from app.application.service.llm_adapter import LLMCollection
 from app.application.service.pattern_matching import PatternMatching
 from app.application.service.searcher import Searcher
@@ -26,3 +27,6 @@ class ApplicationContainer:
     gita_searcher: Searcher
     prompt_builder: PromptBuilder
     pattern_matching_services: List[PatternMatching]
+    # Named counters exposed on /stats, e.g. {"embedding_cache": cache.stats}
+    stats_providers: Dict[str, Callable[[], dict]] = field(default_factory=dict)
+    answer_cache: AnswerCache | None = None
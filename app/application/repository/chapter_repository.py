@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 from typing import List
 
 from app.domain.entity.chapter_entity import ChapterEntity
+from app.domain.entity.chapter_detail_entity import ChapterDetailEntity
 
 
 class ChapterRepository(ABC):
@@ -16,3 +17,8 @@ class ChapterRepository(ABC):
     @abstractmethod
     def get_chapter_by_id(self, chapter_id: int) -> ChapterEntity | None:
         pass
+
+    @abstractmethod
+    def get_detail_by_number(self, chapter_number: int) -> ChapterDetailEntity | None:
+        """The chapter with all its verses and their translations."""
+        pass
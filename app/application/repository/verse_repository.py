@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 from typing import List
 
 from app.domain.entity.verse_entity import VerseEntity
+from app.domain.entity.verse_detail_entity import VerseDetailEntity
 
 
 class VerseRepository(ABC):
@@ -24,3 +25,10 @@ class VerseRepository(ABC):
     @abstractmethod
     def get_by_verse_id(self, verse_id) -> VerseEntity:
         pass
+
+    @abstractmethod
+    def get_detail_by_chapter_verse_number(
+        self, chapter_number: int, verse_number: int
+    ) -> VerseDetailEntity | None:
+        """The verse together with its translations."""
+        pass
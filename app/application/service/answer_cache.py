@@ -0,0 +1,27 @@
+from abc import ABC, abstractmethod
+from typing import List, Set
+
+
+class AnswerCache(ABC):
+    """
+    Final LLM answers keyed on the normalized question and the labels of
+    the context the prompt was built from.
+    """
+
+    # Intents whose context changes between calls (random verses)
+    skip_actions: Set[str] = set()
+
+    def cacheable(self, action: str | None) -> bool:
+        return action not in self.skip_actions
+
+    @abstractmethod
+    def get(self, question: str, labels: List[str]) -> str | None:
+        pass
+
+    @abstractmethod
+    def set(self, question: str, labels: List[str], answer: str):
+        pass
+
+    @abstractmethod
+    def stats(self) -> dict:
+        pass
@@ -0,0 +1,14 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+
+class Encoder(ABC):
+    @property
+    @abstractmethod
+    def model_id(self) -> str:
+        pass
+
+    @abstractmethod
+    def encode(self, texts: List[str], normalize: bool = False):
+        """Return a float32 numpy array with one embedding per text."""
+        pass
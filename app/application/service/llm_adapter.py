@@ -1,6 +1,7 @@
+import asyncio
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
 from app.domain.value_object.llm_stream import LLMStream
 
@@ -20,6 +21,25 @@ class LLMAdapter(ABC):
     ) -> Generator[LLMStream, str, None]:
         pass
 
+    async def agenerate(self, prompt: str, max_tokens: int = 256) -> str:
+        """Non-blocking `generate`, adapters with an async client override it."""
+        return await asyncio.to_thread(self.generate, prompt, max_tokens)
+
+    async def agenerate_stream(
+        self, prompt: str, max_tokens: int = 256
+    ) -> AsyncGenerator[LLMStream, None]:
+        """
+        Non-blocking `generate_stream`. The default pulls the blocking
+        generator one chunk at a time from a worker thread.
+        """
+        stream = self.generate_stream(prompt, max_tokens)
+        end = object()
+        while True:
+            chunk = await asyncio.to_thread(next, stream, end)
+            if chunk is end:
+                break
+            yield chunk
+
 
 @dataclass
 class LLMCollection:
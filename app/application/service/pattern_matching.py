@@ -15,6 +15,10 @@ class PatternMatching(ABC):
     def match(self, user_input: str) -> None | dict:
         pass
 
+    def fast_match(self, user_input: str) -> None | dict:
+        """The part of `match` that needs no LLM call, None when unsure."""
+        return None
+
     @abstractmethod
     def handle(
         self, user_input: str, matching_result: dict
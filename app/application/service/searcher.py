@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import List
 
 
 class Searcher(ABC):
@@ -14,6 +15,14 @@ class Searcher(ABC):
     def load_index(self) -> bool:
         pass
 
+    def needs_update(self, data) -> bool:
+        """Whether `data` differs from what the loaded index was built from."""
+        return False
+
     @abstractmethod
     def search(self, query: str):
         pass
+
+    @abstractmethod
+    def encode(self, texts: List[str]):
+        pass
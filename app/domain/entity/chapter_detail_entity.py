@@ -0,0 +1,17 @@
+from dataclasses import dataclass
+from typing import List
+
+from app.domain.entity.chapter_entity import ChapterEntity
+from app.domain.entity.verse_detail_entity import VerseDetailEntity
+
+
+@dataclass
+class ChapterDetailEntity:
+    chapter: ChapterEntity
+    verses: List[VerseDetailEntity]
+
+    def to_dict(self):
+        return {
+            **self.chapter.to_dict(),
+            "verses": [x.to_dict() for x in self.verses],
+        }
@@ -0,0 +1,17 @@
+from dataclasses import dataclass
+from typing import List
+
+from app.domain.entity.verse_entity import VerseEntity
+from app.domain.entity.verse_translation_entity import VerseTranslationEntity
+
+
+@dataclass
+class VerseDetailEntity:
+    verse: VerseEntity
+    translations: List[VerseTranslationEntity]
+
+    def to_dict(self):
+        return {
+            **self.verse.to_dict(),
+            "translations": [x.to_dict() for x in self.translations],
+        }
@@ -24,3 +24,5 @@ class PatternMatchingResult:
     type: ResultType = "direct"
     output: str = ""
     context: List[PatternMatchingContext] = field(default_factory=list)
+    # Intent that produced the result, e.g. "get_specific_verse"
+    action: str | None = None
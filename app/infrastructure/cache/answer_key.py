@@ -0,0 +1,10 @@
+import hashlib
+from typing import List
+
+from app.infrastructure.util.text import normalize_text
+
+
+def answer_key(question: str, labels: List[str]) -> str:
+    """Hash of what the prompt is built from: the question and its context."""
+    material = "\x1f".join([normalize_text(question), *labels])
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
@@ -0,0 +1,69 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, List, Tuple
+
+from app.application.service.answer_cache import AnswerCache
+from app.infrastructure.cache.answer_key import answer_key
+
+
+class MemoryAnswerCache(AnswerCache):
+    """Bounded LRU answer cache with optional TTL, local to the worker."""
+
+    def __init__(
+        self,
+        max_size: int = 1000,
+        ttl: float = 0,
+        skip_actions: Iterable[str] = (),
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.skip_actions = set(skip_actions)
+        self.lock = threading.Lock()
+        self.entries: OrderedDict[str, Tuple[str, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, question: str, labels: List[str]) -> str | None:
+        key = answer_key(question, labels)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            answer, created_at = entry
+            if self.ttl and time.time() - created_at > self.ttl:
+                del self.entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return answer
+
+    def set(self, question: str, labels: List[str], answer: str):
+        key = answer_key(question, labels)
+        with self.lock:
+            self.entries[key] = (answer, time.time())
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": "memory",
+                "size": len(self.entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
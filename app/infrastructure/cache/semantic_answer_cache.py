@@ -0,0 +1,200 @@
+import random
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, List, Tuple
+
+import faiss
+import numpy as np
+from rich.console import Console
+
+from app.application.service.answer_cache import AnswerCache
+from app.infrastructure.cache.answer_key import answer_key
+
+
+@dataclass
+class SemanticEntry:
+    question: str
+    labels: Tuple[str, ...]
+    answer: str
+    created_at: float
+
+
+class SemanticAnswerCache(AnswerCache):
+    """
+    Answers paraphrased questions from cache. Exact matches are served by
+    the wrapped cache, otherwise the question embedding is compared with the
+    cached questions in a small inner product index. A cached answer is only
+    reused when the similarity reaches `min_similarity` and the retrieved
+    context labels are identical, so "bab 2 sloka 47" never answers
+    "bab 2 sloka 48".
+
+    With `audit_rate` > 0 that share of semantic hits is answered fresh
+    instead, and the fresh answer is compared with the cached one to
+    estimate how often a similarity match is wrong. Answers are embedded
+    as documents by `embed_answers`, keeping them out of the query
+    embedding cache behind `embed`.
+    """
+
+    def __init__(
+        self,
+        exact: AnswerCache,
+        embed: Callable[[str], np.ndarray],
+        min_similarity: float = 0.94,
+        max_size: int = 1000,
+        ttl: float = 0,
+        audit_rate: float = 0.0,
+        embed_answers: Callable[[List[str]], np.ndarray] | None = None,
+        audit_min_similarity: float = 0.9,
+        neighbours: int = 8,
+    ):
+        self.exact = exact
+        self.skip_actions = exact.skip_actions
+        self.embed = embed
+        self.min_similarity = min_similarity
+        self.max_size = max_size
+        self.ttl = ttl
+        self.audit_rate = audit_rate
+        self.embed_answers = embed_answers
+        self.audit_min_similarity = audit_min_similarity
+        self.neighbours = neighbours
+        self.console = Console()
+        self.lock = threading.Lock()
+        self.index: faiss.IndexIDMap2 | None = None
+        self.entries: OrderedDict[int, SemanticEntry] = OrderedDict()
+        self.next_id = 0
+        # answer key -> cached answer of the semantic hit being audited
+        self.pending_audits: OrderedDict[str, str] = OrderedDict()
+        self.lookups = 0
+        self.semantic_hits = 0
+        self.audited = 0
+        self.audit_wrong = 0
+
+    def get(self, question: str, labels: List[str]) -> str | None:
+        with self.lock:
+            self.lookups += 1
+
+        answer = self.exact.get(question, labels)
+        if answer is not None:
+            return answer
+
+        vector = self.__embed(question)
+        with self.lock:
+            entry = self.__nearest(vector, tuple(labels))
+            if entry is None:
+                return None
+
+            if self.audit_rate and random.random() < self.audit_rate:
+                self.pending_audits[answer_key(question, labels)] = entry.answer
+                while len(self.pending_audits) > 100:
+                    self.pending_audits.popitem(last=False)
+                return None
+
+            self.semantic_hits += 1
+            return entry.answer
+
+    def set(self, question: str, labels: List[str], answer: str):
+        self.exact.set(question, labels, answer)
+
+        with self.lock:
+            cached_answer = self.pending_audits.pop(answer_key(question, labels), None)
+        if cached_answer is not None:
+            self.__audit(question, cached_answer, answer)
+
+        vector = self.__embed(question)
+        with self.lock:
+            # Already covered by an equivalent question
+            if self.__nearest(vector, tuple(labels), 0.999):
+                return
+
+            if self.index is None:
+                self.index = faiss.IndexIDMap2(faiss.IndexFlatIP(vector.shape[1]))
+            entry_id = self.next_id
+            self.next_id += 1
+            self.index.add_with_ids(vector, np.array([entry_id], dtype="int64"))
+            self.entries[entry_id] = SemanticEntry(
+                question=question,
+                labels=tuple(labels),
+                answer=answer,
+                created_at=time.time(),
+            )
+            while len(self.entries) > self.max_size:
+                self.__remove(next(iter(self.entries)))
+
+    def stats(self) -> dict:
+        exact = self.exact.stats()
+        with self.lock:
+            hits = exact["hits"] + self.semantic_hits
+            return {
+                "backend": f"semantic+{exact['backend']}",
+                "lookups": self.lookups,
+                "hit_rate": round(hits / self.lookups, 4) if self.lookups else 0.0,
+                "exact_hits": exact["hits"],
+                "semantic_hits": self.semantic_hits,
+                "semantic_size": len(self.entries),
+                "min_similarity": self.min_similarity,
+                "audited": self.audited,
+                "audit_wrong": self.audit_wrong,
+                "wrong_rate": (
+                    round(self.audit_wrong / self.audited, 4) if self.audited else 0.0
+                ),
+                "exact": exact,
+            }
+
+    def __nearest(
+        self,
+        vector: np.ndarray,
+        labels: Tuple[str, ...],
+        min_similarity: float | None = None,
+    ) -> SemanticEntry | None:
+        if self.index is None or self.index.ntotal == 0:
+            return None
+
+        D, I = self.index.search(vector, min(self.neighbours, self.index.ntotal))
+        now = time.time()
+        for similarity, entry_id in zip(D[0], I[0]):
+            if similarity < (min_similarity or self.min_similarity):
+                break
+            entry = self.entries.get(int(entry_id))
+            if entry is None or entry.labels != labels:
+                continue
+            if self.ttl and now - entry.created_at > self.ttl:
+                self.__remove(int(entry_id))
+                continue
+
+            self.entries.move_to_end(int(entry_id))
+            return entry
+
+        return None
+
+    def __remove(self, entry_id: int):
+        self.entries.pop(entry_id, None)
+        self.index.remove_ids(np.array([entry_id], dtype="int64"))
+
+    def __embed(self, text: str) -> np.ndarray:
+        vector = np.array(self.embed(text), dtype="float32").reshape(1, -1)
+        faiss.normalize_L2(vector)
+        return vector
+
+    def __audit(self, question: str, cached_answer: str, fresh_answer: str):
+        if self.embed_answers:
+            vectors = np.array(
+                self.embed_answers([cached_answer, fresh_answer]), dtype="float32"
+            )
+            faiss.normalize_L2(vectors)
+        else:
+            vectors = np.vstack(
+                [self.__embed(cached_answer), self.__embed(fresh_answer)]
+            )
+        similarity = float(vectors[0] @ vectors[1])
+        wrong = similarity < self.audit_min_similarity
+        with self.lock:
+            self.audited += 1
+            self.audit_wrong += int(wrong)
+
+        if wrong:
+            self.console.print(
+                f"[yellow][CACHE][/yellow] Audit: jawaban cache untuk "
+                f"[b]{question}[/b] menyimpang (similarity {similarity:.3f})"
+            )
@@ -0,0 +1,126 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterable, List
+
+from app.application.service.answer_cache import AnswerCache
+from app.infrastructure.cache.answer_key import answer_key
+from app.infrastructure.util.fork import after_fork_in_child
+
+
+class SqliteAnswerCache(AnswerCache):
+    """
+    Answer cache in a SQLite file, so it survives restarts and is shared by
+    every worker on the host. Least recently used entries are evicted once
+    `max_size` is exceeded.
+    """
+
+    def __init__(
+        self,
+        path: str = "data/model/answer_cache.sqlite3",
+        max_size: int = 10000,
+        ttl: float = 0,
+        skip_actions: Iterable[str] = (),
+    ):
+        self.path = path
+        self.max_size = max_size
+        self.ttl = ttl
+        self.skip_actions = set(skip_actions)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = self.__connect()
+        with self.lock:
+            # WAL lets other workers read while one of them writes
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS answers (
+                    key TEXT PRIMARY KEY,
+                    answer TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_answers_accessed_at "
+                "ON answers (accessed_at)"
+            )
+            self.conn.commit()
+        # A connection must not be used across fork, each worker opens its own
+        after_fork_in_child(self.__after_fork)
+
+    def get(self, question: str, labels: List[str]) -> str | None:
+        key = answer_key(question, labels)
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT answer, created_at FROM answers WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            answer, created_at = row
+            if self.ttl and now - created_at > self.ttl:
+                self.conn.execute("DELETE FROM answers WHERE key = ?", (key,))
+                self.conn.commit()
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self.conn.execute(
+                "UPDATE answers SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self.conn.commit()
+            self.hits += 1
+            return answer
+
+    def set(self, question: str, labels: List[str], answer: str):
+        key = answer_key(question, labels)
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO answers (key, answer, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, answer, now, now),
+            )
+            evicted = self.conn.execute(
+                """
+                DELETE FROM answers WHERE key IN (
+                    SELECT key FROM answers ORDER BY accessed_at DESC
+                    LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_size,),
+            ).rowcount
+            self.conn.commit()
+            self.evictions += max(0, evicted)
+
+    def stats(self) -> dict:
+        with self.lock:
+            size = self.conn.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "backend": "sqlite",
+                "size": size,
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def __connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, check_same_thread=False, timeout=5)
+
+    def __after_fork(self):
+        self.lock = threading.Lock()
+        self.conn = self.__connect()
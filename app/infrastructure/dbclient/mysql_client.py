@@ -1,7 +1,11 @@
 import os
+import threading
+from contextlib import contextmanager
 import mysql.connector
 from mysql.connector import pooling, errorcode
 
+from app.infrastructure.util.fork import after_fork_in_child
+
 
 class MysqlClient:
     def __init__(
@@ -12,7 +16,7 @@ class MysqlClient:
         password=None,
         database=None,
         pool_name="mypool",
-        pool_size=5,
+        pool_size=None,
         charset="utf8mb4",
     ):
         # Read from env if not provided
@@ -24,9 +28,19 @@ class MysqlClient:
             "database": database or os.getenv("DB_NAME", "bhagavadgita"),
             "charset": charset,
         }
+        self.pool_name = pool_name
+        self.pool_size = pool_size or int(os.getenv("DB_POOL_SIZE", 5))
+        self.__create_pool()
+        # Connections opened before a fork belong to the parent
+        after_fork_in_child(self.__create_pool)
+
+    def __create_pool(self):
+        # The pool raises instead of waiting when exhausted, which happens as
+        # soon as more request threads than connections hit the database
+        self.slots = threading.BoundedSemaphore(self.pool_size)
         self.pool = pooling.MySQLConnectionPool(
-            pool_name=pool_name,
-            pool_size=pool_size,
+            pool_name=self.pool_name,
+            pool_size=self.pool_size,
             pool_reset_session=True,
             **self.config,
         )
@@ -41,29 +55,52 @@ class MysqlClient:
             print(f"[MySQL] Error getting connection: {e}")
             raise
 
+    @contextmanager
+    def _connection(self):
+        with self.slots:
+            conn = self._get_conn()
+            try:
+                yield conn
+            finally:
+                conn.close()
+
     def query(self, sql, params=None, dict_cursor=True):
         """
         Execute a `SELECT` (or other) and return all rows.
         """
-        conn = self._get_conn()
-        cursor = conn.cursor(dictionary=dict_cursor)
-        try:
-            cursor.execute(sql, params or ())
-            return cursor.fetchall()
-        finally:
-            cursor.close()
-            conn.close()
+        with self._connection() as conn:
+            cursor = conn.cursor(dictionary=dict_cursor)
+            try:
+                cursor.execute(sql, params or ())
+                return cursor.fetchall()
+            finally:
+                cursor.close()
+
+    def query_many(self, statements, dict_cursor=True):
+        """
+        Execute several `(sql, params)` on one connection checkout and return
+        the rows of each.
+        """
+        with self._connection() as conn:
+            cursor = conn.cursor(dictionary=dict_cursor)
+            try:
+                results = []
+                for sql, params in statements:
+                    cursor.execute(sql, params or ())
+                    results.append(cursor.fetchall())
+                return results
+            finally:
+                cursor.close()
 
     def execute(self, sql, params=None):
         """
         Execute INSERT/UPDATE/DELETE. Returns affected rowcount.
         """
-        conn = self._get_conn()
-        cursor = conn.cursor()
-        try:
-            cursor.execute(sql, params or ())
-            conn.commit()
-            return cursor.rowcount
-        finally:
-            cursor.close()
-            conn.close()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(sql, params or ())
+                conn.commit()
+                return cursor.rowcount
+            finally:
+                cursor.close()
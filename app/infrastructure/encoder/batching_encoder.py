@@ -0,0 +1,146 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+import numpy as np
+
+from app.application.service.encoder import Encoder
+from app.infrastructure.util.fork import after_fork_in_child
+
+HISTOGRAM_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+
+
+@dataclass
+class PendingEncode:
+    texts: List[str]
+    normalize: bool
+    future: Future = field(default_factory=Future)
+
+
+class Histogram:
+    def __init__(self, buckets=HISTOGRAM_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0
+        self.count = 0
+
+    def observe(self, value: int):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.total += value
+        self.count += 1
+
+    def to_dict(self) -> Dict[str, object]:
+        labels = [f"le_{x}" for x in self.buckets] + ["le_inf"]
+        return {
+            "buckets": dict(zip(labels, self.counts)),
+            "count": self.count,
+            "mean": round(self.total / self.count, 2) if self.count else 0.0,
+        }
+
+
+class BatchingEncoder(Encoder):
+    """
+    Collects encode calls from concurrent requests for up to `window_ms`
+    (or until `max_batch_size` texts are waiting) and runs them through the
+    wrapped encoder in a single forward pass.
+    """
+
+    def __init__(
+        self,
+        encoder: Encoder,
+        window_ms: float = 5,
+        max_batch_size: int = 32,
+    ):
+        self.encoder = encoder
+        self.window = window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self.queue: "queue.Queue[PendingEncode]" = queue.Queue()
+        self.lock = threading.Lock()
+        self.batch_size_histogram = Histogram()
+        self.queue_depth_histogram = Histogram()
+        self.max_queue_depth = 0
+        self.__start_worker()
+        after_fork_in_child(self.__after_fork)
+
+    @property
+    def model_id(self) -> str:
+        return self.encoder.model_id
+
+    def encode(self, texts: List[str], normalize: bool = False):
+        pending = PendingEncode(texts=texts, normalize=normalize)
+        with self.lock:
+            depth = self.queue.qsize()
+            self.queue_depth_histogram.observe(depth)
+            self.max_queue_depth = max(self.max_queue_depth, depth)
+        self.queue.put(pending)
+        return pending.future.result()
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "queue_depth": self.queue.qsize(),
+                "max_queue_depth": self.max_queue_depth,
+                "queue_depth_histogram": self.queue_depth_histogram.to_dict(),
+                "batch_size_histogram": self.batch_size_histogram.to_dict(),
+            }
+
+    def __start_worker(self):
+        self.worker = threading.Thread(
+            target=self.__run,
+            name=f"batching-encoder-{self.encoder.model_id}",
+            daemon=True,
+        )
+        self.worker.start()
+
+    def __after_fork(self):
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.__start_worker()
+
+    def __run(self):
+        while True:
+            batch = [self.queue.get()]
+            size = len(batch[0].texts)
+            deadline = time.monotonic() + self.window
+            while size < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    pending = self.queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                batch.append(pending)
+                size += len(pending.texts)
+
+            with self.lock:
+                self.batch_size_histogram.observe(size)
+
+            for normalize in (False, True):
+                group = [x for x in batch if x.normalize == normalize]
+                if group:
+                    self.__encode_group(group, normalize)
+
+    def __encode_group(self, group: List[PendingEncode], normalize: bool):
+        texts = [text for pending in group for text in pending.texts]
+        try:
+            embeddings = np.asarray(self.encoder.encode(texts, normalize))
+        except Exception as e:
+            for pending in group:
+                pending.future.set_exception(e)
+            return
+
+        offset = 0
+        for pending in group:
+            pending.future.set_result(
+                embeddings[offset : offset + len(pending.texts)]
+            )
+            offset += len(pending.texts)
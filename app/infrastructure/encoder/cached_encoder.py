@@ -0,0 +1,31 @@
+from typing import List
+
+import numpy as np
+
+from app.application.service.encoder import Encoder
+from app.infrastructure.encoder.embedding_cache import EmbeddingCache
+
+
+class CachedEncoder(Encoder):
+    """Serves repeated texts from an `EmbeddingCache`, encodes only misses."""
+
+    def __init__(self, encoder: Encoder, cache: EmbeddingCache):
+        self.encoder = encoder
+        self.cache = cache
+
+    @property
+    def model_id(self) -> str:
+        return self.encoder.model_id
+
+    def encode(self, texts: List[str], normalize: bool = False):
+        keys = [self.cache.key(self.model_id, normalize, x) for x in texts]
+        vectors = [self.cache.get(x) for x in keys]
+
+        missing = [i for i, x in enumerate(vectors) if x is None]
+        if missing:
+            encoded = self.encoder.encode([texts[i] for i in missing], normalize)
+            for i, vector in zip(missing, encoded):
+                vectors[i] = vector
+                self.cache.set(keys[i], vector)
+
+        return np.asarray(vectors, dtype="float32")
@@ -0,0 +1,134 @@
+import atexit
+import fcntl
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Tuple
+
+from app.infrastructure.util.fork import on_worker_exit
+from app.infrastructure.util.text import normalize_text
+
+CacheKey = Tuple[str, bool, str]
+
+
+class EmbeddingCache:
+    """
+    Bounded LRU cache of embeddings keyed on (model id, normalize flag,
+    normalized text), with optional TTL and on-disk persistence.
+
+    One instance can be shared by several encoders, the model id in the key
+    keeps their vectors apart.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        ttl: float = 0,
+        persist_path: str | None = None,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.persist_path = persist_path
+        self.lock = threading.Lock()
+        self.entries: OrderedDict[CacheKey, Tuple[object, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        if persist_path:
+            self.load()
+            atexit.register(self.save)
+            # Prefork workers exit without atexit, each merges its entries
+            on_worker_exit(self.save)
+
+    def key(self, model_id: str, normalize: bool, text: str) -> CacheKey:
+        return (model_id, normalize, normalize_text(text))
+
+    def get(self, key: CacheKey):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            vector, created_at = entry
+            if self.ttl and time.time() - created_at > self.ttl:
+                del self.entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return vector
+
+    def set(self, key: CacheKey, vector):
+        with self.lock:
+            self.entries[key] = (vector, time.time())
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self.entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def load(self):
+        if not self.persist_path or not os.path.exists(self.persist_path):
+            return
+
+        with open(self.persist_path, "rb") as f:
+            entries = pickle.load(f)
+
+        now = time.time()
+        with self.lock:
+            for key, (vector, created_at) in entries.items():
+                if self.ttl and now - created_at > self.ttl:
+                    continue
+                self.entries[key] = (vector, created_at)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def save(self):
+        """
+        Merge the entries into the file. Several processes (prefork workers
+        and their parent) share it, so the file is locked, read again and
+        the newer entry of each key is kept instead of overwriting it.
+        """
+        if not self.persist_path:
+            return
+
+        with self.lock:
+            own = OrderedDict(self.entries)
+
+        with open(self.persist_path + ".lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            entries = OrderedDict()
+            if os.path.exists(self.persist_path):
+                with open(self.persist_path, "rb") as f:
+                    entries = pickle.load(f)
+            for key, entry in own.items():
+                if key not in entries or entries[key][1] < entry[1]:
+                    entries[key] = entry
+            entries = OrderedDict(sorted(entries.items(), key=lambda x: x[1][1]))
+            while len(entries) > self.max_size:
+                entries.popitem(last=False)
+
+            # Write then rename so a crash never leaves a truncated file behind
+            tmp_path = f"{self.persist_path}.tmp-{os.getpid()}"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(entries, f)
+            os.replace(tmp_path, self.persist_path)
@@ -0,0 +1,49 @@
+import threading
+from typing import Dict, Literal
+
+from app.infrastructure.encoder.onnx_encoder import OnnxEncoder
+from app.infrastructure.encoder.sentence_transformer_encoder import (
+    SentenceTransformerEncoder,
+)
+from app.infrastructure.util.memory import resident_memory_bytes
+
+EncoderBackend = Literal["torch", "onnx", "onnx_fp32"]
+RegistryEncoder = SentenceTransformerEncoder | OnnxEncoder
+
+
+class EncoderRegistry:
+    """
+    Hands out one encoder per model name, so searchers configured with the
+    same model share a single copy of it in memory.
+    """
+
+    def __init__(self, lazy: bool = True, backend: EncoderBackend = "torch"):
+        self.lazy = lazy
+        self.backend = backend
+        self.encoders: Dict[str, RegistryEncoder] = {}
+        self.lock = threading.Lock()
+
+    def get(self, model_name: str) -> RegistryEncoder:
+        with self.lock:
+            encoder = self.encoders.get(model_name)
+            if encoder is None:
+                encoder = self.create(model_name)
+                self.encoders[model_name] = encoder
+
+        if not self.lazy:
+            encoder.load()
+        return encoder
+
+    def create(self, model_name: str) -> RegistryEncoder:
+        if self.backend == "torch":
+            return SentenceTransformerEncoder(model_name, lazy=True)
+        if self.backend in ("onnx", "onnx_fp32"):
+            return OnnxEncoder(model_name, quantize=self.backend == "onnx", lazy=True)
+        raise ValueError(f"Unknown embedding backend: {self.backend}")
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.backend,
+            "process_rss_bytes": resident_memory_bytes(),
+            "models": {x.model_id: x.stats() for x in self.encoders.values()},
+        }
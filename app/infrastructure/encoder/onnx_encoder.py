@@ -0,0 +1,169 @@
+import os
+import threading
+import time
+from typing import List
+
+import numpy as np
+
+from app.application.service.encoder import Encoder
+from app.infrastructure.util.executor import cpu_executor
+from app.infrastructure.util.memory import resident_memory_bytes
+
+
+class OnnxEncoder(Encoder):
+    """
+    Runs a sentence-transformers model with ONNX Runtime on CPU.
+
+    On first use the Hugging Face checkpoint is exported to ONNX and, when
+    `quantize` is set, converted with int8 dynamic quantization. Both files
+    are kept in `cache_dir` so later processes only load them. Requires the
+    optional `onnx` and `onnxruntime` packages.
+
+    e5 checkpoints use mean pooling followed by L2 normalization, which is
+    reproduced here, so the output matches `SentenceTransformerEncoder`.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        cache_dir: str = "data/model/onnx",
+        quantize: bool = True,
+        num_threads: int = 0,
+        max_length: int = 512,
+        lazy: bool = True,
+    ):
+        self.model_name = model_name
+        self.cache_dir = cache_dir
+        self.quantize = quantize
+        self.num_threads = num_threads
+        self.max_length = max_length
+        self.tokenizer = None
+        self.session = None
+        self.lock = threading.Lock()
+        self.tokenizer_lock = threading.Lock()
+        self.load_seconds = 0.0
+        self.rss_delta_bytes = 0
+        if not lazy:
+            self.load()
+
+    @property
+    def model_id(self) -> str:
+        # Quantized embeddings differ slightly, keep them apart in caches and
+        # index configs
+        return f"{self.model_name}#onnx-{'int8' if self.quantize else 'fp32'}"
+
+    @property
+    def loaded(self) -> bool:
+        return self.session is not None
+
+    @property
+    def model_dir(self) -> str:
+        return os.path.join(self.cache_dir, self.model_name.replace("/", "__"))
+
+    @property
+    def model_path(self) -> str:
+        name = "model.int8.onnx" if self.quantize else "model.onnx"
+        return os.path.join(self.model_dir, name)
+
+    def load(self):
+        with self.lock:
+            if self.session is not None:
+                return self.session
+
+            try:
+                import onnxruntime
+            except ImportError:
+                raise ImportError(
+                    "EMBEDDING_BACKEND=onnx requires the onnx and onnxruntime packages"
+                )
+            from transformers import AutoTokenizer
+
+            rss_before = resident_memory_bytes()
+            start_time = time.perf_counter()
+            if not os.path.exists(self.model_path):
+                self.__export()
+
+            options = onnxruntime.SessionOptions()
+            if self.num_threads > 0:
+                options.intra_op_num_threads = self.num_threads
+            self.tokenizer = AutoTokenizer.from_pretrained(self.model_dir)
+            self.session = onnxruntime.InferenceSession(
+                self.model_path, options, providers=["CPUExecutionProvider"]
+            )
+            self.load_seconds = time.perf_counter() - start_time
+            self.rss_delta_bytes = max(0, resident_memory_bytes() - rss_before)
+            return self.session
+
+    def encode(self, texts: List[str], normalize: bool = False):
+        session = self.session or self.load()
+        return cpu_executor.call(self.__encode, session, texts)
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self.loaded,
+            "load_seconds": round(self.load_seconds, 2),
+            "model_bytes": (
+                os.path.getsize(self.model_path)
+                if os.path.exists(self.model_path)
+                else 0
+            ),
+            "rss_delta_bytes": self.rss_delta_bytes,
+        }
+
+    def __encode(self, session, texts: List[str]) -> np.ndarray:
+        # A fast tokenizer raises "Already borrowed" when two threads use it
+        # at once, the pool runs several encodes in parallel
+        with self.tokenizer_lock:
+            tokens = self.tokenizer(
+                texts,
+                padding=True,
+                truncation=True,
+                max_length=self.max_length,
+                return_tensors="np",
+            )
+        input_names = {x.name for x in session.get_inputs()}
+        inputs = {k: v.astype("int64") for k, v in tokens.items() if k in input_names}
+        hidden = session.run(None, inputs)[0]
+
+        mask = tokens["attention_mask"][..., None].astype("float32")
+        embeddings = (hidden * mask).sum(axis=1) / np.clip(
+            mask.sum(axis=1), 1e-9, None
+        )
+        embeddings /= np.clip(
+            np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None
+        )
+        return embeddings.astype("float32")
+
+    def __export(self):
+        import torch
+        from transformers import AutoModel, AutoTokenizer
+
+        os.makedirs(self.model_dir, exist_ok=True)
+        tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+        tokenizer.save_pretrained(self.model_dir)
+        model = AutoModel.from_pretrained(self.model_name)
+        model.eval()
+
+        sample = tokenizer(["query: contoh"], return_tensors="pt")
+        input_names = [
+            x for x in ("input_ids", "attention_mask", "token_type_ids") if x in sample
+        ]
+        dynamic_axes = {x: {0: "batch", 1: "sequence"} for x in input_names}
+        dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+        fp32_path = os.path.join(self.model_dir, "model.onnx")
+        with torch.no_grad():
+            torch.onnx.export(
+                model,
+                tuple(sample[x] for x in input_names),
+                fp32_path,
+                input_names=input_names,
+                output_names=["last_hidden_state"],
+                dynamic_axes=dynamic_axes,
+                opset_version=17,
+            )
+
+        if self.quantize:
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+
+            quantize_dynamic(fp32_path, self.model_path, weight_type=QuantType.QInt8)
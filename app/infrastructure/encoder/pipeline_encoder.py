@@ -0,0 +1,234 @@
+import hashlib
+import multiprocessing
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, List
+
+import numpy as np
+
+from app.application.service.encoder import Encoder
+from app.infrastructure.encoder.encoder_registry import EncoderBackend, EncoderRegistry
+
+# Encoder of a pool worker process, created once by `init_worker`
+worker_encoder: Encoder | None = None
+
+
+def init_worker(model_name: str, backend: EncoderBackend, threads: int):
+    global worker_encoder
+    if threads > 0:
+        try:
+            import torch
+
+            torch.set_num_threads(threads)
+        except ImportError:
+            pass
+    worker_encoder = EncoderRegistry(lazy=False, backend=backend).get(model_name)
+
+
+def encode_batch(texts: List[str], normalize: bool) -> np.ndarray:
+    return np.asarray(worker_encoder.encode(texts, normalize), dtype="float32")
+
+
+class PipelineEncoder(Encoder):
+    """
+    Encoder for offline index builds (scripts/searcher/build_index.py).
+
+    Texts are sorted by token length and cut into batches of similar length,
+    so a batch pads to its own longest text instead of the longest text of
+    the corpus. Batches run on `workers` processes, each with its own copy
+    of the model. Results are written to `checkpoint_dir` in shards of
+    `shard_size` texts, keyed by their content, so a crashed or interrupted
+    build resumes from the last finished shard.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        backend: EncoderBackend = "torch",
+        workers: int = 1,
+        threads_per_worker: int = 0,
+        batch_size: int = 32,
+        shard_size: int = 1024,
+        checkpoint_dir: str = "data/model/checkpoints",
+        on_progress: Callable[[dict], None] | None = None,
+    ):
+        self.model_name = model_name
+        self.backend = backend
+        self.workers = workers
+        self.threads_per_worker = threads_per_worker
+        self.batch_size = batch_size
+        self.shard_size = shard_size
+        self.checkpoint_dir = checkpoint_dir
+        self.on_progress = on_progress
+        # Used in-process with a single worker, and for its model id
+        self.encoder = EncoderRegistry(backend=backend).create(model_name)
+        self.tokenizer = None
+        self.pool: ProcessPoolExecutor | None = None
+        self.texts = 0
+        self.encoded = 0
+        self.from_checkpoint = 0
+        self.encode_seconds = 0.0
+        self.padded_tokens = 0
+        self.unsorted_padded_tokens = 0
+        self.tokens = 0
+
+    @property
+    def model_id(self) -> str:
+        return self.encoder.model_id
+
+    def encode(self, texts: List[str], normalize: bool = False) -> np.ndarray:
+        start_time = time.perf_counter()
+        lengths = self.token_lengths(texts)
+        order = sorted(range(len(texts)), key=lambda i: lengths[i])
+        self.__count_padding(lengths, order)
+
+        shards = [
+            order[i : i + self.shard_size]
+            for i in range(0, len(order), self.shard_size)
+        ]
+        paths = [self.__shard_path([texts[i] for i in x], normalize) for x in shards]
+        # Every missing shard is queued at once so the workers never idle
+        # while a finished shard is written
+        pending = {
+            n: self.__submit([texts[i] for i in shard], normalize)
+            for n, (shard, path) in enumerate(zip(shards, paths))
+            if not os.path.exists(path)
+        }
+
+        output = None
+        done = 0
+        for n, (shard, path) in enumerate(zip(shards, paths)):
+            if n in pending:
+                if pending[n]:
+                    batches = [x.result() for x in pending[n]]
+                else:
+                    batches = [
+                        self.encoder.encode(x, normalize)
+                        for x in self.__batches([texts[i] for i in shard])
+                    ]
+                embeddings = np.vstack(batches).astype("float32", copy=False)
+                save_shard(path, embeddings)
+                self.encoded += len(shard)
+            else:
+                embeddings = np.load(path)
+                self.from_checkpoint += len(shard)
+            if output is None:
+                output = np.empty((len(texts), embeddings.shape[1]), dtype="float32")
+            output[shard] = embeddings
+
+            done += len(shard)
+            if self.on_progress:
+                seconds = time.perf_counter() - start_time
+                self.on_progress(
+                    {
+                        "done": done,
+                        "total": len(texts),
+                        "texts_per_second": round(done / seconds, 1),
+                    }
+                )
+
+        self.texts += len(texts)
+        self.encode_seconds += time.perf_counter() - start_time
+        if output is None:
+            return np.empty((0, 0), dtype="float32")
+        return output
+
+    def token_lengths(self, texts: List[str]) -> List[int]:
+        if self.tokenizer is None:
+            try:
+                from transformers import AutoTokenizer
+
+                self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+            except (ImportError, OSError):
+                # Word counts still sort the texts roughly by length
+                self.tokenizer = False
+        if not self.tokenizer:
+            return [len(x.split()) for x in texts]
+        return [len(x) for x in self.tokenizer(texts, truncation=True)["input_ids"]]
+
+    def clear_checkpoints(self):
+        if not os.path.isdir(self.checkpoint_dir):
+            return
+        for name in os.listdir(self.checkpoint_dir):
+            if name.endswith(".npy"):
+                os.remove(os.path.join(self.checkpoint_dir, name))
+
+    def close(self):
+        if self.pool:
+            self.pool.shutdown()
+            self.pool = None
+
+    def stats(self) -> dict:
+        return {
+            "texts": self.texts,
+            "encoded": self.encoded,
+            "from_checkpoint": self.from_checkpoint,
+            "encode_seconds": round(self.encode_seconds, 2),
+            "texts_per_second": (
+                round(self.texts / self.encode_seconds, 1)
+                if self.encode_seconds
+                else 0.0
+            ),
+            "workers": self.workers,
+            "batch_size": self.batch_size,
+            # Share of the fed tokens that are padding, with and without
+            # length bucketing
+            "padding_ratio": padding_ratio(self.tokens, self.padded_tokens),
+            "unsorted_padding_ratio": padding_ratio(
+                self.tokens, self.unsorted_padded_tokens
+            ),
+        }
+
+    def __submit(self, texts: List[str], normalize: bool) -> List[Future]:
+        """Queues the batches of `texts` on the pool, nothing without one."""
+        if self.workers <= 1:
+            return []
+        if self.pool is None:
+            # Spawned, a forked copy of a process using torch threads can hang
+            self.pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_worker,
+                initargs=(self.model_name, self.backend, self.threads_per_worker),
+            )
+        return [
+            self.pool.submit(encode_batch, x, normalize) for x in self.__batches(texts)
+        ]
+
+    def __batches(self, texts: List[str]) -> List[List[str]]:
+        return [
+            texts[i : i + self.batch_size]
+            for i in range(0, len(texts), self.batch_size)
+        ]
+
+    def __shard_path(self, texts: List[str], normalize: bool) -> str:
+        digest = hashlib.sha256(f"{self.model_id}\0{normalize}".encode("utf-8"))
+        for text in texts:
+            digest.update(b"\0" + text.encode("utf-8"))
+        return os.path.join(self.checkpoint_dir, f"{digest.hexdigest()[:32]}.npy")
+
+    def __count_padding(self, lengths: List[int], order: List[int]):
+        def padded(indices: List[int]) -> int:
+            return sum(
+                max(lengths[i] for i in indices[j : j + self.batch_size])
+                * len(indices[j : j + self.batch_size])
+                for j in range(0, len(indices), self.batch_size)
+            )
+
+        self.tokens += sum(lengths)
+        self.padded_tokens += padded(order)
+        self.unsorted_padded_tokens += padded(list(range(len(lengths))))
+
+
+def save_shard(path: str, embeddings: np.ndarray):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp-{os.getpid()}.npy"
+    np.save(tmp_path, embeddings)
+    os.replace(tmp_path, path)
+
+
+def padding_ratio(tokens: int, padded_tokens: int) -> float:
+    if not padded_tokens:
+        return 0.0
+    return round(1 - tokens / padded_tokens, 4)
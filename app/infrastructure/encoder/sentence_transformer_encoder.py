@@ -0,0 +1,62 @@
+import threading
+import time
+from typing import List
+
+from sentence_transformers import SentenceTransformer
+
+from app.application.service.encoder import Encoder
+from app.infrastructure.util.executor import cpu_executor
+from app.infrastructure.util.memory import resident_memory_bytes
+
+
+class SentenceTransformerEncoder(Encoder):
+    """
+    The model is loaded on the first `encode` call unless `lazy` is False, so
+    a process whose indexes are already built does not pay for it at startup.
+    """
+
+    def __init__(self, model_name: str, lazy: bool = True):
+        self.model_name = model_name
+        self.model: SentenceTransformer | None = None
+        self.lock = threading.Lock()
+        self.load_seconds = 0.0
+        self.rss_delta_bytes = 0
+        if not lazy:
+            self.load()
+
+    @property
+    def model_id(self) -> str:
+        return self.model_name
+
+    @property
+    def loaded(self) -> bool:
+        return self.model is not None
+
+    def load(self) -> SentenceTransformer:
+        with self.lock:
+            if self.model is None:
+                rss_before = resident_memory_bytes()
+                start_time = time.perf_counter()
+                self.model = SentenceTransformer(self.model_name)
+                self.load_seconds = time.perf_counter() - start_time
+                self.rss_delta_bytes = max(0, resident_memory_bytes() - rss_before)
+            return self.model
+
+    def encode(self, texts: List[str], normalize: bool = False):
+        model = self.model or self.load()
+        return cpu_executor.call(
+            model.encode, texts, convert_to_numpy=True, normalize_embeddings=normalize
+        )
+
+    def parameter_bytes(self) -> int:
+        if self.model is None:
+            return 0
+        return sum(x.numel() * x.element_size() for x in self.model.parameters())
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self.loaded,
+            "load_seconds": round(self.load_seconds, 2),
+            "parameter_bytes": self.parameter_bytes(),
+            "rss_delta_bytes": self.rss_delta_bytes,
+        }
@@ -1,9 +1,15 @@
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+
 from rich import pretty
 from rich.console import Console
 from time import sleep
-from typing import List
+from typing import Callable, List
 
 from app.application.application_construct import ApplicationConstruct
+from app.application.application_container import ApplicationContainer
 from app.domain.entity.chapter_entity import ChapterEntity
 from app.domain.entity.gita_entity import GitaEntity
 from app.domain.value_object.pattern_matching_result import PatternMatchingResult
@@ -11,18 +17,52 @@ from app.infrastructure.http.controller.controller import Controller
 from app.infrastructure.http.controller.prompt_controller import PromptController
 from app.infrastructure.http.controller.chapter_controller import ChapterController
 from app.infrastructure.http.controller.verse_controller import VerseController
+from app.infrastructure.http.controller.stats_controller import StatsController
+from app.infrastructure.http.prefork_server import PreforkServer
+from app.infrastructure.http.static_response_cache import StaticResponseCache
+from app.infrastructure.util.executor import io_executor
+from app.infrastructure.util.memory import memory_usage
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 
 class HttpApp(ApplicationConstruct):
+    def __init__(
+        self,
+        app: ApplicationContainer,
+        response_cache: StaticResponseCache | None = None,
+        workers: int = 1,
+        port: int = 8000,
+        **kwargs,
+    ):
+        super().__init__(app, **kwargs)
+        # Serves /chapter and the verse endpoints as pre-serialized bytes
+        self.response_cache = response_cache
+        self.workers = workers if hasattr(os, "fork") else 1
+        # An update thread started before forking does not exist in the
+        # workers, corpus changes are applied before the fork instead
+        if self.workers > 1:
+            self.background_index_update = False
+        self.port = port
+        self.worker_index = 0
+        # Called with the worker index in every forked worker
+        self.worker_start_hooks: List[Callable[[int], None]] = []
+        self.started_at = time.perf_counter()
+        self.startup_seconds = 0.0
+        self.ready_seconds = 0.0
+
     def run(self):
         pretty.install()
         self.console = Console()
+        self.started_at = time.perf_counter()
 
         self.prepare_model()
         self.prepare_matcher()
-        self.http = FastAPI()
+        if self.workers > 1:
+            self.preload_models()
+        self.startup_seconds = time.perf_counter() - self.started_at
+        self.app.stats_providers["worker"] = self.worker_stats
+        self.http = FastAPI(lifespan=self.lifespan)
 
         self.register_routes()
         self.start_server()
@@ -39,13 +79,76 @@ class HttpApp(ApplicationConstruct):
             ChapterController(),
             PromptController(),
             VerseController(),
+            StatsController(),
         ]
 
         for c in controllers:
             c.set_app(self, self.app)
             self.http.include_router(c.router)
 
+    @asynccontextmanager
+    async def lifespan(self, http: FastAPI):
+        # asyncio.to_thread (default LLM adapters) shares the bounded pool
+        asyncio.get_running_loop().set_default_executor(io_executor.get_executor())
+        self.ready_seconds = time.perf_counter() - self.started_at
+        usage = memory_usage()
+        self.console.print(
+            f"[blue][WORKER][/blue] Worker {self.worker_index} (pid {os.getpid()}) "
+            f"siap dalam {self.ready_seconds:.1f} detik, "
+            f"RSS {usage['rss_bytes'] / 2**20:.0f} MiB, "
+            f"PSS {usage.get('pss_bytes', 0) / 2**20:.0f} MiB"
+        )
+        yield
+
+    def on_worker_start(self, hook: Callable[[int], None]):
+        self.worker_start_hooks.append(hook)
+
+    def preload_models(self):
+        # Loaded once before forking, the workers share the weights
+        # copy-on-write instead of each loading its own copy
+        for searcher in (self.app.chapter_searcher, self.app.gita_searcher):
+            encoder = getattr(searcher, "encoder", None)
+            if encoder is not None and hasattr(encoder, "load"):
+                encoder.load()
+
+    def worker_stats(self) -> dict:
+        return {
+            "worker": self.worker_index,
+            "workers": self.workers,
+            "pid": os.getpid(),
+            "startup_seconds": round(self.startup_seconds, 2),
+            "ready_seconds": round(self.ready_seconds, 2),
+            **memory_usage(),
+        }
+
     def start_server(self):
         import uvicorn
 
-        uvicorn.run(self.http, host="0.0.0.0")
+        if self.workers <= 1:
+            uvicorn.run(self.http, host="0.0.0.0", port=self.port)
+            return
+
+        PreforkServer(
+            self.http,
+            port=self.port,
+            workers=self.workers,
+            on_worker_start=self.__start_worker,
+        ).run()
+
+    def __start_worker(self, i: int):
+        self.worker_index = i
+        # A corpus change is embedded once, by the first worker
+        self.builds_indexes = i == 0
+        for hook in self.worker_start_hooks:
+            hook(i)
+        # Split the cores between the workers instead of oversubscribing them
+        threads = max(1, (os.cpu_count() or 1) // self.workers)
+        import faiss
+
+        faiss.omp_set_num_threads(threads)
+        try:
+            import torch
+
+            torch.set_num_threads(threads)
+        except ImportError:
+            pass
@@ -1,5 +1,6 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Request
 from app.infrastructure.http.controller.controller import Controller
+from app.infrastructure.http.controller.verse_controller import VerseDetailResponse
 from pydantic import BaseModel, RootModel
 from typing import List, Optional
 from fastapi.responses import JSONResponse
@@ -57,6 +58,11 @@ class ChapterListResponse(RootModel[List[ChapterResponse]]):
         }
 
 
+class ChapterDetailResponse(ChapterResponse):
+    """Response model for a chapter with all its verses and translations"""
+    verses: List[VerseDetailResponse]
+
+
 class ErrorResponse(BaseModel):
     """Error response model"""
     detail: str
@@ -99,21 +105,38 @@ class ChapterController(Controller):
             }
         )(self.handle_chapter_by_number)
 
+        self._router.get(
+            "/{chapter_number}/detail",
+            response_model=ChapterDetailResponse,
+            summary="Get chapter with verses and translations",
+            description="Retrieve a specific chapter (1-18) together with all of its verses and every translation of each verse, fetched in one call.",
+            response_description="Chapter details with verses and their translations",
+            responses={
+                404: {
+                    "description": "Chapter not found",
+                    "model": ErrorResponse
+                }
+            }
+        )(self.handle_chapter_detail)
+
     @property
     def router(self) -> APIRouter:
         return self._router
 
-    async def handle_chapter(self):
+    async def handle_chapter(self, request: Request):
         """
         Get all chapters of the Bhagavad Gita.
         
         Returns:
             List[ChapterResponse]: List of all 18 chapters with their metadata
         """
-        all_chapters = self.ctx.chapter_repository.get_all()
-        return [x.to_dict() for x in all_chapters]
+        return await self.static_response(
+            request,
+            "chapter",
+            lambda: [x.to_dict() for x in self.ctx.chapter_repository.get_all()],
+        )
 
-    async def handle_chapter_by_number(self, chapter_number: int):
+    async def handle_chapter_by_number(self, request: Request, chapter_number: int):
         """
         Get a specific chapter by its number.
         
@@ -126,9 +149,33 @@ class ChapterController(Controller):
         Raises:
             HTTPException: 404 if chapter not found
         """
-        chapter = self.ctx.chapter_repository.get_chapter_by_number(chapter_number)
 
-        if not chapter:
-            raise HTTPException(status_code=404, detail="Item not found")
+        def build():
+            chapter = self.ctx.chapter_repository.get_chapter_by_number(chapter_number)
+            return chapter.to_dict() if chapter else None
+
+        return await self.static_response(request, f"chapter:{chapter_number}", build)
 
-        return chapter.to_dict()
+    async def handle_chapter_detail(self, request: Request, chapter_number: int):
+        """
+        Get a chapter with all its verses and their translations.
+
+        Args:
+            chapter_number (int): Chapter number (1-18)
+
+        Returns:
+            ChapterDetailResponse: Chapter details with verses and translations
+
+        Raises:
+            HTTPException: 404 if chapter not found
+        """
+
+        def build():
+            chapter_detail = self.ctx.chapter_repository.get_detail_by_number(
+                chapter_number
+            )
+            return chapter_detail.to_dict() if chapter_detail else None
+
+        return await self.static_response(
+            request, f"chapter:{chapter_number}:detail", build
+        )
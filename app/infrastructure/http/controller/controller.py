@@ -1,9 +1,12 @@
 from abc import ABC, abstractmethod
+from typing import Any, Callable
+
 from app.application.application_construct import (
     ApplicationConstruct,
     ApplicationContainer,
 )
-from fastapi import APIRouter
+from app.infrastructure.util.executor import run_io
+from fastapi import APIRouter, HTTPException, Request
 
 
 class Controller(ABC):
@@ -15,3 +18,20 @@ class Controller(ABC):
     def set_app(self, app: ApplicationConstruct, ctx: ApplicationContainer):
         self.app = app
         self.ctx = ctx
+
+    async def static_response(
+        self, request: Request, key: str, build: Callable[[], Any]
+    ):
+        """
+        Payload that only changes with the corpus, served from the app's
+        `StaticResponseCache` when one is configured. `build` returns None
+        or an empty result for a 404.
+        """
+        response_cache = getattr(self.app, "response_cache", None)
+        if response_cache is not None:
+            return await response_cache.respond(request, key, build)
+
+        data = await run_io(build)
+        if not data:
+            raise HTTPException(status_code=404, detail="Item not found")
+        return data
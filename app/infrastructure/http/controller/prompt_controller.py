@@ -1,14 +1,17 @@
 from dataclasses import dataclass, field
-from typing import List, Literal
+from typing import AsyncGenerator, List, Literal, Tuple
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
 from app.domain.entity.gita_entity import GitaEntity, MixedGitaEntity
 from app.domain.entity.chapter_entity import ChapterEntity
 from app.domain.value_object.pattern_matching_result import PatternMatchingResult
 from app.domain.value_object.attachment import Attachment
 from app.infrastructure.http.controller.controller import Controller
+from app.infrastructure.util.executor import run_io
 from pydantic import BaseModel, Field
 from rich.console import Console
 from os import getenv
+import json
 import random
 import time
 
@@ -34,6 +37,8 @@ class ChatResponse:
     answer_system: Literal["intent", "semantic"] = "intent"
     suggestions: List[str] = field(default_factory=list)
     attachments: List[Attachment] = field(default_factory=list)
+    # Intent (or "semantic_search") the answer is built for, not serialized
+    action: str | None = None
 
     def to_dict(self):
         return {
@@ -162,6 +167,14 @@ class PromptController(Controller):
                 }
             }
         )(self.handle_prompt)
+
+        self._router.post(
+            "/prompt/stream",
+            summary="Ask AI about Bhagavad Gita (streaming)",
+            description="Same as /prompt, but the response is a Server-Sent Events stream: the retrieved context is sent first, followed by the answer tokens as they are generated.",
+            response_description="text/event-stream with context, token and done events",
+            response_class=StreamingResponse,
+        )(self.handle_prompt_stream)
         
         self._router.get(
             "/suggestions",
@@ -239,10 +252,86 @@ class PromptController(Controller):
         Returns:
             PromptResponse: AI response with context, suggestions, and attachments
         """
+        chat_response, prompt = await run_io(self.build_response, request.message)
+        if prompt is None:
+            return chat_response.to_dict()
+
+        # perf
+        start_time = time.perf_counter()
+        async for chunk in self.generate_answer(prompt):
+            chat_response.answer += chunk
+        end_time = time.perf_counter()
+        time_duration = end_time - start_time
+        print(f"Took (generation) {time_duration:.3f} seconds")
+
+        await run_io(self.store_answer, request.message, chat_response)
+        return chat_response.to_dict()
+
+    async def handle_prompt_stream(self, request: PromptRequest):
+        """
+        Process user prompt and stream the AI response as Server-Sent Events.
+
+        Events, in order: `context` (the response without its answer),
+        `token` for every generated chunk and `done` with the full answer.
+        An `error` event replaces the remaining ones when generation fails.
+
+        Args:
+            request (PromptRequest): User's question or prompt
+
+        Returns:
+            StreamingResponse: text/event-stream response
+        """
+        return StreamingResponse(
+            self.stream_prompt(request.message),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    async def stream_prompt(self, user_input: str) -> AsyncGenerator[str, None]:
+        try:
+            chat_response, prompt = await run_io(self.build_response, user_input)
+            context = chat_response.to_dict()
+            context.pop("answer")
+            yield sse_event("context", context)
+
+            if prompt is None:
+                yield sse_event("token", {"content": chat_response.answer})
+            else:
+                async for chunk in self.generate_answer(prompt):
+                    chat_response.answer += chunk
+                    yield sse_event("token", {"content": chunk})
+                await run_io(self.store_answer, user_input, chat_response)
+
+            yield sse_event("done", {"answer": chat_response.answer})
+        except Exception as e:
+            self.console.print(f"[red][ERROR][/red] Streaming gagal: {e}")
+            yield sse_event("error", {"message": "Gagal menghasilkan jawaban."})
+
+    async def generate_answer(self, prompt: str) -> AsyncGenerator[str, None]:
+        response = self.ctx.llm_collection.general.agenerate_stream(prompt, 256)
+        async for chunk in response:
+            if chunk.content_chunk:
+                yield chunk.content_chunk
+
+    def store_answer(self, user_input: str, chat_response: ChatResponse):
+        answer_cache = self.ctx.answer_cache
+        if not answer_cache or not chat_response.answer.strip():
+            return
+        if answer_cache.cacheable(chat_response.action):
+            labels = [x.label for x in chat_response.context]
+            answer_cache.set(user_input, labels, chat_response.answer)
+
+    def build_response(self, user_input: str) -> Tuple[ChatResponse, str | None]:
+        """
+        Retrieve the context for `user_input`. Returns the response without
+        its answer together with the prompt to generate it, or None as prompt
+        when the answer is already known (direct intent, no context, cached).
+
+        Blocking (intent LLM call, encoding, FAISS), run it off the event loop.
+        """
         chat_response = ChatResponse()
         chat_response.suggestions = self.get_random_suggestions()
 
-        user_input = request.message
         # perf
         start_time = time.perf_counter()
         results = self.app.get_context(user_input)
@@ -254,109 +343,124 @@ class PromptController(Controller):
 
         if not results or (isinstance(results, list) and len(results) <= 0):
             chat_response.answer = "Pertanyaan anda tidak sesuai konteks."
-            return chat_response.to_dict()
+            return chat_response, None
 
-        ##############################################################################
         if isinstance(results, PatternMatchingResult):
             chat_response.answer_system = "intent"
 
-            if results.type == "context":
-                flatten_pattern_context: List[str] = []
-                seen_pattern_context: List[str] = []
-                for ctx in results.context:
-                    if ctx.label in seen_pattern_context:
-                        continue
-
-                    seen_pattern_context.append(ctx.label)
-                    flatten_pattern_context.append(ctx.content)
-                    chat_response.context.append(
-                        ChatContext(
-                            label=ctx.label,
-                            content=ctx.display_content,
-                            link=ctx.link,
-                        )
-                    )
-                    chat_response.attachments.extend(ctx.attachments)
-
-                prompt = self.ctx.prompt_builder.generate_flexible_prompt(
-                    user_input,
-                    flatten_pattern_context,
-                )
-
-                # perf
-                start_time = time.perf_counter()
-                response = self.ctx.llm_collection.general.generate_stream(prompt, 256)
-                for chunk in response:
-                    chat_response.answer += chunk.content_chunk
-                end_time = time.perf_counter()
-                time_duration = end_time - start_time
-                print(f"Took (generation) {time_duration:.3f} seconds")
-            elif results.type == "direct":
+            if results.type == "direct":
                 chat_response.answer = results.output
-        if isinstance(results, list):
-            chat_response.answer_system = "semantic"
+                return chat_response, None
 
+            chat_response.action = results.action
+            prompt = self.__build_pattern_prompt(user_input, results, chat_response)
+        else:
+            chat_response.answer_system = "semantic"
+            chat_response.action = "semantic_search"
             self.console.print(
                 f"[yellow][AI][/yellow] AI menemukan {len(results)} konteks terkait"
             )
+            prompt = self.__build_semantic_prompt(user_input, results, chat_response)
+
+        cached_answer = self.get_cached_answer(user_input, chat_response)
+        if cached_answer is not None:
+            self.console.print("[yellow][AI][/yellow] Jawaban diambil dari cache")
+            chat_response.answer = cached_answer
+            return chat_response, None
+
+        self.console.print(
+            "[yellow][AI][/yellow] AI sedang merangkai kalimat yang sesuai"
+        )
+        return chat_response, prompt
+
+    def get_cached_answer(
+        self, user_input: str, chat_response: ChatResponse
+    ) -> str | None:
+        answer_cache = self.ctx.answer_cache
+        if not answer_cache or not answer_cache.cacheable(chat_response.action):
+            return None
+        labels = [x.label for x in chat_response.context]
+        return answer_cache.get(user_input, labels)
+
+    def __build_pattern_prompt(
+        self,
+        user_input: str,
+        results: PatternMatchingResult,
+        chat_response: ChatResponse,
+    ) -> str:
+        flatten_pattern_context: List[str] = []
+        seen_pattern_context: List[str] = []
+        for ctx in results.context:
+            if ctx.label in seen_pattern_context:
+                continue
+
+            seen_pattern_context.append(ctx.label)
+            flatten_pattern_context.append(ctx.content)
+            chat_response.context.append(
+                ChatContext(
+                    label=ctx.label,
+                    content=ctx.display_content,
+                    link=ctx.link,
+                )
+            )
+            chat_response.attachments.extend(ctx.attachments)
+
+        return self.ctx.prompt_builder.generate_flexible_prompt(
+            user_input,
+            flatten_pattern_context,
+        )
 
-            prompt = None
-            flatten_context: List[GitaEntity] = []
-            seen_context: List[str] = []
+    def __build_semantic_prompt(
+        self,
+        user_input: str,
+        results: List[GitaEntity | MixedGitaEntity],
+        chat_response: ChatResponse,
+    ) -> str:
+        flatten_context: List[GitaEntity] = []
+        seen_context: List[str] = []
+
+        for ctx in results:
+            if isinstance(ctx, GitaEntity):
+                context_label = f"BG {ctx.c_chapter_number}.{ctx.v_verse_number}"
+                if context_label in seen_context:
+                    continue
+
+                seen_context.append(context_label)
+                flatten_context.append(ctx)
+
+                chat_response.context.append(
+                    ChatContext(
+                        label=context_label,
+                        content=f"\n\n*{ctx.v_text_sanskrit.strip()}*\n\n{ctx.vt_content.strip()}",
+                        link=f"{self.library_base_url}/chapter/{ctx.c_chapter_number}/verse/{ctx.v_verse_number}",
+                    )
+                )
+            if isinstance(ctx, MixedGitaEntity):
+                i = 0
+                for g in ctx.gita:
+                    context_label = (
+                        f"BG {g.c_chapter_number}.{g.v_verse_number} (m{i})"
+                    )
 
-            for ctx in results:
-                if isinstance(ctx, GitaEntity):
-                    context_label = f"BG {ctx.c_chapter_number}.{ctx.v_verse_number}"
                     if context_label in seen_context:
                         continue
 
                     seen_context.append(context_label)
-                    flatten_context.append(ctx)
-
+                    flatten_context.append(g)
                     chat_response.context.append(
                         ChatContext(
                             label=context_label,
-                            content=f"\n\n*{ctx.v_text_sanskrit.strip()}*\n\n{ctx.vt_content.strip()}",
-                            link=f"{self.library_base_url}/chapter/{ctx.c_chapter_number}/verse/{ctx.v_verse_number}",
+                            content=f"\n\n*{g.v_text_sanskrit.strip()}*\n\n{g.vt_content.strip()}",
+                            link=f"{self.library_base_url}/chapter/{g.c_chapter_number}/verse/{g.v_verse_number}",
                         )
                     )
-                if isinstance(ctx, MixedGitaEntity):
-                    i = 0
-                    for g in ctx.gita:
-                        context_label = (
-                            f"BG {g.c_chapter_number}.{g.v_verse_number} (m{i})"
-                        )
-
-                        if context_label in seen_context:
-                            continue
-
-                        seen_context.append(context_label)
-                        flatten_context.append(g)
-                        chat_response.context.append(
-                            ChatContext(
-                                label=context_label,
-                                content=f"\n\n*{g.v_text_sanskrit.strip()}*\n\n{g.vt_content.strip()}",
-                                link=f"{self.library_base_url}/chapter/{g.c_chapter_number}/verse/{g.v_verse_number}",
-                            )
-                        )
-                    i += 1
-
-            prompt = self.ctx.prompt_builder.generate_global_gita_prompt(
-                user_input,
-                flatten_context,
-            )
+                i += 1
 
-            self.console.print(
-                "[yellow][AI][/yellow] AI sedang merangkai kalimat yang sesuai"
-            )
-            # perf
-            start_time = time.perf_counter()
-            response = self.ctx.llm_collection.general.generate_stream(prompt, 256)
+        return self.ctx.prompt_builder.generate_global_gita_prompt(
+            user_input,
+            flatten_context,
+        )
 
-            for chunk in response:
-                chat_response.answer += chunk.content_chunk
-            end_time = time.perf_counter()
-            time_duration = end_time - start_time
-            print(f"Took (generation#2) {time_duration:.3f} seconds")
 
-        return chat_response.to_dict()
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
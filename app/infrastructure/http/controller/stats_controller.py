@@ -0,0 +1,30 @@
+from fastapi import APIRouter
+from app.infrastructure.http.controller.controller import Controller
+
+
+class StatsController(Controller):
+    def __init__(self):
+        self._router = APIRouter(
+            prefix="/stats",
+            tags=["Monitoring"],
+        )
+
+        self._router.get(
+            "",
+            summary="Get runtime counters",
+            description="Retrieve runtime counters such as cache hit/miss rates, for scraping by monitoring tools.",
+            response_description="Counters grouped by component",
+        )(self.handle_stats)
+
+    @property
+    def router(self) -> APIRouter:
+        return self._router
+
+    async def handle_stats(self):
+        """
+        Get runtime counters of the running worker.
+
+        Returns:
+            dict: Counters grouped by component name
+        """
+        return self.app.get_stats()
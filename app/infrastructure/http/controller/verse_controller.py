@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Request
 from app.infrastructure.http.controller.controller import Controller
 from pydantic import BaseModel
 from typing import List, Optional
@@ -133,7 +133,7 @@ class VerseController(Controller):
     def router(self) -> APIRouter:
         return self._router
 
-    async def handle_verse_list(self, chapter_number: int):
+    async def handle_verse_list(self, request: Request, chapter_number: int):
         """
         Get all verses from a specific chapter.
         
@@ -143,10 +143,20 @@ class VerseController(Controller):
         Returns:
             List[VerseResponse]: List of verses in the chapter
         """
-        chapter_verses = self.ctx.verse_repository.get_by_chapter_number(chapter_number)
-        return [x.to_dict() for x in chapter_verses]
 
-    async def handle_verse_detail(self, chapter_number: int, verse_number: int):
+        def build():
+            chapter_verses = self.ctx.verse_repository.get_by_chapter_number(
+                chapter_number
+            )
+            return [x.to_dict() for x in chapter_verses]
+
+        return await self.static_response(
+            request, f"chapter:{chapter_number}:verse", build
+        )
+
+    async def handle_verse_detail(
+        self, request: Request, chapter_number: int, verse_number: int
+    ):
         """
         Get a specific verse with all its translations.
         
@@ -160,19 +170,14 @@ class VerseController(Controller):
         Raises:
             HTTPException: 404 if verse not found
         """
-        verse_detail = self.ctx.verse_repository.get_by_chapter_verse_number(
-            chapter_number,
-            verse_number,
-        )
 
-        if not verse_detail:
-            raise HTTPException(status_code=404, detail="Item not found")
+        def build():
+            # Verse and translations in one round trip
+            verse_detail = self.ctx.verse_repository.get_detail_by_chapter_verse_number(
+                chapter_number, verse_number
+            )
+            return verse_detail.to_dict() if verse_detail else None
 
-        translation = self.ctx.verse_translation_repository.get_by_verse_id(
-            verse_detail.id
+        return await self.static_response(
+            request, f"chapter:{chapter_number}:verse:{verse_number}", build
         )
-
-        return {
-            **verse_detail.to_dict(),
-            "translations": [x.to_dict() for x in translation],
-        }
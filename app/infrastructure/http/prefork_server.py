@@ -0,0 +1,118 @@
+import gc
+import os
+import signal
+import socket
+import time
+from typing import Callable, Dict
+
+from rich.console import Console
+
+from app.infrastructure.util.fork import run_worker_exit_callbacks
+
+
+class PreforkServer:
+    """
+    Runs `workers` uvicorn servers in processes forked from the current one.
+
+    Everything loaded before `run()` (models, indexes, corpus) is inherited
+    by the workers and stays shared copy-on-write as long as no one writes
+    to it. The parent only binds the listening socket, forks, and restarts
+    workers that die.
+    """
+
+    def __init__(
+        self,
+        http,
+        host: str = "0.0.0.0",
+        port: int = 8000,
+        workers: int = 2,
+        on_worker_start: Callable[[int], None] | None = None,
+    ):
+        self.console = Console()
+        self.http = http
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.on_worker_start = on_worker_start
+        self.children: Dict[int, int] = {}
+        self.started_at: Dict[int, float] = {}
+        self.stopping = False
+
+    def run(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(2048)
+        sock.set_inheritable(True)
+
+        # Objects tracked by the GC are never moved to a new generation in
+        # the workers, so collections don't write to (and copy) shared pages
+        gc.collect()
+        gc.freeze()
+
+        for i in range(self.workers):
+            self.__spawn(i, sock)
+
+        signal.signal(signal.SIGTERM, self.__stop)
+        signal.signal(signal.SIGINT, self.__stop)
+        self.console.print(
+            f"[blue][INFO][/blue] {self.workers} worker berjalan di "
+            f"http://{self.host}:{self.port}"
+        )
+
+        while self.children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+
+            i = self.children.pop(pid, None)
+            if i is None or self.stopping:
+                continue
+            self.console.print(
+                f"[red][WORKER][/red] Worker {i} (pid {pid}) berhenti "
+                f"dengan status {status}, memulai ulang..."
+            )
+            # Avoid a restart loop when a worker crashes right at startup
+            if time.monotonic() - self.started_at[i] < 1:
+                time.sleep(1)
+            self.__spawn(i, sock)
+
+        sock.close()
+
+    def __spawn(self, i: int, sock: socket.socket):
+        pid = os.fork()
+        if pid:
+            self.children[pid] = i
+            self.started_at[i] = time.monotonic()
+            return
+
+        # Worker process, uvicorn installs its own handlers for a clean stop
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        exit_code = 0
+        try:
+            import uvicorn
+
+            if self.on_worker_start:
+                self.on_worker_start(i)
+            server = uvicorn.Server(uvicorn.Config(self.http, lifespan="on"))
+            server.run(sockets=[sock])
+        except BaseException as e:
+            self.console.print(f"[red][WORKER][/red] Worker {i} gagal: {e}")
+            exit_code = 1
+        finally:
+            try:
+                run_worker_exit_callbacks()
+            finally:
+                os._exit(exit_code)
+
+    def __stop(self, signum, frame):
+        self.stopping = True
+        for pid in self.children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
@@ -0,0 +1,124 @@
+import hashlib
+import json
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict
+
+from fastapi import HTTPException, Request, Response
+
+from app.infrastructure.util.executor import run_io
+
+
+@dataclass
+class StaticResponse:
+    body: bytes
+    etag: str
+    # `StaticResponseCache.generation` the payload was built in
+    generation: int
+
+
+class StaticResponseCache:
+    """
+    Pre-serialized JSON bodies for endpoints whose data only changes with a
+    deployment or a corpus reload, e.g. /chapter and the verse endpoints.
+
+    The first request for a key builds the payload, serializes it to bytes
+    once and derives a strong ETag from its content. Later requests are
+    answered with the stored bytes, skipping the repository, `to_dict` and
+    response model validation, or with 304 Not Modified when the client
+    sends a matching If-None-Match.
+
+    `clear()` starts a new generation. A payload built from the previous
+    corpus while it ran is still answered once, but never stored.
+    """
+
+    def __init__(self, max_age: int = 3600, max_entries: int = 4096):
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.entries: Dict[str, StaticResponse] = {}
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    @property
+    def cache_control(self) -> str:
+        return f"public, max-age={self.max_age}" if self.max_age > 0 else "no-cache"
+
+    async def respond(
+        self, request: Request, key: str, build: Callable[[], Any]
+    ) -> Response:
+        """
+        `build` runs on the io pool and returns the payload, None or an
+        empty result for 404. Missing items are not cached.
+        """
+        with self.lock:
+            generation = self.generation
+            entry = self.entries.get(key)
+            if entry is None or entry.generation != generation:
+                entry = None
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if entry is None:
+            data = await run_io(build)
+            if not data:
+                raise HTTPException(status_code=404, detail="Item not found")
+            entry = self.__store(key, data, generation)
+
+        headers = {"ETag": entry.etag, "Cache-Control": self.cache_control}
+        if etag_matches(request.headers.get("if-none-match"), entry.etag):
+            with self.lock:
+                self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+
+        return Response(
+            content=entry.body, media_type="application/json", headers=headers
+        )
+
+    def clear(self):
+        with self.lock:
+            self.generation += 1
+            self.entries.clear()
+
+    def stats(self) -> dict:
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "bytes": sum(len(x.body) for x in self.entries.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "not_modified": self.not_modified,
+                "max_age": self.max_age,
+                "generation": self.generation,
+            }
+
+    def __store(self, key: str, data: Any, generation: int) -> StaticResponse:
+        # Same encoding as FastAPI's JSONResponse
+        body = json.dumps(
+            data, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode("utf-8")
+        entry = StaticResponse(
+            body=body,
+            etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+            generation=generation,
+        )
+        with self.lock:
+            # The corpus was reloaded while `data` was built
+            if generation != self.generation:
+                return entry
+            if len(self.entries) < self.max_entries:
+                self.entries[key] = entry
+        return entry
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    # If-None-Match uses the weak comparison, W/"x" matches "x"
+    candidates = [x.strip().removeprefix("W/") for x in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
@@ -0,0 +1,148 @@
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List
+
+from google import genai
+
+RATE_LIMIT_WINDOW = 60
+
+
+@dataclass
+class GeminiKeyBudget:
+    """Usage of one API key for one model, quotas are tracked per model."""
+
+    requests: int = 0
+    errors: int = 0
+    rate_limited: int = 0
+    in_flight: int = 0
+    cooldown_until: float = 0.0
+    recent: Deque[float] = field(default_factory=deque)
+
+    def prune(self, now: float):
+        while self.recent and self.recent[0] <= now - RATE_LIMIT_WINDOW:
+            self.recent.popleft()
+
+    def to_dict(self, now: float, rpm: int) -> dict:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "rate_limited": self.rate_limited,
+            "in_flight": self.in_flight,
+            "remaining_rpm": max(0, rpm - len(self.recent)),
+            "cooldown_s": round(max(0.0, self.cooldown_until - now), 1),
+        }
+
+
+class GeminiKey:
+    def __init__(self, api_key: str):
+        self.api_key = api_key
+        self.budgets: Dict[str, GeminiKeyBudget] = {}
+        self.last_used = 0.0
+        self.__client: genai.Client | None = None
+
+    @property
+    def client(self) -> genai.Client:
+        # Created on first use, after any worker fork, then kept alive so its
+        # HTTP connections are reused
+        if self.__client is None:
+            self.__client = genai.Client(api_key=self.api_key)
+        return self.__client
+
+    @property
+    def masked(self) -> str:
+        return f"{self.api_key[:4]}...{self.api_key[-4:]}"
+
+    def budget(self, model_id: str) -> GeminiKeyBudget:
+        return self.budgets.setdefault(model_id, GeminiKeyBudget())
+
+
+class GeminiClientPool:
+    """
+    One long-lived client per API key, shared by every `GeminiLLM`.
+
+    Each call leases the key with the most rate-limit budget left for the
+    model in the last minute. A key answering 429 / RESOURCE_EXHAUSTED is
+    put in cooldown for that model and skipped until it expires.
+    """
+
+    def __init__(
+        self,
+        api_keys: List[str],
+        rpm_per_key: int = 15,
+        cooldown_seconds: float = 60,
+    ):
+        if not api_keys:
+            raise ValueError("At least one Gemini API key is required")
+        self.keys = [GeminiKey(x) for x in api_keys]
+        self.rpm_per_key = rpm_per_key
+        self.cooldown_seconds = cooldown_seconds
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.keys)
+
+    def acquire(
+        self, model_id: str, exclude: List[GeminiKey] | None = None
+    ) -> GeminiKey:
+        with self.lock:
+            now = time.monotonic()
+            candidates = [x for x in self.keys if x not in (exclude or [])]
+            candidates = candidates or self.keys
+            for key in candidates:
+                key.budget(model_id).prune(now)
+
+            available = [
+                x for x in candidates if x.budget(model_id).cooldown_until <= now
+            ]
+            if available:
+                key = max(
+                    available,
+                    key=lambda x: (
+                        self.rpm_per_key
+                        - len(x.budget(model_id).recent)
+                        - x.budget(model_id).in_flight,
+                        -x.last_used,
+                    ),
+                )
+            else:
+                # Every key is cooling down, the one that recovers first is
+                # the best bet
+                key = min(candidates, key=lambda x: x.budget(model_id).cooldown_until)
+
+            budget = key.budget(model_id)
+            budget.recent.append(now)
+            budget.requests += 1
+            budget.in_flight += 1
+            key.last_used = now
+            return key
+
+    def release(self, key: GeminiKey, model_id: str, error: Exception | None = None):
+        with self.lock:
+            budget = key.budget(model_id)
+            budget.in_flight -= 1
+            if error is None:
+                return
+
+            budget.errors += 1
+            if is_rate_limit_error(error):
+                budget.rate_limited += 1
+                budget.cooldown_until = time.monotonic() + self.cooldown_seconds
+
+    def stats(self) -> dict:
+        with self.lock:
+            now = time.monotonic()
+            keys = {}
+            for key in self.keys:
+                for budget in key.budgets.values():
+                    budget.prune(now)
+                keys[key.masked] = {
+                    model_id: budget.to_dict(now, self.rpm_per_key)
+                    for model_id, budget in key.budgets.items()
+                }
+            return {"rpm_per_key": self.rpm_per_key, "keys": keys}
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    return getattr(error, "code", None) == 429 or "RESOURCE_EXHAUSTED" in str(error)
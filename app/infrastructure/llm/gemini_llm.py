@@ -1,10 +1,14 @@
 from typing import Literal, List
 
-from google import genai
 from rich.console import Console
 
 from app.application.service.llm_adapter import LLMAdapter
 from app.domain.value_object.llm_stream import LLMStream
+from app.infrastructure.llm.gemini_client_pool import (
+    GeminiClientPool,
+    GeminiKey,
+    is_rate_limit_error,
+)
 
 
 class GeminiLLM(LLMAdapter):
@@ -16,46 +20,118 @@ class GeminiLLM(LLMAdapter):
             "gemini-2.0-flash-lite",
             "gemma-3-12b-it",
         ],
-        api_keys: List[str],
+        api_keys: List[str] | GeminiClientPool,
     ):
         self.console = Console()
         self.model_id = model_id
-        self.__API_KEY_ROTATION_INDEX = 0
-        self.__API_KEY_LENGTH = len(api_keys)
-        self.__API_KEYS = api_keys
+        # Pass a pool to share clients and key budgets between models
+        self.pool = (
+            api_keys
+            if isinstance(api_keys, GeminiClientPool)
+            else GeminiClientPool(api_keys)
+        )
+        # A rate limited call is retried once on another key
+        self.max_attempts = min(2, len(self.pool))
 
     def setup(self, type: str):
         self.console.print(
             f"[blue][INFO][/blue] Menggunakan model [b]{self.model_id}[/b] for {type}"
         )
 
-        # Load model
-        self.__refresh_client()
-
     def generate(self, prompt: str, max_tokens=256):
-        self.__refresh_client()
+        tried: List[GeminiKey] = []
+        while True:
+            key = self.pool.acquire(self.model_id, tried)
+            tried.append(key)
+            error = None
+            try:
+                result = key.client.models.generate_content(
+                    model=self.model_id,
+                    contents=prompt,
+                )
+                return result.text or ""
+            except Exception as e:
+                error = e
+                if not self.__should_retry(e, tried):
+                    raise
+            finally:
+                self.pool.release(key, self.model_id, error)
 
-        result = self.client.models.generate_content(
-            model=self.model_id,
-            contents=prompt,
-        )
+    def generate_stream(self, prompt: str, max_tokens=256):
+        tried: List[GeminiKey] = []
+        while True:
+            key = self.pool.acquire(self.model_id, tried)
+            tried.append(key)
+            error = None
+            started = False
+            try:
+                response = key.client.models.generate_content_stream(
+                    model=self.model_id,
+                    contents=prompt,
+                )
 
-        return result.text or ""
+                for chunk in response:
+                    if chunk.text:
+                        started = True
+                        yield LLMStream(model=self.model_id, content_chunk=chunk.text)
+                return
+            except Exception as e:
+                error = e
+                # Chunks already sent can't be taken back
+                if started or not self.__should_retry(e, tried):
+                    raise
+            finally:
+                self.pool.release(key, self.model_id, error)
 
-    def generate_stream(self, prompt: str, max_tokens=256):
-        response = self.generate(prompt, max_tokens)
-        yield LLMStream(model=self.model_id, content_chunk=response or "")
-
-    def __refresh_client(self):
-        self.client: genai.Client = genai.Client(api_key=self.__API_KEY)
-
-    def __rotate_api_key(self):
-        self.__API_KEY_ROTATION_INDEX += 1
-        if self.__API_KEY_ROTATION_INDEX >= self.__API_KEY_LENGTH:
-            self.__API_KEY_ROTATION_INDEX = 0
-        print("Using GEMINI KEY INDEX:", self.__API_KEY_ROTATION_INDEX)
-        return self.__API_KEYS[self.__API_KEY_ROTATION_INDEX]
-
-    @property
-    def __API_KEY(self):
-        return self.__rotate_api_key()
+    async def agenerate(self, prompt: str, max_tokens=256):
+        tried: List[GeminiKey] = []
+        while True:
+            key = self.pool.acquire(self.model_id, tried)
+            tried.append(key)
+            error = None
+            try:
+                result = await key.client.aio.models.generate_content(
+                    model=self.model_id,
+                    contents=prompt,
+                )
+                return result.text or ""
+            except Exception as e:
+                error = e
+                if not self.__should_retry(e, tried):
+                    raise
+            finally:
+                self.pool.release(key, self.model_id, error)
+
+    async def agenerate_stream(self, prompt: str, max_tokens=256):
+        tried: List[GeminiKey] = []
+        while True:
+            key = self.pool.acquire(self.model_id, tried)
+            tried.append(key)
+            error = None
+            started = False
+            try:
+                response = await key.client.aio.models.generate_content_stream(
+                    model=self.model_id,
+                    contents=prompt,
+                )
+
+                async for chunk in response:
+                    if chunk.text:
+                        started = True
+                        yield LLMStream(model=self.model_id, content_chunk=chunk.text)
+                return
+            except Exception as e:
+                error = e
+                if started or not self.__should_retry(e, tried):
+                    raise
+            finally:
+                self.pool.release(key, self.model_id, error)
+
+    def __should_retry(self, error: Exception, tried: List[GeminiKey]) -> bool:
+        if not is_rate_limit_error(error) or len(tried) >= self.max_attempts:
+            return False
+        self.console.print(
+            f"[yellow][GEMINI][/yellow] Kunci {tried[-1].masked} terkena rate limit, "
+            "mencoba kunci lain"
+        )
+        return True
@@ -0,0 +1,372 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass, field
+from typing import AsyncGenerator, Deque, Dict, List, Tuple
+
+from rich.console import Console
+
+from app.application.service.llm_adapter import LLMAdapter
+from app.domain.value_object.llm_stream import LLMStream
+from app.infrastructure.util.executor import BoundedExecutor
+from app.infrastructure.util.stats import percentile
+
+
+@dataclass
+class ProviderStats:
+    calls: int = 0
+    wins: int = 0
+    errors: int = 0
+    cancelled: int = 0
+    # Successful latencies, full answer for generate, first chunk for streams
+    latencies: Dict[str, Deque[float]] = field(
+        default_factory=lambda: {
+            "generate": deque(maxlen=200),
+            "stream": deque(maxlen=200),
+        }
+    )
+
+    def to_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "wins": self.wins,
+            "errors": self.errors,
+            "cancelled": self.cancelled,
+            **{
+                f"{kind}_p95_s": round(percentile(values, 95), 3)
+                for kind, values in self.latencies.items()
+            },
+        }
+
+
+class HedgedLLM(LLMAdapter):
+    """
+    Composite adapter over several providers, e.g. two Gemini models and a
+    local Ollama model, usable for any `LLMCollection` role.
+
+    The first provider is called alone. When it has not answered within
+    its recent p95 latency (first chunk for streams), the next provider is
+    started as a hedge and the first to answer wins. A failing provider
+    starts the next one immediately. `timeout` bounds a whole answer, or
+    the first chunk of a stream; after that a stream only fails when no
+    chunk arrives for `chunk_timeout` seconds, so long answers can finish.
+
+    In the async methods the losing calls are cancelled. Threads can't be
+    cancelled, so in the sync `generate` the losers run to completion in
+    the background and their answers are discarded. The sync
+    `generate_stream` only falls back, it doesn't hedge.
+    """
+
+    def __init__(
+        self,
+        providers: List[LLMAdapter],
+        timeout: float = 30,
+        chunk_timeout: float = 10,
+        hedge_delay: float = 2.0,
+        hedge_percentile: float = 95,
+        min_samples: int = 20,
+        max_workers: int = 16,
+    ):
+        if not providers:
+            raise ValueError("HedgedLLM needs at least one provider")
+        self.console = Console()
+        self.providers = providers
+        self.timeout = timeout
+        self.chunk_timeout = chunk_timeout
+        # Used until the primary provider has `min_samples` latencies
+        self.initial_hedge_delay = hedge_delay
+        self.hedge_percentile = hedge_percentile
+        self.min_samples = min_samples
+        self.executor = BoundedExecutor("hedged-llm", max_workers)
+        self.lock = threading.RLock()
+        self.provider_stats = [ProviderStats() for _ in providers]
+        self.hedges = 0
+        self.timeouts = 0
+        self.chunk_timeouts = 0
+
+    @property
+    def model_id(self) -> str:
+        return "+".join(provider_name(x) for x in self.providers)
+
+    def setup(self, type: str):
+        for provider in self.providers:
+            provider.setup(type)
+
+    def hedge_delay(self, kind: str) -> float:
+        with self.lock:
+            latencies = list(self.provider_stats[0].latencies[kind])
+        if len(latencies) < self.min_samples:
+            return self.initial_hedge_delay
+        return percentile(latencies, self.hedge_percentile)
+
+    def generate(self, prompt: str, max_tokens=256):
+        pending = iter(range(len(self.providers)))
+        futures: Dict[Future, Tuple[int, float]] = {}
+        deadline = time.monotonic() + self.timeout
+        last_error: Exception | None = None
+
+        def launch() -> bool:
+            i = next(pending, None)
+            if i is None:
+                return False
+            self.__record_call(i)
+            provider = self.providers[i]
+            future = self.executor.submit(provider.generate, prompt, max_tokens)
+            futures[future] = (i, time.perf_counter())
+            return True
+
+        launch()
+        try:
+            while futures:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                done, _ = wait(
+                    futures,
+                    timeout=min(remaining, self.hedge_delay("generate")),
+                    return_when=FIRST_COMPLETED,
+                )
+                if not done:
+                    if launch():
+                        self.__record_hedge()
+                    continue
+
+                for future in done:
+                    i, started_at = futures.pop(future)
+                    if future.exception() is None:
+                        self.__record_win(i, "generate", started_at)
+                        return future.result()
+                    last_error = future.exception()
+                    self.__record_error(i, last_error)
+                    launch()
+        finally:
+            for future, (i, _) in futures.items():
+                future.cancel()
+                self.__record_cancel(i)
+
+        raise self.__failure(last_error)
+
+    def generate_stream(self, prompt: str, max_tokens=256):
+        last_error: Exception | None = None
+        for i, provider in enumerate(self.providers):
+            self.__record_call(i)
+            started_at = time.perf_counter()
+            started = False
+            try:
+                for chunk in provider.generate_stream(prompt, max_tokens):
+                    if not started:
+                        started = True
+                        self.__record_win(i, "stream", started_at)
+                    yield chunk
+                return
+            except Exception as e:
+                # Chunks already sent can't be taken back
+                if started:
+                    raise
+                last_error = e
+                self.__record_error(i, e)
+
+        raise self.__failure(last_error)
+
+    async def agenerate(self, prompt: str, max_tokens=256):
+        loop = asyncio.get_running_loop()
+        pending = iter(range(len(self.providers)))
+        tasks: Dict[asyncio.Task, Tuple[int, float]] = {}
+        deadline = loop.time() + self.timeout
+        last_error: BaseException | None = None
+
+        def launch() -> bool:
+            i = next(pending, None)
+            if i is None:
+                return False
+            self.__record_call(i)
+            provider = self.providers[i]
+            task = asyncio.ensure_future(provider.agenerate(prompt, max_tokens))
+            tasks[task] = (i, time.perf_counter())
+            return True
+
+        launch()
+        try:
+            while tasks:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                done, _ = await asyncio.wait(
+                    tasks,
+                    timeout=min(remaining, self.hedge_delay("generate")),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    if launch():
+                        self.__record_hedge()
+                    continue
+
+                for task in done:
+                    i, started_at = tasks.pop(task)
+                    if task.exception() is None:
+                        self.__record_win(i, "generate", started_at)
+                        return task.result()
+                    last_error = task.exception()
+                    self.__record_error(i, last_error)
+                    launch()
+        finally:
+            for task, (i, _) in tasks.items():
+                task.cancel()
+                self.__record_cancel(i)
+
+        raise self.__failure(last_error)
+
+    async def agenerate_stream(
+        self, prompt: str, max_tokens=256
+    ) -> AsyncGenerator[LLMStream, None]:
+        loop = asyncio.get_running_loop()
+        pending = iter(range(len(self.providers)))
+        # Each task waits for the first chunk of one provider's stream
+        tasks: Dict[asyncio.Task, Tuple[int, AsyncGenerator, float]] = {}
+        deadline = loop.time() + self.timeout
+        last_error: BaseException | None = None
+        winner: AsyncGenerator | None = None
+        first_chunk: LLMStream | None = None
+
+        def launch() -> bool:
+            i = next(pending, None)
+            if i is None:
+                return False
+            self.__record_call(i)
+            stream = self.providers[i].agenerate_stream(prompt, max_tokens)
+            task = asyncio.ensure_future(next_chunk(stream))
+            tasks[task] = (i, stream, time.perf_counter())
+            return True
+
+        launch()
+        try:
+            while tasks and winner is None:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                done, _ = await asyncio.wait(
+                    tasks,
+                    timeout=min(remaining, self.hedge_delay("stream")),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    if launch():
+                        self.__record_hedge()
+                    continue
+
+                for task in done:
+                    i, stream, started_at = tasks.pop(task)
+                    if task.exception() is None:
+                        self.__record_win(i, "stream", started_at)
+                        winner, first_chunk = stream, task.result()
+                        break
+                    last_error = task.exception()
+                    self.__record_error(i, last_error)
+                    launch()
+        finally:
+            for task, (i, _, _) in tasks.items():
+                task.cancel()
+                self.__record_cancel(i)
+            # Includes streams whose first chunk came in with the winner's,
+            # cancelling their finished task does not close them
+            await close_streams(tasks)
+
+        if winner is None:
+            raise self.__failure(last_error)
+
+        try:
+            # An empty stream ends without a first chunk
+            if first_chunk is None:
+                return
+            yield first_chunk
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(
+                        next_chunk(winner), self.chunk_timeout
+                    )
+                except asyncio.TimeoutError:
+                    with self.lock:
+                        self.chunk_timeouts += 1
+                    raise TimeoutError(
+                        f"LLM stream sent nothing for {self.chunk_timeout}s"
+                    )
+                if chunk is None:
+                    return
+                yield chunk
+        finally:
+            await winner.aclose()
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "hedges": self.hedges,
+                # No answer, or no first chunk, within `timeout`
+                "timeouts": self.timeouts,
+                # Streams that stalled after their first chunk
+                "chunk_timeouts": self.chunk_timeouts,
+                "hedge_delay_s": {
+                    kind: round(self.hedge_delay(kind), 3)
+                    for kind in ("generate", "stream")
+                },
+                "providers": {
+                    f"{i}:{provider_name(x)}": y.to_dict()
+                    for i, (x, y) in enumerate(zip(self.providers, self.provider_stats))
+                },
+            }
+
+    def __failure(self, error: BaseException | None) -> BaseException:
+        if error is not None:
+            return error
+        with self.lock:
+            self.timeouts += 1
+        return TimeoutError(f"No LLM provider answered within {self.timeout}s")
+
+    def __record_call(self, i: int):
+        with self.lock:
+            self.provider_stats[i].calls += 1
+
+    def __record_hedge(self):
+        with self.lock:
+            self.hedges += 1
+
+    def __record_win(self, i: int, kind: str, started_at: float):
+        with self.lock:
+            self.provider_stats[i].wins += 1
+            self.provider_stats[i].latencies[kind].append(
+                time.perf_counter() - started_at
+            )
+
+    def __record_error(self, i: int, error: BaseException):
+        with self.lock:
+            self.provider_stats[i].errors += 1
+        self.console.print(
+            f"[yellow][LLM][/yellow] Provider {i} gagal: {error}, mencoba cadangan"
+        )
+
+    def __record_cancel(self, i: int):
+        with self.lock:
+            self.provider_stats[i].cancelled += 1
+
+
+async def next_chunk(stream: AsyncGenerator) -> LLMStream | None:
+    try:
+        return await stream.__anext__()
+    except StopAsyncIteration:
+        return None
+
+
+async def close_streams(tasks: Dict[asyncio.Task, Tuple[int, AsyncGenerator, float]]):
+    """Waits for the cancelled first chunk tasks, then closes their streams."""
+    # A stream can't be closed while a task is still inside `__anext__`
+    await asyncio.gather(*tasks, return_exceptions=True)
+    for _, stream, _ in tasks.values():
+        try:
+            await stream.aclose()
+        except Exception:
+            pass
+
+
+def provider_name(provider: LLMAdapter) -> str:
+    return getattr(provider, "model_id", type(provider).__name__)
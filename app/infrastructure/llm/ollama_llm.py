@@ -11,6 +11,7 @@ class OllamaLLM(LLMAdapter):
     def __init__(self, model_id: Literal["deepseek-r1:7b"]):
         self.console = Console()
         self.model_id = model_id
+        self.async_client = ollama.AsyncClient()
 
     def setup(self, type: str):
         self.console.print(
@@ -39,3 +40,25 @@ class OllamaLLM(LLMAdapter):
 
         for chunk in result:
             yield LLMStream(model=chunk.model, content_chunk=chunk.message.content)
+
+    async def agenerate(self, prompt: str, max_tokens=256):
+        result = await self.async_client.chat(
+            model=self.model_id,
+            messages=[{"role": "user", "content": prompt}],
+        )
+
+        return result.message.content
+
+    async def agenerate_stream(self, prompt: str, max_tokens=256):
+        result = await self.async_client.chat(
+            model=self.model_id,
+            messages=[
+                {"role": "system", "content": prompt},
+                {"role": "user", "content": "Jawab pertanyaan yang diberikan"},
+            ],
+            stream=True,
+            think=False,
+        )
+
+        async for chunk in result:
+            yield LLMStream(model=chunk.model, content_chunk=chunk.message.content)
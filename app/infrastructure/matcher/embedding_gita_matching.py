@@ -0,0 +1,154 @@
+from typing import List, Literal
+
+import numpy as np
+
+from app.infrastructure.matcher.full_gita_matching import FullGitaMatching
+from app.infrastructure.matcher.rule_intent_parser import (
+    CHAPTER_WORDS,
+    PLURAL_VERSE_WORDS,
+    VERSE_WORDS,
+    count_before,
+    number_after,
+    tokenize,
+    valid_reference,
+    verse_reference,
+)
+from app.infrastructure.util.json_loader import load_json
+
+
+class EmbeddingGitaMatching(FullGitaMatching):
+    """
+    Nearest neighbour intent classifier over labeled example utterances.
+
+    The examples are embedded once with the model that is already loaded by
+    one of the searchers, so no extra model is kept in memory. Numeric
+    parameters (chapter, verse, count) are read from the user input, the
+    remaining ones (expandable, metadata_type) come from the nearest example.
+    """
+
+    def __init__(
+        self,
+        examples_path: str = "data/intent/intent_examples.json",
+        searcher: Literal["chapter", "gita"] = "chapter",
+        min_similarity: float = 0.88,
+        llm_fallback: bool = False,
+        rule_fast_path: bool = True,
+    ):
+        super().__init__(rule_fast_path=rule_fast_path)
+        self.examples: List[dict] = load_json(examples_path)
+        self.searcher = searcher
+        self.min_similarity = min_similarity
+        self.llm_fallback = llm_fallback
+        self.example_embeddings = None
+
+    def classify(self, user_input: str) -> dict | None:
+        matching_result = self.classify_local(user_input)
+        if matching_result:
+            return matching_result
+
+        if self.llm_fallback:
+            return super().classify(user_input)
+
+        return None
+
+    def classify_local(self, user_input: str) -> dict | None:
+        if self.example_embeddings is None:
+            self.example_embeddings = self.__embed(
+                [x["text"] for x in self.examples]
+            )
+
+        query_embedding = self.__embed([user_input])[0]
+        similarities = self.example_embeddings @ query_embedding
+        best = int(np.argmax(similarities))
+        similarity = float(similarities[best])
+
+        if similarity < self.min_similarity:
+            return None
+
+        example = self.examples[best]
+        if example["action"] == "unsupported_query":
+            return None
+
+        parameters = extract_parameters(
+            example["action"], user_input, example["parameters"]
+        )
+        if parameters is None:
+            return None
+
+        return {
+            "action": example["action"],
+            "parameters": parameters,
+            "source": "embedding",
+            "confidence": round(similarity, 3),
+        }
+
+    def __embed(self, texts: List[str]):
+        searcher = (
+            self.app.chapter_searcher
+            if self.searcher == "chapter"
+            else self.app.gita_searcher
+        )
+        embeddings = np.asarray(
+            searcher.encode([f"query: {x}" for x in texts]), dtype="float32"
+        )
+        return embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+
+def extract_parameters(action: str, user_input: str, defaults: dict) -> dict | None:
+    """
+    Fill the parameters of `action` from the user input. Returns None when a
+    required parameter (e.g. the chapter number) is missing, or refers to a
+    chapter or verse that doesn't exist ("bab 25").
+    """
+    parameters = parse_parameters(action, user_input, defaults)
+    if parameters is None or not valid_reference(parameters):
+        return None
+    return parameters
+
+
+def parse_parameters(action: str, user_input: str, defaults: dict) -> dict | None:
+    tokens = tokenize(user_input)
+    reference = verse_reference(tokens)
+    chapter = number_after(tokens, CHAPTER_WORDS)
+    verse = number_after(tokens, VERSE_WORDS)
+    count = count_before(tokens, VERSE_WORDS | PLURAL_VERSE_WORDS)
+    if reference:
+        chapter, verse = reference
+
+    # "bab 4" is the common case, a single bare number is the chapter too
+    if chapter is None:
+        bare_numbers = [int(x) for x in tokens if x.isdigit()]
+        if len(bare_numbers) == 1 and verse is None and count is None:
+            chapter = bare_numbers[0]
+
+    if action == "get_random_verses":
+        return {"count": count or 1}
+
+    if action == "get_specific_verse":
+        if chapter is None or verse is None:
+            return None
+        return {"chapter": chapter, "verse": verse}
+
+    if action == "get_sample_verses":
+        if chapter is None:
+            return None
+        return {
+            "chapter": chapter,
+            "count": count or 3,
+            "expandable": count is None and defaults.get("expandable", True),
+        }
+
+    if action == "get_chapter_summary":
+        if chapter is None:
+            return None
+        return {"chapter": chapter}
+
+    if action == "get_chapter_metadata":
+        if chapter is None:
+            return None
+        return {
+            "chapter": chapter,
+            "metadata_type": defaults.get("metadata_type", "verse_count"),
+        }
+
+    return {}
@@ -5,13 +5,43 @@ from app.domain.value_object.pattern_matching_result import (
     PatternMatchingContext,
 )
 from app.domain.value_object.attachment import Attachment
+from app.infrastructure.matcher.rule_intent_parser import RuleIntentParser
 from os import getenv
+from rich.console import Console
 
 
 class FullGitaMatching(PatternMatching):
     library_base_url = getenv("LIBRARY_BASE_URL") or "http://localhost:5173"
 
+    def __init__(self, rule_fast_path: bool = True):
+        self.console = Console()
+        self.rule_parser = RuleIntentParser() if rule_fast_path else None
+
     def match(self, user_input: str) -> dict | None:
+        # Deterministic fast path, skips the LLM round trip when confident
+        rule_result = self.fast_match(user_input)
+        if rule_result:
+            self.report_source(rule_result)
+            return rule_result
+
+        matching_result = self.classify(user_input)
+        if matching_result:
+            self.report_source(matching_result)
+
+        return matching_result
+
+    def fast_match(self, user_input: str) -> dict | None:
+        if not self.rule_parser:
+            return None
+        return self.rule_parser.parse(user_input)
+
+    def report_source(self, matching_result: dict):
+        self.console.print(
+            f"[yellow][AI][/yellow] Intent [b]{matching_result['action']}[/b] "
+            f"dijawab oleh [b]{matching_result.get('source', 'llm')}[/b]"
+        )
+
+    def classify(self, user_input: str) -> dict | None:
         prompt = """
 Anda adalah AI yang bertugas sebagai 'intent classifier' yang sangat ketat dan efisien untuk chatbot Bhagavad Gita.
 Tugas Anda adalah mengklasifikasikan pertanyaan pengguna ke dalam kategori yang telah ditentukan. Jika pertanyaan tidak termasuk dalam kategori yang diizinkan atau tidak memiliki informasi yang cukup (seperti nomor bab), Anda HARUS mengklasifikasikannya sebagai 'unsupported_query'.
@@ -121,6 +151,7 @@ JSON:
         if json_response["action"] == "unsupported_query":
             return None
 
+        json_response["source"] = "llm"
         return json_response
 
     def handle(
@@ -0,0 +1,65 @@
+import time
+from dataclasses import dataclass, field
+from typing import Callable, List
+
+from app.infrastructure.util.stats import percentile
+
+
+@dataclass
+class IntentEvaluationReport:
+    name: str
+    total: int = 0
+    correct: int = 0
+    latencies_ms: List[float] = field(default_factory=list)
+    mistakes: List[dict] = field(default_factory=list)
+
+    @property
+    def accuracy(self) -> float:
+        return self.correct / self.total if self.total else 0.0
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "total": self.total,
+            "accuracy": round(self.accuracy, 4),
+            "p50_ms": round(percentile(self.latencies_ms, 50), 2),
+            "p99_ms": round(percentile(self.latencies_ms, 99), 2),
+        }
+
+
+def is_same_intent(expected: dict, actual: dict | None) -> bool:
+    if actual is None:
+        return expected["action"] == "unsupported_query"
+
+    if actual["action"] != expected["action"]:
+        return False
+
+    parameters = actual.get("parameters", {})
+    return all(parameters.get(k) == v for k, v in expected["parameters"].items())
+
+
+def evaluate_intent_classifier(
+    name: str,
+    classify: Callable[[str], dict | None],
+    samples: List[dict],
+) -> IntentEvaluationReport:
+    """
+    Run `classify` over labeled `samples` ({"text", "action", "parameters"})
+    and collect accuracy and per-call latency.
+    """
+    report = IntentEvaluationReport(name=name)
+    for sample in samples:
+        start_time = time.perf_counter()
+        try:
+            result = classify(sample["text"])
+        except Exception as e:
+            result = {"action": "error", "parameters": {}, "error": str(e)}
+        report.latencies_ms.append((time.perf_counter() - start_time) * 1000)
+
+        report.total += 1
+        if is_same_intent(sample, result):
+            report.correct += 1
+        else:
+            report.mistakes.append({"sample": sample, "result": result})
+
+    return report
@@ -0,0 +1,384 @@
+import re
+from typing import Dict, List, Tuple
+
+UNIT_WORDS: Dict[str, int] = {
+    "satu": 1,
+    "sebuah": 1,
+    "dua": 2,
+    "tiga": 3,
+    "empat": 4,
+    "lima": 5,
+    "enam": 6,
+    "tujuh": 7,
+    "delapan": 8,
+    "sembilan": 9,
+}
+SPECIAL_NUMBER_WORDS: Dict[str, int] = {
+    "pertama": 1,
+    "sepuluh": 10,
+    "sebelas": 11,
+    "seratus": 100,
+}
+
+CHAPTER_COUNT = 18
+CHAPTER_WORDS = {"bab", "chapter", "adhyaya"}
+VERSE_WORDS = {"sloka", "shloka", "ayat", "syair", "verse", "kutipan", "quote"}
+PLURAL_VERSE_WORDS = {"sloka-sloka", "ayat-ayat", "beberapa", "contoh-contoh"}
+GITA_WORDS = {
+    "gita",
+    "geeta",
+    "bg",
+    "bhagavad",
+    "bhagawad",
+    "bhagavadgita",
+    "bhagawadgita",
+    "kitab",
+}
+QUESTION_COUNT_WORDS = {"berapa", "jumlah", "total", "banyak", "banyaknya"}
+CHAPTER_NAME_WORDS = {"judul", "judulnya", "nama", "namanya", "name", "title"}
+WRITER_WORDS = {
+    "penulis",
+    "penulisnya",
+    "pengarang",
+    "pengarangnya",
+    "pembuat",
+    "pembuatnya",
+    "penyusun",
+    "menulis",
+    "ditulis",
+    "mengarang",
+    "dikarang",
+}
+RANDOM_WORDS = {
+    "acak",
+    "random",
+    "bebas",
+    "sembarang",
+    "sembarangan",
+    "inspiratif",
+    "inspirasi",
+    "renungan",
+    "direnungkan",
+}
+SAMPLE_WORDS = {"contoh", "sebutkan", "penting", "pembuka", "penutup"}
+SHOW_WORDS = {"tunjukkan", "tampilkan", "perlihatkan"}
+SUMMARY_WORDS = {
+    "ringkasan",
+    "ringkasannya",
+    "rangkuman",
+    "rangkumannya",
+    "ringkas",
+    "rangkum",
+    "rangkumkan",
+    "ringkaskan",
+    "cerita",
+    "ceritakan",
+    "tentang",
+    "inti",
+    "intinya",
+    "jelaskan",
+    "penjelasan",
+    "isi",
+    "isinya",
+    "gambaran",
+    "ikhtisar",
+    "summary",
+    "bahas",
+    "membahas",
+    "dibahas",
+}
+FILLER_WORDS = {
+    "ada",
+    "apa",
+    "apakah",
+    "aku",
+    "berikan",
+    "beri",
+    "bisa",
+    "boleh",
+    "butuh",
+    "coba",
+    "dalam",
+    "dari",
+    "dan",
+    "di",
+    "dong",
+    "hari",
+    "ingin",
+    "ini",
+    "itu",
+    "ya",
+    "yang",
+    "kasih",
+    "kata",
+    "ke",
+    "lain",
+    "mana",
+    "membaca",
+    "baca",
+    "mau",
+    "minta",
+    "mohon",
+    "pada",
+    "punya",
+    "saja",
+    "saya",
+    "siapa",
+    "siapakah",
+    "secara",
+    "singkat",
+    "sih",
+    "tolong",
+    "untuk",
+    "buatkan",
+    "buat",
+    "tunjukan",
+    "berisi",
+    "terdapat",
+    "the",
+    "of",
+}
+KNOWN_WORDS = (
+    CHAPTER_WORDS
+    | VERSE_WORDS
+    | PLURAL_VERSE_WORDS
+    | GITA_WORDS
+    | QUESTION_COUNT_WORDS
+    | CHAPTER_NAME_WORDS
+    | WRITER_WORDS
+    | RANDOM_WORDS
+    | SAMPLE_WORDS
+    | SHOW_WORDS
+    | SUMMARY_WORDS
+    | FILLER_WORDS
+)
+
+TOKEN_PATTERN = re.compile(r"\d+(?:[.:]\d+)?|\w+(?:-\w+)*")
+VERSE_REFERENCE_PATTERN = re.compile(r"^(\d+)[.:](\d+)$")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercase the text, split it into words and replace Indonesian number
+    words ("lima", "dua belas", "pertama", "ke-34") with digits.
+    """
+    text = text.lower()
+    # "bg2.47" -> "bg 2.47", "ke34" -> "ke 34"
+    text = re.sub(r"([a-z])(\d)", r"\1 \2", text)
+    text = re.sub(r"\bke-(\d)", r"ke \1", text)
+
+    tokens = TOKEN_PATTERN.findall(text)
+    output: List[str] = []
+    i = 0
+    while i < len(tokens):
+        parsed = _parse_number_words(tokens, i)
+        if parsed:
+            value, consumed = parsed
+            output.append(str(value))
+            i += consumed
+            continue
+
+        # Ordinal with digits: "ke 34" -> "34"
+        if tokens[i] == "ke" and i + 1 < len(tokens) and tokens[i + 1].isdigit():
+            i += 1
+            continue
+
+        output.append(tokens[i])
+        i += 1
+
+    return output
+
+
+def _parse_number_words(tokens: List[str], i: int) -> Tuple[int, int] | None:
+    word = tokens[i]
+    if word in SPECIAL_NUMBER_WORDS:
+        return SPECIAL_NUMBER_WORDS[word], 1
+
+    # Ordinal prefix: "kedua", "kelima", "kesebelas"
+    if word not in UNIT_WORDS and word.startswith("ke"):
+        if word[2:] in UNIT_WORDS and word[2:] != "sebuah":
+            word = word[2:]
+        elif word[2:] in SPECIAL_NUMBER_WORDS and word[2:] != "pertama":
+            return SPECIAL_NUMBER_WORDS[word[2:]], 1
+
+    if word not in UNIT_WORDS:
+        return None
+
+    value = UNIT_WORDS[word]
+    next_word = tokens[i + 1] if i + 1 < len(tokens) else None
+    if next_word == "belas" and value > 1:
+        return 10 + value, 2
+    if next_word == "puluh" and value > 1:
+        after = tokens[i + 2] if i + 2 < len(tokens) else None
+        if after in UNIT_WORDS and after != "sebuah":
+            return value * 10 + UNIT_WORDS[after], 3
+        return value * 10, 2
+
+    return value, 1
+
+
+def number_after(tokens: List[str], words: set) -> int | None:
+    """Return the first number that directly follows one of `words`."""
+    for i, token in enumerate(tokens[:-1]):
+        if token in words and tokens[i + 1].isdigit():
+            return int(tokens[i + 1])
+    return None
+
+
+def count_before(tokens: List[str], words: set) -> int | None:
+    """
+    Return the number placed in front of one of `words`, optionally separated
+    by "contoh" / "buah", e.g. "5 sloka" or "2 contoh ayat". Numbers that
+    belong to a chapter ("bab 2 sloka 47") are not counts.
+    """
+    for i, token in enumerate(tokens):
+        if token not in words:
+            continue
+        j = i - 1
+        while j >= 0 and tokens[j] in ("contoh", "buah"):
+            j -= 1
+        if j >= 0 and tokens[j].isdigit():
+            if j > 0 and tokens[j - 1] in CHAPTER_WORDS:
+                continue
+            return int(tokens[j])
+    return None
+
+
+def verse_reference(tokens: List[str]) -> Tuple[int, int] | None:
+    for token in tokens:
+        found = VERSE_REFERENCE_PATTERN.match(token)
+        if found:
+            return int(found.group(1)), int(found.group(2))
+    return None
+
+
+def valid_reference(parameters: dict) -> bool:
+    """Whether the chapter (1-18) and verse (from 1) of `parameters` exist."""
+    if not 1 <= parameters.get("chapter", 1) <= CHAPTER_COUNT:
+        return False
+    return parameters.get("verse", 1) >= 1
+
+
+class RuleIntentParser:
+    """
+    Deterministic intent classifier for the common, well-structured prompts
+    ("Gita 7.7", "bab 18", "apa kata sloka 18.66?").
+
+    Produces the same `{"action": ..., "parameters": ...}` dictionary as the
+    LLM classifier in `FullGitaMatching`, or None when the input is not
+    understood well enough so the caller can fall back to the LLM.
+    """
+
+    def __init__(self, max_unknown_words: int = 1):
+        self.max_unknown_words = max_unknown_words
+
+    def parse(self, user_input: str) -> dict | None:
+        tokens = tokenize(user_input)
+        if not tokens:
+            return None
+
+        unknown_words = [
+            x
+            for x in tokens
+            if x not in KNOWN_WORDS
+            and not x.isdigit()
+            and not VERSE_REFERENCE_PATTERN.match(x)
+        ]
+        if len(unknown_words) > self.max_unknown_words:
+            return None
+
+        result = self.classify(tokens)
+        if not result:
+            return None
+
+        action, parameters = result
+        # "bab 2 karma yoga" is a question about karma in chapter 2, not
+        # a request for its summary
+        if action == "get_chapter_summary" and unknown_words:
+            return None
+        # "bab 19" or "sloka 2.0" don't exist, the classifier handles them
+        if not valid_reference(parameters):
+            return None
+
+        return {
+            "action": action,
+            "parameters": parameters,
+            "source": "rule",
+            "confidence": round(1 - len(unknown_words) / len(tokens), 3),
+        }
+
+    def classify(self, tokens: List[str]) -> Tuple[str, dict] | None:
+        words = set(tokens)
+        chapter = number_after(tokens, CHAPTER_WORDS)
+        verse = number_after(tokens, VERSE_WORDS)
+        count = count_before(tokens, VERSE_WORDS | PLURAL_VERSE_WORDS)
+        reference = verse_reference(tokens)
+        has_verse_word = bool(words & (VERSE_WORDS | PLURAL_VERSE_WORDS))
+
+        if reference:
+            if chapter or verse or count:
+                return None
+            return "get_specific_verse", {
+                "chapter": reference[0],
+                "verse": reference[1],
+            }
+
+        if chapter is None:
+            if words & WRITER_WORDS and not has_verse_word:
+                return "get_writer", {}
+
+            if (
+                words & CHAPTER_WORDS
+                and words & QUESTION_COUNT_WORDS
+                and not has_verse_word
+            ):
+                return "get_chapter_count", {}
+
+            if words & RANDOM_WORDS and has_verse_word and verse is None:
+                return "get_random_verses", {"count": count or 1}
+
+            return None
+
+        if verse is not None:
+            if count is not None:
+                return None
+            return "get_specific_verse", {"chapter": chapter, "verse": verse}
+
+        if words & QUESTION_COUNT_WORDS and has_verse_word and count is None:
+            return "get_chapter_metadata", {
+                "chapter": chapter,
+                "metadata_type": "verse_count",
+            }
+
+        if words & CHAPTER_NAME_WORDS and not has_verse_word:
+            return "get_chapter_metadata", {
+                "chapter": chapter,
+                "metadata_type": "chapter_name",
+            }
+
+        if count is not None:
+            return "get_sample_verses", {
+                "chapter": chapter,
+                "count": count,
+                "expandable": False,
+            }
+
+        if (
+            words & PLURAL_VERSE_WORDS
+            or (has_verse_word and words & SAMPLE_WORDS)
+            or (words & SHOW_WORDS and "isi" in words)
+        ):
+            return "get_sample_verses", {
+                "chapter": chapter,
+                "count": 3,
+                "expandable": True,
+            }
+
+        if has_verse_word or words & RANDOM_WORDS:
+            return None
+
+        remainder = words - FILLER_WORDS - CHAPTER_WORDS - GITA_WORDS
+        if words & SUMMARY_WORDS or not remainder - {str(chapter)}:
+            return "get_chapter_summary", {"chapter": chapter}
+
+        return None
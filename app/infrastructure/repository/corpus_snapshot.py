@@ -0,0 +1,333 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Tuple
+
+from rich.console import Console
+
+from app.application.repository.chapter_repository import ChapterRepository
+from app.application.repository.verse_repository import VerseRepository
+from app.application.repository.verse_translation_repository import (
+    VerseTranslationRepository,
+)
+from app.domain.entity.chapter_entity import ChapterEntity
+from app.domain.entity.gita_entity import GitaEntity
+from app.domain.entity.verse_entity import VerseEntity
+from app.domain.entity.verse_translation_entity import VerseTranslationEntity
+from app.infrastructure.dbclient.mysql_client import MysqlClient
+from app.infrastructure.util.fork import after_fork_in_child
+from app.infrastructure.util.json_loader import load_json
+
+CorpusRows = Tuple[
+    List[ChapterEntity], List[VerseEntity], List[VerseTranslationEntity]
+]
+
+
+@dataclass
+class CorpusData:
+    """Immutable, indexed view of the whole dataset, swapped as one object."""
+
+    chapters: List[ChapterEntity]
+    verses: List[VerseEntity]
+    translations: List[VerseTranslationEntity]
+    fingerprint: str
+    loaded_at: float = field(default_factory=time.time)
+    chapter_by_id: Dict[int, ChapterEntity] = field(default_factory=dict)
+    chapter_by_number: Dict[int, ChapterEntity] = field(default_factory=dict)
+    verse_by_id: Dict[int, VerseEntity] = field(default_factory=dict)
+    verse_by_number: Dict[Tuple[int, int], VerseEntity] = field(default_factory=dict)
+    verses_by_chapter: Dict[int, List[VerseEntity]] = field(default_factory=dict)
+    translations_by_verse: Dict[int, List[VerseTranslationEntity]] = field(
+        default_factory=dict
+    )
+    # Every translation joined with its verse and chapter
+    gita: List[GitaEntity] = field(default_factory=list)
+    # One row per verse with its first translation, used for sampling
+    primary_gita: List[GitaEntity] = field(default_factory=list)
+    primary_gita_by_chapter: Dict[int, List[GitaEntity]] = field(default_factory=dict)
+    primary_gita_by_number: Dict[Tuple[int, int], GitaEntity] = field(
+        default_factory=dict
+    )
+
+    @classmethod
+    def build(cls, rows: CorpusRows) -> "CorpusData":
+        chapters, verses, translations = rows
+        data = cls(
+            chapters=sorted(chapters, key=lambda x: x.chapter_number),
+            verses=verses,
+            translations=translations,
+            fingerprint=corpus_fingerprint(rows),
+        )
+
+        data.chapter_by_id = {x.id: x for x in chapters}
+        data.chapter_by_number = {x.chapter_number: x for x in chapters}
+        for verse in sorted(verses, key=lambda x: (x.chapter_id, x.verse_number)):
+            chapter = data.chapter_by_id.get(verse.chapter_id)
+            if chapter is None:
+                continue
+            data.verse_by_id[verse.id] = verse
+            data.verse_by_number[(chapter.chapter_number, verse.verse_number)] = verse
+            data.verses_by_chapter.setdefault(chapter.chapter_number, []).append(
+                verse
+            )
+        for translation in sorted(translations, key=lambda x: x.id):
+            data.translations_by_verse.setdefault(translation.verse_id, []).append(
+                translation
+            )
+
+        for (chapter_number, verse_number), verse in data.verse_by_number.items():
+            chapter = data.chapter_by_number[chapter_number]
+            verse_translations = data.translations_by_verse.get(verse.id, [])
+            for translation in verse_translations:
+                data.gita.append(gita_entity(chapter, verse, translation))
+            # Same as the LEFT JOIN on MIN(vt.id) of the MySQL repository
+            primary = gita_entity(
+                chapter, verse, verse_translations[0] if verse_translations else None
+            )
+            data.primary_gita.append(primary)
+            data.primary_gita_by_chapter.setdefault(chapter_number, []).append(primary)
+            data.primary_gita_by_number[(chapter_number, verse_number)] = primary
+
+        return data
+
+
+class CorpusSnapshot:
+    """
+    Loads the read-only dataset once and serves every lookup from memory.
+
+    `loader` returns the chapter, verse and translation rows, e.g. from
+    `json_corpus_loader` or `repository_corpus_loader`. `reload()` loads
+    them again and swaps the snapshot when its content fingerprint
+    changed. With `watch_interval` > 0 a daemon thread checks the source
+    periodically; a cheap `source_fingerprint` (file mtimes, table
+    checksums) avoids a full load when nothing changed.
+
+    With several worker processes only one of them should watch the source
+    (`watch_source`) and publish the fingerprint it reloaded to a file once
+    its reload hooks are done, the others `watch_generation` of that file
+    and reload only after it changed.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], CorpusRows],
+        source_fingerprint: Callable[[], str] | None = None,
+        watch_interval: float = 0,
+    ):
+        self.console = Console()
+        self.loader = loader
+        self.source_fingerprint = source_fingerprint
+        self.watch_interval = watch_interval
+        self.lock = threading.Lock()
+        # Called with the new data after every swap, e.g. to drop caches
+        self.reload_hooks: List[Callable[[CorpusData], None]] = []
+        self.reloads = 0
+        self.load_seconds = 0.0
+        self.last_source_fingerprint = None
+        # Fingerprint file written by the watching process for the others
+        self.generation_path: str | None = None
+        self.follows_generation = False
+        self.last_generation = None
+        self.watching = True
+        self.watcher: threading.Thread | None = None
+        self.data = self.__load()
+        self.__start_watcher()
+        # Every worker keeps its own copy up to date
+        after_fork_in_child(self.__after_fork)
+
+    def on_reload(self, hook: Callable[[CorpusData], None]):
+        self.reload_hooks.append(hook)
+
+    def reload(self) -> bool:
+        with self.lock:
+            data = self.__load()
+            if data.fingerprint == self.data.fingerprint:
+                return False
+            self.data = data
+            self.reloads += 1
+
+        self.console.print(
+            f"[yellow][CORPUS][/yellow] Snapshot dimuat ulang "
+            f"([b]{len(data.translations)}[/b] terjemahan)"
+        )
+        for hook in self.reload_hooks:
+            hook(data)
+        if not self.follows_generation:
+            self.publish()
+        return True
+
+    def watch_source(self, generation_path: str | None = None):
+        """Reload on source changes, publishing to `generation_path`."""
+        self.generation_path = generation_path
+        self.follows_generation = False
+        self.publish()
+        self.watching = True
+        self.__start_watcher()
+
+    def watch_generation(self, generation_path: str):
+        """Reload only after the fingerprint in `generation_path` changed."""
+        self.generation_path = generation_path
+        self.follows_generation = True
+        self.last_generation = self.data.fingerprint
+        self.watching = True
+        self.__start_watcher()
+
+    def stop_watching(self):
+        self.watching = False
+
+    def publish(self):
+        if not self.generation_path:
+            return
+        tmp_path = f"{self.generation_path}.tmp-{os.getpid()}"
+        with open(tmp_path, "w") as f:
+            f.write(self.data.fingerprint)
+        os.replace(tmp_path, self.generation_path)
+
+    def stats(self) -> dict:
+        data = self.data
+        return {
+            "chapters": len(data.chapters),
+            "verses": len(data.verse_by_id),
+            "translations": len(data.translations),
+            "fingerprint": data.fingerprint[:12],
+            "loaded_at": data.loaded_at,
+            "load_seconds": round(self.load_seconds, 3),
+            "reloads": self.reloads,
+        }
+
+    def __start_watcher(self):
+        if self.watch_interval <= 0 or not self.watching:
+            return
+        if self.watcher and self.watcher.is_alive():
+            return
+        self.watcher = threading.Thread(
+            target=self.__watch, name="corpus-watcher", daemon=True
+        )
+        self.watcher.start()
+
+    def __after_fork(self):
+        self.lock = threading.Lock()
+        # The parent's thread does not exist in the child
+        self.watcher = None
+        self.__start_watcher()
+
+    def __read_generation(self) -> str | None:
+        try:
+            with open(self.generation_path, "r") as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def __load(self) -> CorpusData:
+        start_time = time.perf_counter()
+        if self.source_fingerprint:
+            self.last_source_fingerprint = self.source_fingerprint()
+        data = CorpusData.build(self.loader())
+        self.load_seconds = time.perf_counter() - start_time
+        return data
+
+    def __watch(self):
+        while self.watching:
+            time.sleep(self.watch_interval)
+            try:
+                if self.follows_generation:
+                    generation = self.__read_generation()
+                    if generation in (None, self.last_generation):
+                        continue
+                    self.last_generation = generation
+                    self.reload()
+                    continue
+                if (
+                    self.source_fingerprint
+                    and self.source_fingerprint() == self.last_source_fingerprint
+                ):
+                    continue
+                self.reload()
+            except Exception as e:
+                self.console.print(
+                    f"[red][CORPUS][/red] Gagal memuat ulang snapshot: {e}"
+                )
+
+
+def gita_entity(
+    chapter: ChapterEntity,
+    verse: VerseEntity,
+    translation: VerseTranslationEntity | None,
+) -> GitaEntity:
+    return GitaEntity(
+        vt_id=translation.id if translation else None,  # type: ignore
+        vt_content=translation.content if translation else None,  # type: ignore
+        v_id=verse.id,
+        v_text_sanskrit=verse.text_sanskrit,
+        v_text_sanskrit_meanings=verse.text_sanskrit_meanings,
+        v_verse_number=verse.verse_number,
+        v_audio_url=verse.audio_url,
+        c_id=chapter.id,
+        c_chapter_number=chapter.chapter_number,
+        c_name=chapter.name,
+        c_summary=chapter.summary,
+        c_verses_count=chapter.verses_count,
+    )
+
+
+def corpus_fingerprint(rows: CorpusRows) -> str:
+    digest = hashlib.sha256()
+    for entities in rows:
+        for entity in sorted(entities, key=lambda x: x.id):
+            digest.update(
+                json.dumps(asdict(entity), sort_keys=True, default=str).encode()
+            )
+    return digest.hexdigest()
+
+
+def json_corpus_loader(
+    directory: str = "data/3-fine-verse_number",
+) -> Callable[[], CorpusRows]:
+    def load() -> CorpusRows:
+        return (
+            [ChapterEntity(**x) for x in load_json(f"{directory}/chapters.json")],
+            [VerseEntity(**x) for x in load_json(f"{directory}/verses.json")],
+            [
+                VerseTranslationEntity(**x)
+                for x in load_json(f"{directory}/translations.json")
+            ],
+        )
+
+    return load
+
+
+def json_source_fingerprint(
+    directory: str = "data/3-fine-verse_number",
+) -> Callable[[], str]:
+    def fingerprint() -> str:
+        files = ("chapters.json", "verses.json", "translations.json")
+        stats = [os.stat(os.path.join(directory, x)) for x in files]
+        return ",".join(f"{x.st_mtime_ns}:{x.st_size}" for x in stats)
+
+    return fingerprint
+
+
+def repository_corpus_loader(
+    chapter_repository: ChapterRepository,
+    verse_repository: VerseRepository,
+    verse_translation_repository: VerseTranslationRepository,
+) -> Callable[[], CorpusRows]:
+    def load() -> CorpusRows:
+        return (
+            chapter_repository.get_all(),
+            verse_repository.get_all(),
+            verse_translation_repository.get_all(),
+        )
+
+    return load
+
+
+def mysql_source_fingerprint(client: MysqlClient) -> Callable[[], str]:
+    def fingerprint() -> str:
+        result = client.query("CHECKSUM TABLE chapters, verses, verse_translations;")
+        return ",".join(f"{x['Table']}:{x['Checksum']}" for x in result)
+
+    return fingerprint
@@ -1,11 +1,14 @@
 from app.application.repository.chapter_repository import ChapterRepository
 from app.domain.entity.chapter_entity import ChapterEntity
+from app.domain.entity.chapter_detail_entity import ChapterDetailEntity
+from app.infrastructure.repository.json_verse_repository import JsonVerseRepository
 from app.infrastructure.util.json_loader import load_json
 
 
 class JsonChapterRepository(ChapterRepository):
-    def __init__(self):
+    def __init__(self, verse_repository: JsonVerseRepository | None = None):
         self.db = []
+        self.verse_repository = verse_repository or JsonVerseRepository()
         self.__load_data()
 
     def __load_data(self):
@@ -16,8 +19,23 @@ class JsonChapterRepository(ChapterRepository):
     def get_all(self):
         return self.db
 
+    def get_chapter_by_number(self, chapter_number):
+        for chapter in self.db:
+            if chapter.chapter_number == chapter_number:
+                return chapter
+        return None
+
     def get_chapter_by_id(self, chapter_id):
         for chapter in self.db:
             if chapter.id == chapter_id:
                 return chapter
         return None
+
+    def get_detail_by_number(self, chapter_number):
+        chapter = self.get_chapter_by_number(chapter_number)
+        if chapter is None:
+            return None
+        return ChapterDetailEntity(
+            chapter=chapter,
+            verses=self.verse_repository.get_details_by_chapter_number(chapter_number),
+        )
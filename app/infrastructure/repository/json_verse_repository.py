@@ -1,11 +1,20 @@
+import random
+from typing import List
+
 from app.application.repository.verse_repository import VerseRepository
 from app.domain.entity.verse_entity import VerseEntity
+from app.domain.entity.verse_detail_entity import VerseDetailEntity
+from app.domain.entity.verse_translation_entity import VerseTranslationEntity
 from app.infrastructure.util.json_loader import load_json
 
 
 class JsonVerseRepository(VerseRepository):
     def __init__(self):
         self.db = []
+        self.by_id = {}
+        self.by_number = {}
+        self.by_chapter_number = {}
+        self.translations_by_verse_id = {}
         self.__load_data()
 
     def __load_data(self):
@@ -13,11 +22,49 @@ class JsonVerseRepository(VerseRepository):
         for verse in data:
             self.db.append(VerseEntity(**verse))
 
+        chapter_numbers = {
+            x["id"]: x["chapter_number"]
+            for x in load_json("data/3-fine-verse_number/chapters.json")
+        }
+        for verse in sorted(self.db, key=lambda x: (x.chapter_id, x.verse_number)):
+            chapter_number = chapter_numbers.get(verse.chapter_id)
+            self.by_id[verse.id] = verse
+            self.by_number[(chapter_number, verse.verse_number)] = verse
+            self.by_chapter_number.setdefault(chapter_number, []).append(verse)
+
+        data = load_json("data/3-fine-verse_number/translations.json")
+        for verse_translation in sorted(data, key=lambda x: x["id"]):
+            self.translations_by_verse_id.setdefault(
+                verse_translation["verse_id"], []
+            ).append(VerseTranslationEntity(**verse_translation))
+
     def get_all(self):
         return self.db
 
+    def get_by_chapter_number(self, chapter_number):
+        return list(self.by_chapter_number.get(chapter_number, []))
+
+    def get_random(self, count: int):
+        return random.sample(self.db, min(count, len(self.db)))
+
+    def get_by_chapter_verse_number(self, chapter_number, verse_number):
+        return self.by_number.get((chapter_number, verse_number))
+
     def get_by_verse_id(self, verse_id):
-        for verse in self.db:
-            if verse.id == verse_id:
-                return verse
-        return None
+        return self.by_id.get(verse_id)
+
+    def get_detail_by_chapter_verse_number(self, chapter_number, verse_number):
+        verse = self.by_number.get((chapter_number, verse_number))
+        if verse is None:
+            return None
+        return self.__detail(verse)
+
+    def get_details_by_chapter_number(self, chapter_number) -> List[VerseDetailEntity]:
+        verses = self.by_chapter_number.get(chapter_number, [])
+        return [self.__detail(x) for x in verses]
+
+    def __detail(self, verse: VerseEntity) -> VerseDetailEntity:
+        return VerseDetailEntity(
+            verse=verse,
+            translations=list(self.translations_by_verse_id.get(verse.id, [])),
+        )
@@ -2,12 +2,14 @@ from app.application.repository.verse_translation_repository import (
     VerseTranslationRepository,
 )
 from app.domain.entity.verse_translation_entity import VerseTranslationEntity
+from app.infrastructure.repository.json_verse_repository import JsonVerseRepository
 from app.infrastructure.util.json_loader import load_json
 
 
 class JsonVerseTranslationRepository(VerseTranslationRepository):
-    def __init__(self):
+    def __init__(self, verse_repository: JsonVerseRepository | None = None):
         self.db = []
+        self.verse_repository = verse_repository or JsonVerseRepository()
         self.__load_data()
 
     def __load_data(self):
@@ -18,8 +20,11 @@ class JsonVerseTranslationRepository(VerseTranslationRepository):
     def get_all(self):
         return self.db
 
+    def get_by_chapter_verse_number(self, chapter_number, verse_number):
+        verse = self.verse_repository.get_by_chapter_verse_number(
+            chapter_number, verse_number
+        )
+        return self.get_by_verse_id(verse.id) if verse else []
+
     def get_by_verse_id(self, verse_id):
-        for verse_translation in self.db:
-            if verse_translation.verse_id == verse_id:
-                return verse_translation
-        return None
+        return [x for x in self.db if x.verse_id == verse_id]
@@ -1,4 +1,8 @@
 from app.domain.entity.chapter_entity import ChapterEntity
+from app.domain.entity.chapter_detail_entity import ChapterDetailEntity
+from app.domain.entity.verse_detail_entity import VerseDetailEntity
+from app.domain.entity.verse_entity import VerseEntity
+from app.domain.entity.verse_translation_entity import VerseTranslationEntity
 from app.application.repository.chapter_repository import ChapterRepository
 from app.infrastructure.dbclient.mysql_client import MysqlClient
 
@@ -35,3 +39,54 @@ class MysqlChapterRepository(ChapterRepository):
         )
 
         return ChapterEntity(**result[0]) if result else None
+
+    def get_detail_by_number(self, chapter_number: int):
+        # One connection checkout for the chapter, its verses and translations
+        chapters, verses, translations = self.client.query_many(
+            [
+                (
+                    """
+                    SELECT * FROM chapters WHERE chapter_number = %s;
+                    """,
+                    (chapter_number,),
+                ),
+                (
+                    """
+                    SELECT v.* FROM verses v
+                    INNER JOIN chapters c ON c.id = v.chapter_id
+                    WHERE c.chapter_number = %s
+                    ORDER BY v.verse_number;
+                    """,
+                    (chapter_number,),
+                ),
+                (
+                    """
+                    SELECT vt.* FROM verse_translations vt
+                    INNER JOIN verses v ON v.id = vt.verse_id
+                    INNER JOIN chapters c ON c.id = v.chapter_id
+                    WHERE c.chapter_number = %s
+                    ORDER BY vt.id;
+                    """,
+                    (chapter_number,),
+                ),
+            ]
+        )
+        if not chapters:
+            return None
+
+        translations_by_verse = {}
+        for row in translations:
+            translations_by_verse.setdefault(row["verse_id"], []).append(
+                VerseTranslationEntity(**row)
+            )
+
+        return ChapterDetailEntity(
+            chapter=ChapterEntity(**chapters[0]),
+            verses=[
+                VerseDetailEntity(
+                    verse=VerseEntity(**row),
+                    translations=translations_by_verse.get(row["id"], []),
+                )
+                for row in verses
+            ],
+        )
@@ -1,13 +1,24 @@
 from app.application.repository.gita_repository import GitaRepository
 from app.domain.entity.gita_entity import GitaEntity
 from app.infrastructure.dbclient.mysql_client import MysqlClient
+from app.infrastructure.repository.random_id_table import RandomIdTable
 
 from typing import List
 
 
 class MysqlGitaRepository(GitaRepository):
-    def __init__(self, client: MysqlClient):
+    def __init__(
+        self,
+        client: MysqlClient,
+        sample_ids_ttl: float = 3600,
+        use_gita_view: bool = False,
+    ):
         self.client = client
+        # Read single verses from the denormalized table created by
+        # scripts/db/migrate_gita_view.sql instead of joining three tables
+        self.use_gita_view = use_gita_view
+        # Verse ids per chapter for random sampling without ORDER BY RAND()
+        self.verse_ids = RandomIdTable(self.__load_verse_ids, ttl=sample_ids_ttl)
 
     def get_all(self) -> List[GitaEntity]:
         result = self.client.query(
@@ -28,51 +39,58 @@ class MysqlGitaRepository(GitaRepository):
             FROM
               verse_translations vt
               INNER JOIN verses v ON v.id = vt.verse_id
-              INNER JOIN chapters c ON c.id = v.chapter_id;
+              INNER JOIN chapters c ON c.id = v.chapter_id
+            ORDER BY
+              vt.id;
               """
         )
 
         return [GitaEntity(**row) for row in result]
 
     def get_random_verses(self, count: int) -> List[GitaEntity]:
+        return self.__get_primary_verses(self.verse_ids.sample(count))
+
+    def get_sample_verses(self, chapter: int, count: int) -> List[GitaEntity]:
+        return self.__get_primary_verses(self.verse_ids.sample(count, chapter))
+
+    def __load_verse_ids(self):
+        if self.use_gita_view:
+            result = self.client.query(
+                """
+                SELECT v_id AS id, c_chapter_number AS chapter_number
+                FROM gita_view;
+                """
+            )
+            return [(row["id"], row["chapter_number"]) for row in result]
+
         result = self.client.query(
             """
-            SELECT
-              vt.id AS `vt_id`,
-              vt.content AS `vt_content`,
-              v.id AS `v_id`,
-              v.text_sanskrit AS `v_text_sanskrit`,
-              v.text_sanskrit_meanings AS `v_text_sanskrit_meanings`,
-              v.verse_number AS `v_verse_number`,
-              v.audio_url AS `v_audio_url`,
-              c.id AS `c_id`,
-              c.chapter_number AS `c_chapter_number`,
-              c.name AS `c_name`,
-              c.summary AS `c_summary`,
-              c.verses_count AS `c_verses_count`
-            FROM
-              verses v
-              LEFT JOIN (
-                SELECT vt.*
-                FROM verse_translations vt
-                INNER JOIN (
-                  SELECT verse_id, MIN(id) AS min_id
-                  FROM verse_translations
-                  GROUP BY verse_id
-                ) filtered ON vt.id = filtered.min_id
-              ) vt ON vt.verse_id = v.id
-              INNER JOIN chapters c ON c.id = v.chapter_id
-            ORDER BY RAND()
-            LIMIT %s;
-            """,
-            (count,),
+            SELECT v.id, c.chapter_number
+            FROM verses v INNER JOIN chapters c ON c.id = v.chapter_id;
+            """
         )
 
-        return [GitaEntity(**row) for row in result]
+        return [(row["id"], row["chapter_number"]) for row in result]
 
-    def get_sample_verses(self, chapter: int, count: int) -> List[GitaEntity]:
+    def __get_primary_verses(self, verse_ids: List[int]) -> List[GitaEntity]:
+        if not verse_ids:
+            return []
+
+        placeholders = ", ".join(["%s"] * len(verse_ids))
+        if self.use_gita_view:
+            result = self.client.query(
+                f"""
+                SELECT * FROM gita_view WHERE v_id IN ({placeholders});
+                """,
+                tuple(verse_ids),
+            )
+            rows = {row["v_id"]: row for row in result}
+            return [GitaEntity(**rows[x]) for x in verse_ids if x in rows]
+
+        # Each verse with its first translation, MIN(id) is resolved through
+        # idx_verse_translations_verse_id for the sampled rows only
         result = self.client.query(
-            """
+            f"""
             SELECT
               vt.id AS `vt_id`,
               vt.content AS `vt_content`,
@@ -88,29 +106,30 @@ class MysqlGitaRepository(GitaRepository):
               c.verses_count AS `c_verses_count`
             FROM
               verses v
-              LEFT JOIN (
-                SELECT vt.*
-                FROM verse_translations vt
-                INNER JOIN (
-                  SELECT verse_id, MIN(id) AS min_id
-                  FROM verse_translations
-                  GROUP BY verse_id
-                ) filtered ON vt.id = filtered.min_id
-              ) vt ON vt.verse_id = v.id
               INNER JOIN chapters c ON c.id = v.chapter_id
-            WHERE c.chapter_number = %s
-            ORDER BY RAND()
-            LIMIT %s;
+              LEFT JOIN verse_translations vt ON vt.id = (
+                SELECT MIN(id) FROM verse_translations WHERE verse_id = v.id
+              )
+            WHERE v.id IN ({placeholders});
             """,
-            (
-                chapter,
-                count,
-            ),
+            tuple(verse_ids),
         )
 
-        return [GitaEntity(**row) for row in result]
+        # Keep the random order of the sample
+        rows = {row["v_id"]: row for row in result}
+        return [GitaEntity(**rows[x]) for x in verse_ids if x in rows]
 
     def get_specific_verse(self, chapter: int, verse: int) -> GitaEntity | None:
+        if self.use_gita_view:
+            result = self.client.query(
+                """
+                SELECT * FROM gita_view
+                WHERE c_chapter_number = %s AND v_verse_number = %s;
+                """,
+                (chapter, verse),
+            )
+            return GitaEntity(**result[0]) if result else None
+
         result = self.client.query(
             """
             SELECT
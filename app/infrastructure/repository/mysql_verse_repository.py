@@ -1,11 +1,15 @@
 from app.domain.entity.verse_entity import VerseEntity
+from app.domain.entity.verse_detail_entity import VerseDetailEntity
+from app.domain.entity.verse_translation_entity import VerseTranslationEntity
 from app.application.repository.verse_repository import VerseRepository
 from app.infrastructure.dbclient.mysql_client import MysqlClient
+from app.infrastructure.repository.random_id_table import RandomIdTable
 
 
 class MysqlVerseRepository(VerseRepository):
-    def __init__(self, client: MysqlClient):
+    def __init__(self, client: MysqlClient, sample_ids_ttl: float = 3600):
         self.client = client
+        self.verse_ids = RandomIdTable(self.__load_verse_ids, ttl=sample_ids_ttl)
 
     def get_all(self):
         result = self.client.query(
@@ -17,14 +21,30 @@ class MysqlVerseRepository(VerseRepository):
         return [VerseEntity(**row) for row in result]
 
     def get_random(self, count: int):
+        verse_ids = self.verse_ids.sample(count)
+        if not verse_ids:
+            return []
+
         result = self.client.query(
-            """
-            SELECT * FROM verses INNER JOIN chapters ON verses.chapter_id = chapters.id ORDER BY RAND() LIMIT %s;
+            f"""
+            SELECT * FROM verses WHERE id IN ({", ".join(["%s"] * len(verse_ids))});
             """,
-            (count,),
+            tuple(verse_ids),
         )
 
-        return [VerseEntity(**row) for row in result]
+        rows = {row["id"]: row for row in result}
+        return [VerseEntity(**rows[x]) for x in verse_ids if x in rows]
+
+    def __load_verse_ids(self):
+        # Grouped by chapter number, like the gita repository samples them
+        result = self.client.query(
+            """
+            SELECT v.id, c.chapter_number
+            FROM verses v INNER JOIN chapters c ON c.id = v.chapter_id;
+            """
+        )
+
+        return [(row["id"], row["chapter_number"]) for row in result]
 
     def get_by_chapter_number(self, chapter_number: int):
         result = self.client.query(
@@ -49,4 +69,41 @@ class MysqlVerseRepository(VerseRepository):
         return VerseEntity(**result[0]) if result else None
 
     def get_by_verse_id(self, verse_id):
-        raise NotImplementedError()
+        result = self.client.query(
+            """
+            SELECT * FROM verses WHERE id = %s;
+            """,
+            (verse_id,),
+        )
+
+        return VerseEntity(**result[0]) if result else None
+
+    def get_detail_by_chapter_verse_number(
+        self, chapter_number: int, verse_number: int
+    ) -> VerseDetailEntity | None:
+        # One row per translation, the verse columns repeat
+        result = self.client.query(
+            """
+            SELECT v.*, vt.id AS `vt_id`, vt.content AS `vt_content`
+            FROM verses v
+              INNER JOIN chapters c ON c.id = v.chapter_id
+              LEFT JOIN verse_translations vt ON vt.verse_id = v.id
+            WHERE c.chapter_number = %s AND v.verse_number = %s
+            ORDER BY vt.id;
+            """,
+            (chapter_number, verse_number),
+        )
+        if not result:
+            return None
+
+        verse = {k: v for k, v in result[0].items() if not k.startswith("vt_")}
+        return VerseDetailEntity(
+            verse=VerseEntity(**verse),
+            translations=[
+                VerseTranslationEntity(
+                    id=row["vt_id"], content=row["vt_content"], verse_id=verse["id"]
+                )
+                for row in result
+                if row["vt_id"] is not None
+            ],
+        )
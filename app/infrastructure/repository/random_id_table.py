@@ -0,0 +1,46 @@
+import random
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+
+class RandomIdTable:
+    """
+    Precomputed ids for uniform random sampling without `ORDER BY RAND()`.
+
+    `loader` returns `(id, group)` rows, e.g. a verse id and its chapter
+    number. The table is kept in memory and loaded again after `ttl`
+    seconds, so sampling `count` rows costs O(count) instead of a full
+    scan and sort on every request.
+    """
+
+    def __init__(
+        self, loader: Callable[[], List[Tuple[int, int]]], ttl: float = 3600
+    ):
+        self.loader = loader
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.ids: List[int] = []
+        self.ids_by_group: Dict[int, List[int]] = {}
+        self.loaded_at = 0.0
+
+    def sample(self, count: int, group: int | None = None) -> List[int]:
+        self.__refresh()
+        ids = self.ids if group is None else self.ids_by_group.get(group, [])
+        return random.sample(ids, min(count, len(ids)))
+
+    def invalidate(self):
+        with self.lock:
+            self.loaded_at = 0.0
+
+    def __refresh(self):
+        with self.lock:
+            if self.loaded_at and time.monotonic() - self.loaded_at < self.ttl:
+                return
+
+            ids, ids_by_group = [], {}
+            for row_id, group in self.loader():
+                ids.append(row_id)
+                ids_by_group.setdefault(group, []).append(row_id)
+            self.ids, self.ids_by_group = ids, ids_by_group
+            self.loaded_at = time.monotonic()
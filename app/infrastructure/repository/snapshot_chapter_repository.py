@@ -0,0 +1,33 @@
+from app.application.repository.chapter_repository import ChapterRepository
+from app.domain.entity.chapter_detail_entity import ChapterDetailEntity
+from app.domain.entity.verse_detail_entity import VerseDetailEntity
+from app.infrastructure.repository.corpus_snapshot import CorpusSnapshot
+
+
+class SnapshotChapterRepository(ChapterRepository):
+    def __init__(self, snapshot: CorpusSnapshot):
+        self.snapshot = snapshot
+
+    def get_all(self):
+        return list(self.snapshot.data.chapters)
+
+    def get_chapter_by_number(self, chapter_number: int):
+        return self.snapshot.data.chapter_by_number.get(chapter_number)
+
+    def get_chapter_by_id(self, chapter_id: int):
+        return self.snapshot.data.chapter_by_id.get(chapter_id)
+
+    def get_detail_by_number(self, chapter_number: int):
+        data = self.snapshot.data
+        chapter = data.chapter_by_number.get(chapter_number)
+        if chapter is None:
+            return None
+        return ChapterDetailEntity(
+            chapter=chapter,
+            verses=[
+                VerseDetailEntity(
+                    verse=x, translations=list(data.translations_by_verse.get(x.id, []))
+                )
+                for x in data.verses_by_chapter.get(chapter_number, [])
+            ],
+        )
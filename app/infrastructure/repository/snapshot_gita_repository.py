@@ -0,0 +1,25 @@
+import random
+from typing import List
+
+from app.application.repository.gita_repository import GitaRepository
+from app.domain.entity.gita_entity import GitaEntity
+from app.infrastructure.repository.corpus_snapshot import CorpusSnapshot
+
+
+class SnapshotGitaRepository(GitaRepository):
+    def __init__(self, snapshot: CorpusSnapshot):
+        self.snapshot = snapshot
+
+    def get_all(self) -> List[GitaEntity]:
+        return list(self.snapshot.data.gita)
+
+    def get_random_verses(self, count: int) -> List[GitaEntity]:
+        verses = self.snapshot.data.primary_gita
+        return random.sample(verses, min(count, len(verses)))
+
+    def get_sample_verses(self, chapter: int, count: int) -> List[GitaEntity]:
+        verses = self.snapshot.data.primary_gita_by_chapter.get(chapter, [])
+        return random.sample(verses, min(count, len(verses)))
+
+    def get_specific_verse(self, chapter: int, verse: int) -> GitaEntity | None:
+        return self.snapshot.data.primary_gita_by_number.get((chapter, verse))
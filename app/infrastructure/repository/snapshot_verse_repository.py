@@ -0,0 +1,40 @@
+import random
+
+from app.application.repository.verse_repository import VerseRepository
+from app.domain.entity.verse_entity import VerseEntity
+from app.domain.entity.verse_detail_entity import VerseDetailEntity
+from app.infrastructure.repository.corpus_snapshot import CorpusSnapshot
+
+
+class SnapshotVerseRepository(VerseRepository):
+    def __init__(self, snapshot: CorpusSnapshot):
+        self.snapshot = snapshot
+
+    def get_all(self):
+        return list(self.snapshot.data.verse_by_id.values())
+
+    def get_random(self, count: int):
+        verses = list(self.snapshot.data.verse_by_id.values())
+        return random.sample(verses, min(count, len(verses)))
+
+    def get_by_chapter_number(self, chapter_number: int):
+        return list(self.snapshot.data.verses_by_chapter.get(chapter_number, []))
+
+    def get_by_chapter_verse_number(
+        self, chapter_number: int, verse_number: int
+    ) -> VerseEntity:
+        return self.snapshot.data.verse_by_number.get((chapter_number, verse_number))
+
+    def get_by_verse_id(self, verse_id):
+        return self.snapshot.data.verse_by_id.get(verse_id)
+
+    def get_detail_by_chapter_verse_number(
+        self, chapter_number: int, verse_number: int
+    ) -> VerseDetailEntity | None:
+        data = self.snapshot.data
+        verse = data.verse_by_number.get((chapter_number, verse_number))
+        if verse is None:
+            return None
+        return VerseDetailEntity(
+            verse=verse, translations=list(data.translations_by_verse.get(verse.id, []))
+        )
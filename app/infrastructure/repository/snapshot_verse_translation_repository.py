@@ -0,0 +1,24 @@
+from typing import List
+from app.domain.entity.verse_translation_entity import VerseTranslationEntity
+from app.application.repository.verse_translation_repository import (
+    VerseTranslationRepository,
+)
+from app.infrastructure.repository.corpus_snapshot import CorpusSnapshot
+
+
+class SnapshotVerseTranslationRepository(VerseTranslationRepository):
+    def __init__(self, snapshot: CorpusSnapshot):
+        self.snapshot = snapshot
+
+    def get_all(self):
+        return list(self.snapshot.data.translations)
+
+    def get_by_chapter_verse_number(
+        self, chapter_number: int, verse_number: int
+    ) -> List[VerseTranslationEntity]:
+        data = self.snapshot.data
+        verse = data.verse_by_number.get((chapter_number, verse_number))
+        return list(data.translations_by_verse.get(verse.id, [])) if verse else []
+
+    def get_by_verse_id(self, verse_id: int) -> List[VerseTranslationEntity]:
+        return list(self.snapshot.data.translations_by_verse.get(verse_id, []))
@@ -0,0 +1,243 @@
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import time
+from contextlib import contextmanager
+from dataclasses import fields
+from typing import (
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Sequence,
+    TypeVar,
+)
+
+import numpy as np
+
+# Bump when the layout changes, older artifacts are then rebuilt
+ARTIFACT_VERSION = 2
+MANIFEST = "manifest.json"
+INT_NULL = np.iinfo(np.int64).min
+
+T = TypeVar("T")
+
+
+class ColumnTable:
+    """
+    Read-only table whose columns are memory-mapped .npy files.
+
+    - "int" columns are one int64 array, `INT_NULL` standing for None.
+    - "str" columns are UTF-8 bytes plus an offsets array, row i is
+      `data[offsets[i]:offsets[i + 1]]`, None rows are listed in a mask.
+    - "ints" columns (lists of ints, e.g. the verse rows of a chunk) use the
+      same offsets layout over an int64 array.
+
+    Nothing is decoded until a row is read, and the mapped pages are shared
+    by every process that opens the same files.
+    """
+
+    def __init__(self, directory: str, name: str, spec: dict):
+        self.name = name
+        self.length: int = spec["rows"]
+        self.types: Dict[str, str] = spec["columns"]
+        self.arrays: Dict[str, Dict[str, np.ndarray]] = {}
+        for column, kind in self.types.items():
+            prefix = os.path.join(directory, f"{name}.{column}")
+            parts = ("values",) if kind == "int" else ("values", "offsets")
+            arrays = {x: np.load(f"{prefix}.{x}.npy", mmap_mode="r") for x in parts}
+            if kind == "str" and os.path.exists(f"{prefix}.nulls.npy"):
+                arrays["nulls"] = np.load(f"{prefix}.nulls.npy", mmap_mode="r")
+            self.arrays[column] = arrays
+
+    def __len__(self):
+        return self.length
+
+    def value(self, column: str, i: int):
+        kind = self.types[column]
+        arrays = self.arrays[column]
+        if kind == "int":
+            value = int(arrays["values"][i])
+            return None if value == INT_NULL else value
+
+        if kind == "ints":
+            return self.ints(column, i).tolist()
+        start, end = int(arrays["offsets"][i]), int(arrays["offsets"][i + 1])
+        if "nulls" in arrays and arrays["nulls"][i]:
+            return None
+        return arrays["values"][start:end].tobytes().decode("utf-8")
+
+    def ints(self, column: str, i: int) -> np.ndarray:
+        """Row `i` of an "ints" column as a read-only view of the mapping."""
+        arrays = self.arrays[column]
+        start, end = int(arrays["offsets"][i]), int(arrays["offsets"][i + 1])
+        return arrays["values"][start:end]
+
+    def values(self, column: str) -> list:
+        return [self.value(column, i) for i in range(self.length)]
+
+    def row(self, i: int) -> dict:
+        return {column: self.value(column, i) for column in self.types}
+
+
+class EntityView(Generic[T]):
+    """List-like access to a table, rows are turned into entities on read."""
+
+    def __init__(self, table: ColumnTable, factory: Callable[..., T]):
+        self.table = table
+        self.factory = factory
+
+    def __len__(self):
+        return len(self.table)
+
+    def __getitem__(self, i: int) -> T:
+        if not 0 <= i < len(self.table):
+            raise IndexError(i)
+        return self.factory(**self.table.row(i))
+
+
+class Artifact:
+    def __init__(self, directory: str, manifest: dict):
+        self.directory = directory
+        self.manifest = manifest
+        self.tables = {
+            name: ColumnTable(directory, name, spec)
+            for name, spec in manifest["tables"].items()
+        }
+        # Plain matrices, e.g. the embeddings of an incremental index
+        self.arrays: Dict[str, np.ndarray] = {
+            name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+            for name in manifest.get("arrays", [])
+        }
+
+
+def read_manifest(directory: str) -> dict | None:
+    path = os.path.join(directory, MANIFEST)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        manifest = json.load(f)
+    if manifest.get("version") != ARTIFACT_VERSION:
+        return None
+    return manifest
+
+
+def open_artifact(directory: str) -> Artifact:
+    manifest = read_manifest(directory)
+    if manifest is None:
+        raise FileNotFoundError(
+            f"No artifact of version {ARTIFACT_VERSION} in {directory}"
+        )
+    return Artifact(directory, manifest)
+
+
+@contextmanager
+def artifact_lock(directory: str) -> Iterator[None]:
+    """Serializes writers of `directory`, e.g. several worker processes."""
+    with open(f"{directory}.lock", "w") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def write_artifact(
+    directory: str,
+    manifest: dict,
+    tables: Dict[str, Dict[str, Sequence]],
+    arrays: Dict[str, np.ndarray] | None = None,
+):
+    """
+    Write `tables` ({table: {column: values}}) and `arrays` next to a
+    manifest. The files are written to a temporary directory that replaces
+    `directory` at the end, so readers never see a half written artifact.
+    """
+    tmp_directory = f"{directory}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_directory, ignore_errors=True)
+    os.makedirs(tmp_directory)
+
+    specs = {}
+    for name, columns in tables.items():
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Columns of table {name} differ in length")
+        specs[name] = {
+            "rows": lengths.pop() if lengths else 0,
+            "columns": {
+                column: write_column(
+                    os.path.join(tmp_directory, f"{name}.{column}"), values
+                )
+                for column, values in columns.items()
+            },
+        }
+
+    for name, array in (arrays or {}).items():
+        np.save(os.path.join(tmp_directory, f"{name}.npy"), array)
+
+    manifest = {
+        **manifest,
+        "version": ARTIFACT_VERSION,
+        "created_at": time.time(),
+        "tables": specs,
+        "arrays": list(arrays or {}),
+    }
+    with open(os.path.join(tmp_directory, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=4)
+
+    old_directory = f"{directory}.old-{os.getpid()}"
+    if os.path.exists(directory):
+        os.replace(directory, old_directory)
+    os.replace(tmp_directory, directory)
+    shutil.rmtree(old_directory, ignore_errors=True)
+
+
+def write_column(prefix: str, values: Sequence) -> str:
+    sample = next((x for x in values if x is not None), None)
+    if isinstance(sample, (list, tuple)):
+        flat = [x for value in values for x in value]
+        np.save(f"{prefix}.values.npy", np.array(flat, dtype=np.int64))
+        np.save(f"{prefix}.offsets.npy", offsets([len(x) for x in values]))
+        return "ints"
+
+    if isinstance(sample, str):
+        encoded = [(x or "").encode("utf-8") for x in values]
+        np.save(
+            f"{prefix}.values.npy", np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        )
+        np.save(f"{prefix}.offsets.npy", offsets([len(x) for x in encoded]))
+        nulls = np.array([x is None for x in values], dtype=bool)
+        if nulls.any():
+            np.save(f"{prefix}.nulls.npy", nulls)
+        return "str"
+
+    np.save(
+        f"{prefix}.values.npy",
+        np.array([INT_NULL if x is None else x for x in values], dtype=np.int64),
+    )
+    return "int"
+
+
+def offsets(lengths: List[int]) -> np.ndarray:
+    result = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=result[1:])
+    return result
+
+
+def entity_columns(entities: Sequence, entity_type: type) -> Dict[str, list]:
+    return {
+        field.name: [getattr(x, field.name) for x in entities]
+        for field in fields(entity_type)
+    }
+
+
+def corpus_hash(texts: Iterable[str]) -> str:
+    digest = hashlib.sha256()
+    for text in texts:
+        digest.update(text.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
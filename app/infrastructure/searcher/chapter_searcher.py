@@ -1,47 +1,40 @@
-import os
-import pickle
-from typing import List
+from typing import Dict, List, Tuple
 
-import faiss
-from sentence_transformers import SentenceTransformer
-
-from app.application.service.searcher import Searcher
 from app.domain.entity.chapter_entity import ChapterEntity
-
-
-class ChapterSearcher(Searcher):
-    def __init__(self):
-        self.path_prefix = "data/model/"
-        self.model = SentenceTransformer("intfloat/multilingual-e5-base")
-        self.index = None
-        self.chapter_meta: List[ChapterEntity] = []
-
-    def builded(self):
-        return os.path.exists(self.path_prefix + "chapter.index") and os.path.exists(
-            self.path_prefix + "chapter_meta.pkl"
-        )
-
-    def build_index(self, chapters: List[ChapterEntity]):
+from app.infrastructure.searcher.artifact_store import (
+    Artifact,
+    EntityView,
+    entity_columns,
+)
+from app.infrastructure.searcher.incremental_index import IdMappedView
+from app.infrastructure.searcher.indexed_searcher import IndexedSearcher
+
+
+class ChapterSearcher(IndexedSearcher):
+    NAME = "chapter"
+    DEFAULT_MODEL = "intfloat/multilingual-e5-base"
+
+    @property
+    def chapter_meta(self) -> IdMappedView | list:
+        return self.meta
+
+    def index_entries(
+        self, chapters: List[ChapterEntity]
+    ) -> Tuple[List[str], List[str]]:
         texts = [
             f"BAB {v.chapter_number} - Nama {v.name} - Ringkasan {v.summary}"
             for v in chapters
         ]
-        embeddings = self.model.encode(texts, convert_to_numpy=True)
-
-        self.index = faiss.IndexFlatL2(embeddings.shape[1])
-        self.index.add(embeddings)
-        self.chapter_meta = chapters
+        return [f"chapter:{v.id}" for v in chapters], texts
 
-        faiss.write_index(self.index, self.path_prefix + "chapter.index")
-        with open(self.path_prefix + "chapter_meta.pkl", "wb") as f:
-            pickle.dump(chapters, f)
+    def artifact_tables(self, chapters: List[ChapterEntity]) -> Dict[str, dict]:
+        return {"chapters": entity_columns(chapters, ChapterEntity)}
 
-    def load_index(self):
-        self.index = faiss.read_index(self.path_prefix + "chapter.index")
-        with open(self.path_prefix + "chapter_meta.pkl", "rb") as f:
-            self.chapter_meta = pickle.load(f)
+    def open_views(self, artifact: Artifact) -> tuple:
+        return (EntityView(artifact.tables["chapters"], ChapterEntity),)
 
     def search(self, query: str, top_k=3) -> List[ChapterEntity]:
-        q_emb = self.model.encode([query])
-        D, I = self.index.search(q_emb, top_k)
-        return [self.chapter_meta[i] for i in I[0]]
+        q_emb = self.query_encoder.encode([query], self.index_config.normalize)
+        index, chapter_meta = self.current
+        D, I = index.search(q_emb, top_k)
+        return [chapter_meta[i] for i in I[0] if i >= 0]
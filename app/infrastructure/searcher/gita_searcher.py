@@ -1,63 +1,188 @@
-import os
-import pickle
-from typing import List, Tuple
+import threading
+from typing import Dict, List, Tuple
 
 import faiss
-from sentence_transformers import SentenceTransformer
 
-from app.application.service.searcher import Searcher
+from app.application.service.encoder import Encoder
 from app.domain.entity.gita_entity import GitaEntity, MixedGitaEntity
+from app.infrastructure.encoder.embedding_cache import EmbeddingCache
+from app.infrastructure.searcher.artifact_store import (
+    Artifact,
+    ColumnTable,
+    EntityView,
+    entity_columns,
+)
+from app.infrastructure.searcher.incremental_index import IdMappedView
+from app.infrastructure.searcher.index_factory import IndexConfig
+from app.infrastructure.searcher.indexed_searcher import IndexedSearcher
+from app.infrastructure.searcher.lexical_index import (
+    LexicalIndex,
+    build_lexical_tables,
+    reciprocal_rank_fusion,
+    tokenize,
+)
 
 
-class GitaSearcher(Searcher):
-    def __init__(self):
-        self.path_prefix = "data/model/"
-        self.model = SentenceTransformer("intfloat/multilingual-e5-large")
-        self.index = None
-        self.verse_meta: List[GitaEntity | MixedGitaEntity] = []
+class GitaMeta:
+    """
+    Entry position -> entity over the memory-mapped meta artifact. The first
+    `len(verses)` positions are verses, the rest are chunks whose members
+    are stored as rows of the verses table.
+    """
 
-    def builded(self):
-        return os.path.exists(self.path_prefix + "gita.index") and os.path.exists(
-            self.path_prefix + "gita_meta.pkl"
+    def __init__(self, verses: ColumnTable, chunks: ColumnTable):
+        self.verses = EntityView(verses, GitaEntity)
+        self.chunks = chunks
+
+    def __len__(self):
+        return len(self.verses) + len(self.chunks)
+
+    def __getitem__(self, i: int) -> GitaEntity | MixedGitaEntity:
+        if i < len(self.verses):
+            return self.verses[i]
+        i -= len(self.verses)
+        return MixedGitaEntity(
+            label=self.chunks.value("label", i),
+            gita=[self.verses[x] for x in self.chunks.value("verses", i)],
         )
 
-    def build_index(self, gita: List[GitaEntity]) -> bool:
+
+class GitaSearcher(IndexedSearcher):
+    NAME = "gita"
+    DEFAULT_MODEL = "intfloat/multilingual-e5-large"
+
+    def __init__(
+        self,
+        index_config: IndexConfig | None = None,
+        encoder: Encoder | None = None,
+        embedding_cache: EmbeddingCache | None = None,
+        batch_window_ms: float = 0,
+        batch_max_size: int = 32,
+        hybrid_search: bool = False,
+        hybrid_budget: int = 20,
+        rrf_k: int = 60,
+        lexical_short_circuit_terms: int = 3,
+        lexical_min_score: float = 8.0,
+    ):
+        super().__init__(
+            index_config, encoder, embedding_cache, batch_window_ms, batch_max_size
+        )
+        # Dense index, entries and the lexical index of the same artifact
+        self.current: Tuple[
+            faiss.Index | None, IdMappedView | list, LexicalIndex | None
+        ] = (None, [], None)
+        # BM25 over the verse texts fused with the dense ranking (RRF), each
+        # ranking contributes its best `hybrid_budget` candidates
+        self.hybrid_search = hybrid_search
+        self.hybrid_budget = hybrid_budget
+        self.rrf_k = rrf_k
+        # Queries of at most this many terms, all known, whose best BM25
+        # score reaches `lexical_min_score` skip the dense encode (0 = never).
+        # The same score lets lexical hits through when the dense match falls
+        # under the relevance threshold.
+        self.lexical_short_circuit_terms = lexical_short_circuit_terms
+        self.lexical_min_score = lexical_min_score
+        self.hybrid_lock = threading.Lock()
+        self.hybrid = {"searches": 0, "short_circuits": 0, "lexical_rescues": 0}
+
+    @property
+    def verse_meta(self) -> IdMappedView | list:
+        return self.meta
+
+    def needs_update(self, gita: List[GitaEntity]) -> bool:
+        # Artifacts written before the lexical index existed get it added,
+        # the embeddings are all reused
+        if self.hybrid_search and self.artifact and self.current[2] is None:
+            return True
+        return super().needs_update(gita)
+
+    def index_entries(self, gita: List[GitaEntity]) -> Tuple[List[str], List[str]]:
         texts = [
             f"passage: Bab {v.c_chapter_number} sloka {v.v_verse_number} mengatakan {v.vt_content}"
             for v in gita
         ]
-        mixed_chunks, mixed_objects = self.chunk_verses(gita)
-        texts += mixed_chunks
-        embeddings = self.model.encode(texts, convert_to_numpy=True)
-        self.index = faiss.IndexFlatL2(embeddings.shape[1])
-        self.index.add(embeddings)
-        self.verse_meta = gita + mixed_objects
+        # The primary translation is part of a verse's key, the hash of the
+        # text catches edits of the verse, its translation or its chapter
+        keys = [f"verse:{v.v_id}:{v.vt_id}" for v in gita]
+        chunk_keys, mixed_chunks, _ = self.chunk_verses(gita)
+        return keys + chunk_keys, texts + mixed_chunks
+
+    def artifact_tables(self, gita: List[GitaEntity]) -> Dict[str, dict]:
+        _, _, mixed_objects = self.chunk_verses(gita)
+        rows = {id(v): i for i, v in enumerate(gita)}
+        return {
+            "verses": entity_columns(gita, GitaEntity),
+            "chunks": {
+                "label": [x.label for x in mixed_objects],
+                "verses": [[rows[id(v)] for v in x.gita] for x in mixed_objects],
+            },
+            **build_lexical_tables(
+                [
+                    f"{v.vt_content or ''} {v.v_text_sanskrit} "
+                    f"{v.v_text_sanskrit_meanings}"
+                    for v in gita
+                ]
+            ),
+        }
 
-        faiss.write_index(self.index, self.path_prefix + "gita.index")
-        with open(self.path_prefix + "gita_meta.pkl", "wb") as f:
-            pickle.dump(self.verse_meta, f)
+    def open_views(self, artifact: Artifact) -> tuple:
+        meta = GitaMeta(artifact.tables["verses"], artifact.tables["chunks"])
+        lexical = None
+        if "lexicon" in artifact.tables:
+            lexical = LexicalIndex(
+                artifact.tables["lexicon"], artifact.tables["lexical_docs"]
+            )
+        return meta, lexical
 
-        return True
+    def index_stats(self) -> dict:
+        return {
+            **super().index_stats(),
+            "hybrid": self.hybrid_stats() if self.hybrid_search else None,
+        }
 
-    def load_index(self) -> bool:
-        self.index = faiss.read_index(self.path_prefix + "gita.index")
-        with open(self.path_prefix + "gita_meta.pkl", "rb") as f:
-            self.verse_meta = pickle.load(f)
+    def hybrid_stats(self) -> dict:
+        with self.hybrid_lock:
+            return dict(self.hybrid)
 
-        return True
+    def score(self, query: str) -> float:
+        """
+        Best match score of `query`, a similarity for the "ip" metric and a
+        distance for "l2". Used to calibrate the relevance threshold.
+        """
+        D, _ = self.index.search(self.encode_query(query), 1)
+        return float(D[0][0])
 
-    def search(self, query: str, top_k=3) -> List[GitaEntity | MixedGitaEntity]:
-        query = f"query: {query}"
-        q_emb = self.model.encode([query])
-        D, I = self.index.search(q_emb, top_k)
+    def encode_passages(self, texts: List[str]):
+        """Document embeddings, straight from the model, never cached."""
+        return self.encoder.encode(
+            [f"passage: {x}" for x in texts], self.index_config.normalize
+        )
 
-        if D[0][0] > 0.44:
-            return []
+    def encode_query(self, query: str):
+        return self.query_encoder.encode(
+            [f"query: {query}"], self.index_config.normalize
+        )
+
+    def search(self, query: str, top_k=3) -> List[GitaEntity | MixedGitaEntity]:
+        index, verse_meta, lexical = self.current
+        if self.hybrid_search and lexical is not None:
+            ranking = self.__hybrid_ranking(
+                query, max(top_k, self.hybrid_budget), index, verse_meta, lexical
+            )
+        else:
+            D, I = index.search(self.encode_query(query), top_k)
+            if not self.index_config.is_relevant(D[0][0]):
+                return []
+            ranking = I[0]
 
         seen_id = []
         output = []
-        for i in I[0]:
-            meta = self.verse_meta[i]
+        for i in ranking:
+            if i < 0:
+                continue
+            if len(output) >= top_k:
+                break
+            meta = verse_meta[i]
             meta_key = ""
             if isinstance(meta, MixedGitaEntity):
                 meta_key = meta.label
@@ -66,28 +191,90 @@ class GitaSearcher(Searcher):
 
             if meta_key not in seen_id:
                 seen_id.append(meta_key)
-                output.append(self.verse_meta[i])
+                output.append(meta)
 
         return output
 
+    def __hybrid_ranking(
+        self,
+        query: str,
+        depth: int,
+        index: faiss.Index,
+        verse_meta: IdMappedView,
+        lexical: LexicalIndex,
+    ) -> List[int]:
+        hits, all_terms_known = lexical.search(query, depth)
+        # Verses are the first entries, a lexical document is an entry row
+        lexical_ids = [verse_meta.ids[doc] for doc, _ in hits]
+        confident = bool(hits) and hits[0][1] >= self.lexical_min_score
+
+        short_circuit = (
+            confident
+            and all_terms_known
+            and len(set(tokenize(query, compounds=False)))
+            <= self.lexical_short_circuit_terms
+        )
+        dense_ids = []
+        if not short_circuit:
+            D, I = index.search(self.encode_query(query), depth)
+            if self.index_config.is_relevant(D[0][0]):
+                dense_ids = [int(x) for x in I[0] if x >= 0]
+
+        with self.hybrid_lock:
+            self.hybrid["searches"] += 1
+            self.hybrid["short_circuits"] += int(short_circuit)
+            self.hybrid["lexical_rescues"] += int(
+                not short_circuit and not dense_ids and confident
+            )
+
+        if short_circuit:
+            return lexical_ids
+        if not dense_ids:
+            # Exact names and terms the dense model misses
+            return lexical_ids if confident else []
+        return reciprocal_rank_fusion([dense_ids, lexical_ids], self.rrf_k)
+
     def chunk_verses(
         self, gita: List[GitaEntity], size: int = 3
-    ) -> Tuple[List[str], List[MixedGitaEntity]]:
+    ) -> Tuple[List[str], List[str], List[MixedGitaEntity]]:
+        """
+        Keys, texts and entities of the chunks. A chunk holds the verses of
+        one chapter within a fixed range of `size` verse numbers (1-3, 4-6,
+        ...), one translation each: the first translations of those verses
+        form one chunk, the second ones another. Adding or removing a verse
+        or a translation then only changes the chunk it belongs to.
+        """
+        groups: Dict[Tuple[int, int, int], List[GitaEntity]] = {}
+        translations: Dict[int, int] = {}
+        # The slot is the order of the translations of a verse, independent
+        # of the order the repository returned the rows in
+        ordered = sorted(
+            gita, key=lambda v: (v.c_chapter_number, v.v_verse_number, v.vt_id)
+        )
+        for v in ordered:
+            slot = translations.get(v.v_id, 0)
+            translations[v.v_id] = slot + 1
+            first_verse = (v.v_verse_number - 1) // size * size + 1
+            groups.setdefault((v.c_chapter_number, first_verse, slot), []).append(v)
+
+        keys = []
         chunks = []
         objects = []
-        for i in range(0, len(gita), size):
-            group = gita[i : i + size]
+        for (chapter, first_verse, slot), group in groups.items():
             text = "; ".join(
                 [
                     f"BG {v.c_chapter_number}.{v.v_verse_number} - {v.vt_content}"
                     for v in group
                 ]
             )
+            keys.append(f"chunk:{chapter}:{first_verse}:{slot}")
             chunks.append("passage: " + text)
             objects.append(
                 MixedGitaEntity(
-                    label="-".join("BG{v.c_chapter_number}.{v.v_verse_number}"),
+                    label="-".join(
+                        f"BG{v.c_chapter_number}.{v.v_verse_number}" for v in group
+                    ),
                     gita=group,
                 )
             )
-        return chunks, objects
+        return keys, chunks, objects
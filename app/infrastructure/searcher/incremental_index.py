@@ -0,0 +1,222 @@
+import hashlib
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, Generic, List, Sequence, TypeVar
+
+import faiss
+import numpy as np
+
+from app.infrastructure.searcher.artifact_store import (
+    Artifact,
+    open_artifact,
+    read_manifest,
+)
+from app.infrastructure.searcher.index_factory import (
+    IndexConfig,
+    apply_search_parameters,
+    create_index,
+)
+
+# IndexIDMap2.remove_ids relies on the wrapped index shifting the positions
+# after a removal, which only the flat index does. HNSW and IVF indexes are
+# rebuilt from the stored embeddings instead, still without re-encoding.
+REMOVABLE_TYPES = ("flat",)
+
+T = TypeVar("T")
+
+
+@dataclass
+class IndexUpdate:
+    index: faiss.Index
+    # Vector id and content hash per entry, in entry order
+    ids: np.ndarray
+    hashes: List[str]
+    embeddings: np.ndarray
+    reused: int
+    encoded: int
+    removed: int
+    in_place: bool
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self.hashes),
+            "reused": self.reused,
+            "encoded": self.encoded,
+            "removed": self.removed,
+            "in_place": self.in_place,
+        }
+
+
+class IdMappedView(Generic[T]):
+    """Looks up entries by the ids an IndexIDMap2 returns from `search`."""
+
+    def __init__(self, entries: Sequence[T], ids: Sequence[int]):
+        self.entries = entries
+        self.ids = [int(x) for x in ids]
+        self.positions: Dict[int, int] = {int(x): i for i, x in enumerate(ids)}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __getitem__(self, id: int) -> T:
+        return self.entries[self.positions[int(id)]]
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+
+def entry_table(update: IndexUpdate, keys: List[str]) -> Dict[str, list]:
+    return {"key": keys, "id": update.ids.tolist(), "hash": update.hashes}
+
+
+def previous_artifact(directory: str, model: str) -> Artifact | None:
+    """The artifact on disk when its embeddings came from `model`."""
+    manifest = read_manifest(directory)
+    if manifest is None or manifest["model"] != model:
+        return None
+    if "entries" not in manifest["tables"] or "embeddings" not in manifest["arrays"]:
+        return None
+    return open_artifact(directory)
+
+
+def previous_entries(previous: Artifact | None) -> Dict[str, tuple]:
+    """key -> (id, hash, row) of the entries `previous` was built from."""
+    if previous is None or "entries" not in previous.tables:
+        return {}
+    table = previous.tables["entries"]
+    return {
+        table.value("key", row): (
+            table.value("id", row),
+            table.value("hash", row),
+            row,
+        )
+        for row in range(len(table))
+    }
+
+
+def has_changes(previous: Artifact | None, keys: List[str], texts: List[str]) -> bool:
+    entries = previous_entries(previous)
+    if len(entries) != len(keys):
+        return True
+    return any(
+        entries.get(key, (None, None))[1] != content_hash(text)
+        for key, text in zip(keys, texts)
+    )
+
+
+def empty_update(
+    config: IndexConfig,
+    encode: Callable[[List[str]], np.ndarray],
+    previous: Artifact | None,
+) -> IndexUpdate:
+    """An empty corpus, every previous entry is removed."""
+    if previous is not None:
+        dim = previous.arrays["embeddings"].shape[1]
+    else:
+        dim = np.asarray(encode([""])).shape[1]
+    # IVF indexes can't be trained without vectors, an empty flat index
+    # answers every search with no result
+    index = create_index(
+        replace(config, type="flat"),
+        np.empty((0, dim), dtype="float32"),
+        np.empty(0, dtype=np.int64),
+    )
+    return IndexUpdate(
+        index=index,
+        ids=np.empty(0, dtype=np.int64),
+        hashes=[],
+        embeddings=np.empty((0, dim), dtype="float32"),
+        reused=0,
+        encoded=0,
+        removed=len(previous_entries(previous)),
+        in_place=False,
+    )
+
+
+def update_index(
+    config: IndexConfig,
+    keys: List[str],
+    texts: List[str],
+    encode: Callable[[List[str]], np.ndarray],
+    previous: Artifact | None = None,
+    previous_index: faiss.Index | None = None,
+) -> IndexUpdate:
+    """
+    Build the index for `texts`, embedding only the entries whose key is new
+    or whose text changed since `previous` (an artifact written by the same
+    model). The other embeddings are copied from `previous`.
+
+    Every entry keeps its vector id across builds. When `previous_index` is
+    an ID-mapped index of a removable family, a copy of it is patched by
+    removing the deleted and changed ids and adding the new vectors, the
+    serving index itself is never touched.
+    """
+    if not keys:
+        return empty_update(config, encode, previous)
+
+    hashes = [content_hash(x) for x in texts]
+    old = previous_entries(previous)
+    next_id = max((x[0] for x in old.values()), default=-1) + 1
+
+    ids = np.empty(len(keys), dtype=np.int64)
+    reused: Dict[int, int] = {}
+    to_encode: List[int] = []
+    stale_ids: List[int] = []
+    for i, (key, digest) in enumerate(zip(keys, hashes)):
+        entry = old.pop(key, None)
+        if entry is None:
+            ids[i] = next_id
+            next_id += 1
+            to_encode.append(i)
+        elif entry[1] == digest:
+            ids[i] = entry[0]
+            reused[i] = entry[2]
+        else:
+            ids[i] = entry[0]
+            stale_ids.append(entry[0])
+            to_encode.append(i)
+    # Keys that are gone from the corpus
+    removed_ids = [x[0] for x in old.values()]
+
+    fresh = None
+    if to_encode:
+        fresh = np.asarray(encode([texts[i] for i in to_encode]), dtype="float32")
+    if fresh is not None:
+        dim = fresh.shape[1]
+    else:
+        dim = previous.arrays["embeddings"].shape[1]
+    embeddings = np.empty((len(keys), dim), dtype="float32")
+    if reused:
+        rows = list(reused.values())
+        embeddings[list(reused)] = previous.arrays["embeddings"][rows]
+    if fresh is not None:
+        embeddings[to_encode] = fresh
+
+    in_place = (
+        previous_index is not None
+        and isinstance(previous_index, faiss.IndexIDMap2)
+        and config.type in REMOVABLE_TYPES
+    )
+    if in_place:
+        index = faiss.clone_index(previous_index)
+        if stale_ids or removed_ids:
+            index.remove_ids(np.array(stale_ids + removed_ids, dtype=np.int64))
+        if to_encode:
+            added = np.ascontiguousarray(embeddings[to_encode])
+            if config.normalize:
+                faiss.normalize_L2(added)
+            index.add_with_ids(added, ids[to_encode])
+        apply_search_parameters(index, config)
+    else:
+        index = create_index(config, embeddings.copy(), ids)
+
+    return IndexUpdate(
+        index=index,
+        ids=ids,
+        hashes=hashes,
+        embeddings=embeddings,
+        reused=len(reused),
+        encoded=len(to_encode),
+        removed=len(removed_ids),
+        in_place=in_place,
+    )
@@ -0,0 +1,229 @@
+import json
+import math
+import os
+from dataclasses import asdict, dataclass, fields
+from typing import Literal, Tuple
+
+import faiss
+import numpy as np
+
+from app.infrastructure.util.env import getenv_bool, getenv_int
+
+IndexType = Literal["flat", "hnsw", "ivf_flat", "ivf_pq"]
+IndexMetric = Literal["l2", "ip"]
+
+# Parameters that only change query time behaviour, they can differ between
+# the persisted index and the running configuration.
+SEARCH_PARAMETERS = ("hnsw_ef_search", "ivf_nprobe", "relevance_threshold", "mmap")
+
+# Default cutoffs when no calibrated threshold is stored. e5 embeddings are
+# unit length, so a squared L2 distance of 0.44 is a cosine of 1 - 0.44 / 2.
+DEFAULT_RELEVANCE_THRESHOLD = {"l2": 0.44, "ip": 0.78}
+
+
+@dataclass
+class IndexConfig:
+    type: IndexType = "flat"
+    # "ip" L2-normalizes the embeddings and searches by inner product (cosine)
+    metric: IndexMetric = "l2"
+    hnsw_m: int = 32
+    hnsw_ef_construction: int = 200
+    hnsw_ef_search: int = 64
+    # 0 means 4 * sqrt(n), clamped so every list gets enough training points
+    ivf_nlist: int = 0
+    ivf_nprobe: int = 8
+    pq_m: int = 64
+    pq_nbits: int = 8
+    # Calibrated with scripts/searcher/calibrate_threshold.py, None = default
+    relevance_threshold: float | None = None
+    # Embedding model the index was built with, filled in by the searcher
+    model: str | None = None
+    # Map the index file instead of reading it, the page cache then holds a
+    # single copy shared by every worker process
+    mmap: bool = False
+
+    @classmethod
+    def from_env(cls, prefix: str) -> "IndexConfig":
+        default = cls()
+        threshold = os.getenv(f"{prefix}_RELEVANCE_THRESHOLD")
+        return cls(
+            type=os.getenv(f"{prefix}_INDEX_TYPE") or default.type,  # type: ignore
+            metric=os.getenv(f"{prefix}_INDEX_METRIC") or default.metric,  # type: ignore
+            hnsw_m=getenv_int(f"{prefix}_HNSW_M", default.hnsw_m),
+            hnsw_ef_construction=getenv_int(
+                f"{prefix}_HNSW_EF_CONSTRUCTION", default.hnsw_ef_construction
+            ),
+            hnsw_ef_search=getenv_int(
+                f"{prefix}_HNSW_EF_SEARCH", default.hnsw_ef_search
+            ),
+            ivf_nlist=getenv_int(f"{prefix}_IVF_NLIST", default.ivf_nlist),
+            ivf_nprobe=getenv_int(f"{prefix}_IVF_NPROBE", default.ivf_nprobe),
+            pq_m=getenv_int(f"{prefix}_PQ_M", default.pq_m),
+            pq_nbits=getenv_int(f"{prefix}_PQ_NBITS", default.pq_nbits),
+            relevance_threshold=float(threshold) if threshold else None,
+            mmap=getenv_bool(f"{prefix}_INDEX_MMAP", default.mmap),
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "IndexConfig":
+        names = {x.name for x in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in names})
+
+    def to_dict(self):
+        return asdict(self)
+
+    def same_structure(self, other: "IndexConfig") -> bool:
+        """True when both configs produce the same index on disk."""
+        mine = {k: v for k, v in self.to_dict().items() if k not in SEARCH_PARAMETERS}
+        theirs = {
+            k: v for k, v in other.to_dict().items() if k not in SEARCH_PARAMETERS
+        }
+        return mine == theirs
+
+    @property
+    def normalize(self) -> bool:
+        return self.metric == "ip"
+
+    @property
+    def faiss_metric(self) -> int:
+        if self.metric == "ip":
+            return faiss.METRIC_INNER_PRODUCT
+        return faiss.METRIC_L2
+
+    def threshold(self) -> float:
+        if self.relevance_threshold is not None:
+            return self.relevance_threshold
+        return DEFAULT_RELEVANCE_THRESHOLD[self.metric]
+
+    def is_relevant(self, score: float) -> bool:
+        """`score` is a similarity for "ip" and a distance for "l2"."""
+        if self.metric == "ip":
+            return score >= self.threshold()
+        return score <= self.threshold()
+
+
+def create_index(
+    config: IndexConfig, embeddings: np.ndarray, ids: np.ndarray | None = None
+) -> faiss.Index:
+    """
+    Build, train (when needed) and fill an index for `embeddings`. With
+    `ids` the index is wrapped in an IndexIDMap2 and searches return them
+    instead of the row positions.
+    """
+    embeddings = np.ascontiguousarray(embeddings, dtype="float32")
+    count, dim = embeddings.shape
+
+    if config.normalize:
+        faiss.normalize_L2(embeddings)
+
+    if config.type == "flat":
+        index = faiss.IndexFlat(dim, config.faiss_metric)
+    elif config.type == "hnsw":
+        index = faiss.IndexHNSWFlat(dim, config.hnsw_m, config.faiss_metric)
+        index.hnsw.efConstruction = config.hnsw_ef_construction
+    elif config.type in ("ivf_flat", "ivf_pq"):
+        nlist = config.ivf_nlist or int(4 * math.sqrt(count))
+        # faiss wants ~39 training points per list
+        nlist = max(1, min(nlist, count // 39))
+        quantizer = faiss.IndexFlat(dim, config.faiss_metric)
+        if config.type == "ivf_flat":
+            index = faiss.IndexIVFFlat(quantizer, dim, nlist, config.faiss_metric)
+        else:
+            pq_m = max(x for x in range(1, min(config.pq_m, dim) + 1) if dim % x == 0)
+            # every PQ centroid needs at least one training point
+            pq_nbits = config.pq_nbits
+            while pq_nbits > 1 and 2**pq_nbits > count:
+                pq_nbits -= 1
+            index = faiss.IndexIVFPQ(
+                quantizer, dim, nlist, pq_m, pq_nbits, config.faiss_metric
+            )
+        index.train(embeddings)
+    else:
+        raise ValueError(f"Unknown index type: {config.type}")
+
+    if ids is not None:
+        index = faiss.IndexIDMap2(index)
+        index.add_with_ids(embeddings, np.ascontiguousarray(ids, dtype="int64"))
+    else:
+        index.add(embeddings)
+    apply_search_parameters(index, config)
+    return index
+
+
+def apply_search_parameters(index: faiss.Index, config: IndexConfig):
+    # By the actual index, an empty corpus is served by a flat one whatever
+    # the configured type
+    index = base_index(index)
+    if isinstance(index, faiss.IndexHNSW):
+        index.hnsw.efSearch = config.hnsw_ef_search
+    elif isinstance(index, faiss.IndexIVF):
+        index.nprobe = config.ivf_nprobe
+
+
+def base_index(index: faiss.Index) -> faiss.Index:
+    """The index wrapped by an IndexIDMap2, where the search parameters live."""
+    if isinstance(index, (faiss.IndexIDMap, faiss.IndexIDMap2)):
+        return faiss.downcast_index(index.index)
+    return index
+
+
+def write_index(index: faiss.Index, config: IndexConfig, index_path: str):
+    # Written next to the target and renamed, a process starting meanwhile
+    # reads either the old or the new index
+    tmp_path = f"{index_path}.tmp-{os.getpid()}"
+    faiss.write_index(index, tmp_path)
+    with open(index_config_path(tmp_path), "w") as f:
+        json.dump(config.to_dict(), f, indent=4)
+    os.replace(index_config_path(tmp_path), index_config_path(index_path))
+    os.replace(tmp_path, index_path)
+
+
+def read_index(
+    index_path: str, config: IndexConfig
+) -> Tuple[faiss.Index, IndexConfig]:
+    """
+    Read a persisted index together with the parameters it was built with.
+    Query time parameters are taken from the running `config`.
+    """
+    index = None
+    if config.mmap:
+        try:
+            index = faiss.read_index(index_path, faiss.IO_FLAG_MMAP)
+        except RuntimeError:
+            # Not every index type can be mapped, e.g. HNSW graphs
+            pass
+    if index is None:
+        index = faiss.read_index(index_path)
+    persisted = read_index_config(index_path)
+    for name in SEARCH_PARAMETERS:
+        # A calibrated threshold is kept unless explicitly overridden
+        if name == "relevance_threshold" and config.relevance_threshold is None:
+            continue
+        setattr(persisted, name, getattr(config, name))
+    apply_search_parameters(index, persisted)
+    return index, persisted
+
+
+def read_index_config(index_path: str) -> IndexConfig:
+    # Indexes written before the factory existed are always flat
+    if not os.path.exists(index_config_path(index_path)):
+        return IndexConfig()
+    with open(index_config_path(index_path), "r") as f:
+        return IndexConfig.from_dict(json.load(f))
+
+
+def write_relevance_threshold(index_path: str, threshold: float):
+    """Store a calibrated threshold alongside an already built index."""
+    config = read_index_config(index_path)
+    config.relevance_threshold = threshold
+    # Renamed over the old config like `write_index`, a searcher loading
+    # meanwhile never reads a half written file
+    path = index_config_path(index_path)
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, "w") as f:
+        json.dump(config.to_dict(), f, indent=4)
+    os.replace(tmp_path, path)
+
+
+def index_config_path(index_path: str) -> str:
+    return index_path + ".json"
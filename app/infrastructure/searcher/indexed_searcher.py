@@ -0,0 +1,201 @@
+import os
+import threading
+from abc import abstractmethod
+from typing import Dict, List, Sequence, Tuple
+
+import faiss
+
+from app.application.service.encoder import Encoder
+from app.application.service.searcher import Searcher
+from app.infrastructure.encoder.batching_encoder import BatchingEncoder
+from app.infrastructure.encoder.cached_encoder import CachedEncoder
+from app.infrastructure.encoder.embedding_cache import EmbeddingCache
+from app.infrastructure.encoder.sentence_transformer_encoder import (
+    SentenceTransformerEncoder,
+)
+from app.infrastructure.searcher.artifact_store import (
+    Artifact,
+    artifact_lock,
+    corpus_hash,
+    open_artifact,
+    read_manifest,
+    write_artifact,
+)
+from app.infrastructure.searcher.incremental_index import (
+    IdMappedView,
+    entry_table,
+    has_changes,
+    previous_artifact,
+    update_index,
+)
+from app.infrastructure.searcher.index_factory import (
+    IndexConfig,
+    read_index,
+    read_index_config,
+    write_index,
+)
+
+
+class IndexedSearcher(Searcher):
+    """
+    FAISS index plus memory-mapped metadata artifact, kept up to date
+    incrementally. `{NAME}.index` and the `{NAME}_meta/` artifact live under
+    `path_prefix`.
+
+    Subclasses only describe their corpus: the key and embedded text of
+    every entry (`index_entries`), the tables stored next to them
+    (`artifact_tables`) and how those tables are read back (`open_views`).
+    """
+
+    NAME: str
+    DEFAULT_MODEL: str
+
+    def __init__(
+        self,
+        index_config: IndexConfig | None = None,
+        encoder: Encoder | None = None,
+        embedding_cache: EmbeddingCache | None = None,
+        batch_window_ms: float = 0,
+        batch_max_size: int = 32,
+    ):
+        self.path_prefix = "data/model/"
+        self.encoder: Encoder = encoder or SentenceTransformerEncoder(
+            self.DEFAULT_MODEL
+        )
+        # Concurrent query encodes share one forward pass
+        self.batcher = (
+            BatchingEncoder(self.encoder, batch_window_ms, batch_max_size)
+            if batch_window_ms > 0
+            else None
+        )
+        self.query_encoder: Encoder = self.batcher or self.encoder
+        # Queries repeat a lot (clicked suggestions), passages never do
+        if embedding_cache:
+            self.query_encoder = CachedEncoder(self.query_encoder, embedding_cache)
+        self.index_config = index_config or IndexConfig()
+        self.index_config.model = self.encoder.model_id
+        # Index, metadata and the views of `open_views` are swapped as one
+        # reference, a search running during a rebuild never pairs the new
+        # index with the old metadata
+        self.current: tuple = (None, [])
+        self.artifact: Artifact | None = None
+        self.build_lock = threading.Lock()
+        self.last_update: dict = {}
+
+    @property
+    def index_path(self) -> str:
+        return self.path_prefix + f"{self.NAME}.index"
+
+    @property
+    def artifact_directory(self) -> str:
+        return self.path_prefix + f"{self.NAME}_meta"
+
+    @property
+    def index(self) -> faiss.Index | None:
+        return self.current[0]
+
+    @property
+    def meta(self) -> IdMappedView | list:
+        return self.current[1]
+
+    @abstractmethod
+    def index_entries(self, data: Sequence) -> Tuple[List[str], List[str]]:
+        """Stable key and embedded text of every entry of `data`."""
+        pass
+
+    @abstractmethod
+    def artifact_tables(self, data: Sequence) -> Dict[str, Dict[str, list]]:
+        """Tables stored with the index, besides the entries table."""
+        pass
+
+    @abstractmethod
+    def open_views(self, artifact: Artifact) -> tuple:
+        """Entry position -> entity view of `artifact`, plus extra views."""
+        pass
+
+    def builded(self) -> bool:
+        if not os.path.exists(self.index_path):
+            return False
+        # Missing, or written by another format version or model
+        manifest = read_manifest(self.artifact_directory)
+        if manifest is None or manifest["model"] != self.encoder.model_id:
+            return False
+
+        # Rebuild when the configured index family or embedding model changed
+        persisted = read_index_config(self.index_path)
+        # Indexes written before the model was recorded used the default one
+        persisted.model = persisted.model or self.DEFAULT_MODEL
+        return persisted.same_structure(self.index_config)
+
+    def needs_update(self, data: Sequence) -> bool:
+        keys, texts = self.index_entries(data)
+        return has_changes(self.artifact, keys, texts)
+
+    def build_index(self, data: Sequence) -> bool:
+        """
+        Only entries that are new or whose text changed since the last build
+        are embedded, the others reuse their stored embedding. The running
+        index keeps serving until the new one is swapped in.
+        """
+        keys, texts = self.index_entries(data)
+        with self.build_lock:
+            update = update_index(
+                self.index_config,
+                keys,
+                texts,
+                lambda x: self.encoder.encode(x, self.index_config.normalize),
+                previous=self.artifact
+                or previous_artifact(self.artifact_directory, self.encoder.model_id),
+                previous_index=self.index if self.artifact else None,
+            )
+            with artifact_lock(self.artifact_directory):
+                write_index(update.index, self.index_config, self.index_path)
+                write_artifact(
+                    self.artifact_directory,
+                    {
+                        "kind": self.NAME,
+                        "model": self.encoder.model_id,
+                        "dim": int(update.embeddings.shape[1]),
+                        "index": os.path.basename(self.index_path),
+                        "index_type": self.index_config.type,
+                        "metric": self.index_config.metric,
+                        "corpus_hash": corpus_hash(texts),
+                    },
+                    {
+                        **self.artifact_tables(data),
+                        "entries": entry_table(update, keys),
+                    },
+                    {"embeddings": update.embeddings},
+                )
+            self.__swap(update.index)
+            self.last_update = update.stats()
+
+        return True
+
+    def load_index(self) -> bool:
+        index, self.index_config = read_index(self.index_path, self.index_config)
+        self.index_config.model = self.encoder.model_id
+        self.__swap(index)
+
+        return True
+
+    def index_stats(self) -> dict:
+        manifest = self.artifact.manifest if self.artifact else {}
+        return {
+            "entries": len(self.meta),
+            "model": manifest.get("model"),
+            "index_type": manifest.get("index_type"),
+            "corpus_hash": manifest.get("corpus_hash"),
+            "built_at": manifest.get("created_at"),
+            "last_update": self.last_update,
+        }
+
+    def encode(self, texts: List[str]):
+        return self.query_encoder.encode(texts)
+
+    def __swap(self, index: faiss.Index):
+        artifact = open_artifact(self.artifact_directory)
+        meta, *views = self.open_views(artifact)
+        ids = artifact.tables["entries"].values("id")
+        self.current = (index, IdMappedView(meta, ids), *views)
+        self.artifact = artifact
@@ -0,0 +1,126 @@
+import math
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from app.infrastructure.searcher.artifact_store import ColumnTable
+
+WORD = re.compile(r"\w+(?:-\w+)*")
+
+# Frequent Indonesian and English words of the translations and meanings,
+# they only add noise to short keyword queries
+STOPWORDS = {
+    "ada", "adalah", "agar", "akan", "apa", "atau", "bab", "bagi", "bahwa",
+    "dalam", "dan", "dari", "dengan", "di", "ia", "ini", "itu", "juga", "ke",
+    "kepada", "mereka", "oleh", "pada", "sloka", "tentang", "tidak", "untuk",
+    "yang", "a", "an", "and", "in", "is", "of", "on", "the", "to", "with",
+}  # fmt: skip
+
+
+def fold(text: str) -> str:
+    """Case and diacritic folding, "Sañjaya" and "sanjaya" match."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(x for x in decomposed if not unicodedata.combining(x))
+
+
+def tokenize(text: str, compounds: bool = True) -> List[str]:
+    tokens = []
+    for word in WORD.findall(fold(text)):
+        parts = word.split("-")
+        tokens += parts
+        # "sthita-prajña" also matches "sthitaprajna"
+        if compounds and len(parts) > 1:
+            tokens.append("".join(parts))
+    return [x for x in tokens if len(x) > 1 and x not in STOPWORDS]
+
+
+def build_lexical_tables(documents: Sequence[str]) -> Dict[str, Dict[str, list]]:
+    """Inverted index of `documents` as artifact tables, see `LexicalIndex`."""
+    postings: Dict[str, List[Tuple[int, int]]] = {}
+    lengths = []
+    for doc, text in enumerate(documents):
+        tokens = tokenize(text)
+        lengths.append(len(tokens))
+        for term, frequency in Counter(tokens).items():
+            postings.setdefault(term, []).append((doc, frequency))
+
+    terms = sorted(postings)
+    return {
+        "lexicon": {
+            "term": terms,
+            "docs": [[doc for doc, _ in postings[x]] for x in terms],
+            "freqs": [[frequency for _, frequency in postings[x]] for x in terms],
+        },
+        "lexical_docs": {"length": lengths},
+    }
+
+
+class LexicalIndex:
+    """
+    BM25 over the memory-mapped posting lists written by
+    `build_lexical_tables`. Documents are identified by their position in
+    the list the index was built from.
+    """
+
+    def __init__(
+        self,
+        lexicon: ColumnTable,
+        documents: ColumnTable,
+        k1: float = 1.2,
+        b: float = 0.75,
+    ):
+        self.lexicon = lexicon
+        self.k1 = k1
+        self.b = b
+        self.terms = {term: row for row, term in enumerate(lexicon.values("term"))}
+        self.lengths = np.asarray(documents.values("length"), dtype="float32")
+        self.average_length = float(self.lengths.mean()) if len(self.lengths) else 0.0
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def search(
+        self, query: str, limit: int = 10
+    ) -> Tuple[List[Tuple[int, float]], bool]:
+        """
+        The best `limit` documents with their score, and whether every word
+        of the query is in the vocabulary (joined compounds are optional).
+        """
+        rows = [self.terms[x] for x in set(tokenize(query)) if x in self.terms]
+        if not rows or limit <= 0:
+            return [], False
+
+        scores = np.zeros(len(self.lengths), dtype="float32")
+        normalized_lengths = self.k1 * (
+            1 - self.b + self.b * self.lengths / max(self.average_length, 1.0)
+        )
+        for row in rows:
+            docs = self.lexicon.ints("docs", row)
+            frequencies = self.lexicon.ints("freqs", row).astype("float32")
+            idf = math.log(
+                1 + (len(self.lengths) - len(docs) + 0.5) / (len(docs) + 0.5)
+            )
+            scores[docs] += (
+                idf
+                * frequencies
+                * (self.k1 + 1)
+                / (frequencies + normalized_lengths[docs])
+            )
+
+        limit = min(limit, int(np.count_nonzero(scores)))
+        best = np.argpartition(-scores, limit - 1)[:limit]
+        best = best[np.argsort(-scores[best])]
+        known = all(x in self.terms for x in tokenize(query, compounds=False))
+        return [(int(x), float(scores[x])) for x in best], known
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[int]], k: int = 60) -> List[int]:
+    """Ids of all `rankings` ordered by the sum of 1 / (k + rank)."""
+    scores: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, id in enumerate(ranking):
+            scores[id] = scores.get(id, 0.0) + 1 / (k + rank + 1)
+    return sorted(scores, key=lambda x: scores[x], reverse=True)
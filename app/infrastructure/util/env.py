@@ -0,0 +1,22 @@
+from os import getenv
+
+
+def getenv_bool(key: str, default: bool = False) -> bool:
+    value = getenv(key)
+    if value is None or value.strip() == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def getenv_int(key: str, default: int) -> int:
+    value = getenv(key)
+    if value is None or value.strip() == "":
+        return default
+    return int(value)
+
+
+def getenv_float(key: str, default: float) -> float:
+    value = getenv(key)
+    if value is None or value.strip() == "":
+        return default
+    return float(value)
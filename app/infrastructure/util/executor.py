@@ -0,0 +1,103 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from app.infrastructure.util.fork import after_fork_in_child
+
+T = TypeVar("T")
+
+
+class BoundedExecutor:
+    """
+    Thread pool with a fixed number of workers, created on first use so the
+    size can still be configured at startup. Work submitted beyond the pool
+    size waits in the queue instead of spawning more threads.
+    """
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.executor: ThreadPoolExecutor | None = None
+        self.lock = threading.Lock()
+        self.pending = 0
+        self.max_pending = 0
+        self.completed = 0
+        after_fork_in_child(self.__after_fork)
+
+    def configure(self, max_workers: int):
+        with self.lock:
+            if self.executor is not None:
+                raise RuntimeError(f"Executor {self.name} is already running")
+            self.max_workers = max_workers
+
+    def get_executor(self) -> ThreadPoolExecutor:
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix=self.name
+                )
+            return self.executor
+
+    def submit(self, func: Callable[..., T], *args, **kwargs) -> "Future[T]":
+        executor = self.get_executor()
+        with self.lock:
+            self.pending += 1
+            self.max_pending = max(self.max_pending, self.pending)
+        future = executor.submit(func, *args, **kwargs)
+        future.add_done_callback(self.__done)
+        return future
+
+    async def run(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """Await `func` on the pool from the event loop."""
+        return await asyncio.wrap_future(self.submit(func, *args, **kwargs))
+
+    def call(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """Run `func` on the pool from synchronous code and wait for it."""
+        # Waiting on our own pool from one of its threads could deadlock
+        if threading.current_thread().name.startswith(self.name + "_"):
+            return func(*args, **kwargs)
+        return self.submit(func, *args, **kwargs).result()
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "max_workers": self.max_workers,
+                "pending": self.pending,
+                "queued": max(0, self.pending - self.max_workers),
+                "max_pending": self.max_pending,
+                "completed": self.completed,
+            }
+
+    def __after_fork(self):
+        # The pool threads stayed in the parent, start a new pool on first use
+        self.executor = None
+        self.lock = threading.Lock()
+        self.pending = 0
+        self.max_pending = 0
+        self.completed = 0
+
+    def __done(self, future: Future):
+        with self.lock:
+            self.pending -= 1
+            self.completed += 1
+
+
+# Blocking network calls (database, LLM SDKs without async support)
+io_executor = BoundedExecutor("io", 32)
+# Model inference. torch and onnxruntime already spread one call over the
+# cores, a couple of concurrent calls keeps them busy without thrashing.
+cpu_executor = BoundedExecutor("cpu", min(2, os.cpu_count() or 1))
+
+
+async def run_io(func: Callable[..., T], *args, **kwargs) -> T:
+    return await io_executor.run(func, *args, **kwargs)
+
+
+async def run_cpu(func: Callable[..., T], *args, **kwargs) -> T:
+    return await cpu_executor.run(func, *args, **kwargs)
+
+
+def executor_stats() -> dict:
+    return {"io": io_executor.stats(), "cpu": cpu_executor.stats()}
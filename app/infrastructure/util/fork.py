@@ -0,0 +1,24 @@
+import os
+from typing import Callable, List
+
+# Worker processes leave through os._exit, which skips atexit handlers
+worker_exit_callbacks: List[Callable[[], None]] = []
+
+
+def after_fork_in_child(callback: Callable[[], None]):
+    """
+    Run `callback` in every worker forked from this process. Threads and
+    open connections don't survive a fork, this is where they are reset.
+    """
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=callback)
+
+
+def on_worker_exit(callback: Callable[[], None]):
+    """Run `callback` when a forked worker shuts down, e.g. to flush state."""
+    worker_exit_callbacks.append(callback)
+
+
+def run_worker_exit_callbacks():
+    for callback in worker_exit_callbacks:
+        callback()
@@ -0,0 +1,47 @@
+import os
+import sys
+
+
+def resident_memory_bytes() -> int:
+    """Current resident set size of this process, 0 when unknown."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+
+    try:
+        import resource
+    except ImportError:
+        return 0
+
+    # Not available outside Linux, fall back to the peak usage
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def memory_usage() -> dict:
+    """
+    Resident, proportional (PSS) and shared memory of this process in bytes.
+
+    PSS splits every shared page between the processes mapping it, so the PSS
+    of all workers adds up to what they really use together. Only Linux
+    reports it, elsewhere only the RSS is known.
+    """
+    usage = {"rss_bytes": resident_memory_bytes()}
+    try:
+        with open("/proc/self/smaps_rollup", "r") as f:
+            fields = dict(line.split(":", 1) for line in f if ":" in line)
+    except OSError:
+        return usage
+
+    def kilobytes(*names: str) -> int:
+        total = 0
+        for name in names:
+            value = fields.get(name, "").split()
+            total += int(value[0]) * 1024 if value else 0
+        return total
+
+    usage["pss_bytes"] = kilobytes("Pss")
+    usage["shared_bytes"] = kilobytes("Shared_Clean", "Shared_Dirty")
+    return usage
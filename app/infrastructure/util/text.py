@@ -0,0 +1,8 @@
+import re
+import unicodedata
+
+
+def normalize_text(text: str) -> str:
+    """Cache key form of a text: NFC, collapsed whitespace, casefolded."""
+    text = unicodedata.normalize("NFC", text)
+    return re.sub(r"\s+", " ", text).strip().casefold()
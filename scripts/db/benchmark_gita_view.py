@@ -0,0 +1,171 @@
+"""
+Query plans and latency of the GitaEntity queries, joins against gita_view.
+
+For each lookup done by `MysqlGitaRepository` the original three-way join
+(with its `MIN(id) GROUP BY verse_id` derived table and `ORDER BY RAND()`)
+is compared with the same lookup on the denormalized table created by
+`scripts/db/migrate_gita_view.sql`. The EXPLAIN rows show which indexes
+are used and how many rows each plan touches.
+
+Uses the DB_* settings from `.env`. Run from the repository root:
+
+    python -m scripts.db.benchmark_gita_view --runs 200
+"""
+
+import argparse
+import random
+import time
+from typing import Callable, Dict, List
+
+from dotenv import load_dotenv
+
+from app.infrastructure.dbclient.mysql_client import MysqlClient
+from app.infrastructure.util.stats import percentile
+
+GITA_COLUMNS = """
+  vt.id AS `vt_id`,
+  vt.content AS `vt_content`,
+  v.id AS `v_id`,
+  v.text_sanskrit AS `v_text_sanskrit`,
+  v.text_sanskrit_meanings AS `v_text_sanskrit_meanings`,
+  v.verse_number AS `v_verse_number`,
+  v.audio_url AS `v_audio_url`,
+  c.id AS `c_id`,
+  c.chapter_number AS `c_chapter_number`,
+  c.name AS `c_name`,
+  c.summary AS `c_summary`,
+  c.verses_count AS `c_verses_count`
+"""
+
+PRIMARY_JOIN = """
+  verses v
+  LEFT JOIN (
+    SELECT vt.*
+    FROM verse_translations vt
+    INNER JOIN (
+      SELECT verse_id, MIN(id) AS min_id
+      FROM verse_translations
+      GROUP BY verse_id
+    ) filtered ON vt.id = filtered.min_id
+  ) vt ON vt.verse_id = v.id
+  INNER JOIN chapters c ON c.id = v.chapter_id
+"""
+
+
+def cases(verse_ids: Dict[int, List[int]], sample_size: int) -> dict:
+    """name -> (join query, its parameters, gita_view query, its parameters)"""
+    all_ids = [x for ids in verse_ids.values() for x in ids]
+    placeholders = ", ".join(["%s"] * sample_size)
+
+    def specific_verse() -> tuple:
+        return (random.randint(1, 18), random.randint(1, 20))
+
+    def chapter() -> tuple:
+        return (random.choice(list(verse_ids)),)
+
+    # The repository samples ids in memory and fetches them by key
+    def chapter_ids() -> tuple:
+        return tuple(random.sample(verse_ids[chapter()[0]], sample_size))
+
+    def random_ids() -> tuple:
+        return tuple(random.sample(all_ids, sample_size))
+
+    return {
+        "specific_verse": (
+            f"""
+            SELECT {GITA_COLUMNS}
+            FROM
+              verse_translations vt
+              INNER JOIN verses v ON v.id = vt.verse_id
+              INNER JOIN chapters c ON c.id = v.chapter_id
+            WHERE c.chapter_number = %s AND v.verse_number = %s;
+            """,
+            specific_verse,
+            """
+            SELECT * FROM gita_view
+            WHERE c_chapter_number = %s AND v_verse_number = %s;
+            """,
+            specific_verse,
+        ),
+        "sample_verses": (
+            f"""
+            SELECT {GITA_COLUMNS} FROM {PRIMARY_JOIN}
+            WHERE c.chapter_number = %s
+            ORDER BY RAND()
+            LIMIT {sample_size};
+            """,
+            chapter,
+            f"""
+            SELECT * FROM gita_view WHERE v_id IN ({placeholders});
+            """,
+            chapter_ids,
+        ),
+        "random_verses": (
+            f"""
+            SELECT {GITA_COLUMNS} FROM {PRIMARY_JOIN}
+            ORDER BY RAND()
+            LIMIT {sample_size};
+            """,
+            lambda: (),
+            f"""
+            SELECT * FROM gita_view WHERE v_id IN ({placeholders});
+            """,
+            random_ids,
+        ),
+    }
+
+
+def explain(client: MysqlClient, sql: str, params: tuple) -> List[dict]:
+    rows = client.query(f"EXPLAIN {sql.strip()}", params)
+    return [
+        {
+            "table": row.get("table"),
+            "type": row.get("type"),
+            "key": row.get("key"),
+            "rows": row.get("rows"),
+            "extra": row.get("Extra"),
+        }
+        for row in rows
+    ]
+
+
+def timed(client: MysqlClient, sql: str, params: Callable[[], tuple], runs: int):
+    latencies = []
+    for _ in range(runs):
+        values = params()
+        start_time = time.perf_counter()
+        client.query(sql, values)
+        latencies.append((time.perf_counter() - start_time) * 1000)
+    return {
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--sample-size", type=int, default=3)
+    args = parser.parse_args()
+
+    load_dotenv()
+    client = MysqlClient(pool_size=1)
+    verse_ids: Dict[int, List[int]] = {}
+    for row in client.query("SELECT v_id, c_chapter_number FROM gita_view;"):
+        verse_ids.setdefault(row["c_chapter_number"], []).append(row["v_id"])
+
+    for name, (join_sql, join_params, view_sql, view_params) in cases(
+        verse_ids, args.sample_size
+    ).items():
+        print(f"== {name}")
+        for label, sql, params in (
+            ("join", join_sql, join_params),
+            ("gita_view", view_sql, view_params),
+        ):
+            print(f"  {label}: {timed(client, sql, params, args.runs)}")
+            for row in explain(client, sql, params()):
+                print(f"    {row}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+-- USE bhagavadgita;
+
+-- Denormalized primary translation per verse, one row per verse with every
+-- GitaEntity column, for MysqlGitaRepository(use_gita_view=True).
+-- Run after migrate.sql and the insert script. Run it again whenever
+-- chapters, verses or verse_translations change, the refresh below swaps
+-- in a rebuilt table atomically.
+CREATE TABLE IF NOT EXISTS gita_view (
+    c_chapter_number INT NOT NULL,
+    v_verse_number INT NOT NULL,
+    vt_id INT NULL,
+    vt_content TEXT NULL,
+    v_id INT NOT NULL,
+    v_text_sanskrit TEXT NOT NULL,
+    v_text_sanskrit_meanings TEXT NOT NULL,
+    v_audio_url VARCHAR(512) NOT NULL,
+    c_id INT NOT NULL,
+    c_name VARCHAR(255) NOT NULL,
+    c_summary TEXT NOT NULL,
+    c_verses_count INT NOT NULL,
+    -- Serves get_specific_verse and the per-chapter range of get_sample_verses
+    PRIMARY KEY (c_chapter_number, v_verse_number),
+    -- Serves the sampled rows of get_random_verses
+    UNIQUE KEY uq_gita_view_v_id (v_id)
+);
+
+-- Refresh
+DROP TABLE IF EXISTS gita_view_next;
+CREATE TABLE gita_view_next LIKE gita_view;
+
+INSERT INTO gita_view_next (
+    c_chapter_number,
+    v_verse_number,
+    vt_id,
+    vt_content,
+    v_id,
+    v_text_sanskrit,
+    v_text_sanskrit_meanings,
+    v_audio_url,
+    c_id,
+    c_name,
+    c_summary,
+    c_verses_count
+)
+SELECT
+    c.chapter_number,
+    v.verse_number,
+    vt.id,
+    vt.content,
+    v.id,
+    v.text_sanskrit,
+    v.text_sanskrit_meanings,
+    v.audio_url,
+    c.id,
+    c.name,
+    c.summary,
+    c.verses_count
+FROM
+    verses v
+    INNER JOIN chapters c ON c.id = v.chapter_id
+    -- First translation per verse, same as the MIN(id) GROUP BY verse_id join
+    LEFT JOIN verse_translations vt ON vt.id = (
+        SELECT MIN(id) FROM verse_translations WHERE verse_id = v.id
+    );
+
+RENAME TABLE gita_view TO gita_view_old, gita_view_next TO gita_view;
+DROP TABLE gita_view_old;
@@ -0,0 +1,137 @@
+"""
+Parity and latency of an alternative embedding backend against the fp32
+sentence-transformers encoder.
+
+The verse corpus (first translation of every verse, embedded the way
+`GitaSearcher` does) is searched with the relevance queries and the intent
+evaluation utterances. Parity is the top-k overlap with the fp32 results,
+both with the corpus re-embedded by the candidate ("rebuilt") and with
+only the queries encoded by it ("query only"). Latency is measured for
+single-query encodes, the way the HTTP handlers call the encoder.
+
+Run from the repository root:
+
+    python -m scripts.encoder.benchmark_backend --backend onnx --k 5
+"""
+
+import argparse
+import time
+from typing import List
+
+import numpy as np
+
+from app.infrastructure.encoder.encoder_registry import EncoderRegistry
+from app.infrastructure.searcher.gita_searcher import GitaSearcher
+from app.infrastructure.util.json_loader import load_json
+from app.infrastructure.util.stats import percentile
+
+
+def load_passages(data_dir: str) -> List[str]:
+    verses = {x["id"]: x for x in load_json(f"{data_dir}/verses.json")}
+    passages = {}
+    for translation in sorted(
+        load_json(f"{data_dir}/translations.json"), key=lambda x: x["id"]
+    ):
+        verse = verses[translation["verse_id"]]
+        passages.setdefault(
+            verse["id"],
+            f"passage: Bab {verse['chapter_id']} sloka {verse['verse_number']} "
+            f"mengatakan {translation['content']}",
+        )
+    return list(passages.values())
+
+
+def load_queries(paths: List[str]) -> List[str]:
+    queries = []
+    for path in paths:
+        for sample in load_json(path):
+            queries.append(f"query: {sample.get('query') or sample['text']}")
+    return queries
+
+
+def top_k(corpus: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    return np.argsort(-(queries @ corpus.T), axis=1)[:, :k]
+
+
+def overlap(expected: np.ndarray, actual: np.ndarray) -> float:
+    hits = sum(len(set(a) & set(b)) for a, b in zip(expected, actual))
+    return hits / expected.size
+
+
+def latency(encoder, queries: List[str], warmup: int = 5) -> dict:
+    for query in queries[:warmup]:
+        encoder.encode([query], True)
+
+    latencies_ms = []
+    for query in queries:
+        start_time = time.perf_counter()
+        encoder.encode([query], True)
+        latencies_ms.append((time.perf_counter() - start_time) * 1000)
+    return {
+        "p50_ms": round(percentile(latencies_ms, 50), 2),
+        "p99_ms": round(percentile(latencies_ms, 99), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backend", default="onnx")
+    parser.add_argument("--model", default=GitaSearcher.DEFAULT_MODEL)
+    parser.add_argument("--data", default="data/3-fine-verse_number")
+    parser.add_argument(
+        "--queries",
+        default="data/searcher/relevance_queries.json,data/intent/intent_eval.json",
+    )
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=32)
+    args = parser.parse_args()
+
+    passages = load_passages(args.data)
+    queries = load_queries(args.queries.split(","))
+    baseline = EncoderRegistry(lazy=False).get(args.model)
+    candidate = EncoderRegistry(lazy=False, backend=args.backend).get(args.model)
+
+    def embed(encoder, texts: List[str]) -> np.ndarray:
+        return np.vstack(
+            [
+                encoder.encode(texts[i : i + args.batch_size], True)
+                for i in range(0, len(texts), args.batch_size)
+            ]
+        )
+
+    print(f"passages={len(passages)} queries={len(queries)} k={args.k}")
+    corpus = embed(baseline, passages)
+    candidate_corpus = embed(candidate, passages)
+    base_queries = embed(baseline, queries)
+    candidate_queries = embed(candidate, queries)
+
+    expected = top_k(corpus, base_queries, args.k)
+    cosine = np.sum(base_queries * candidate_queries, axis=1)
+    print(
+        {
+            "backend": args.backend,
+            "overlap_rebuilt": round(
+                overlap(expected, top_k(candidate_corpus, candidate_queries, args.k)),
+                4,
+            ),
+            "overlap_query_only": round(
+                overlap(expected, top_k(corpus, candidate_queries, args.k)), 4
+            ),
+            "top1_agreement": round(
+                float(
+                    np.mean(
+                        expected[:, 0]
+                        == top_k(candidate_corpus, candidate_queries, 1)[:, 0]
+                    )
+                ),
+                4,
+            ),
+            "min_query_cosine": round(float(cosine.min()), 4),
+        }
+    )
+    print({"backend": "torch", **latency(baseline, queries), **baseline.stats()})
+    print({"backend": args.backend, **latency(candidate, queries), **candidate.stats()})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Latency of cheap endpoints while slow /prompt calls are in flight.
+
+GET /chapter is measured twice, first on an idle server and then while
+`--prompt-concurrency` clients keep POST /prompt busy. When blocking work
+runs on the event loop, the second measurement grows to the length of a
+generation. With the work offloaded it should stay close to the baseline.
+
+Only the standard library is used. Start the server, then run from the
+repository root:
+
+    python -m scripts.http.load_test --url http://localhost:8000
+"""
+
+import argparse
+import json
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from app.infrastructure.util.stats import percentile
+
+PROMPTS = [
+    "bagaimana cara mengendalikan pikiran yang gelisah?",
+    "apa yang dikatakan Krishna tentang bekerja tanpa pamrih?",
+    "apakah jiwa itu abadi?",
+    "ceritakan tentang bab 2",
+]
+
+
+def timed_request(request: urllib.request.Request, timeout: float) -> float:
+    start_time = time.perf_counter()
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        response.read()
+    return (time.perf_counter() - start_time) * 1000
+
+
+def chapter_latencies(
+    url: str, requests: int, concurrency: int, timeout: float
+) -> List[float]:
+    request = urllib.request.Request(f"{url}/chapter")
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(
+            pool.map(lambda _: timed_request(request, timeout), range(requests))
+        )
+
+
+def keep_prompting(url: str, stop: threading.Event, latencies: List[float], i: int):
+    while not stop.is_set():
+        request = urllib.request.Request(
+            f"{url}/prompt",
+            data=json.dumps({"message": PROMPTS[i % len(PROMPTS)]}).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+        try:
+            latencies.append(timed_request(request, 120))
+        except Exception as e:
+            print(f"/prompt failed: {e}")
+        i += 1
+
+
+def summary(name: str, latencies: List[float]) -> dict:
+    return {
+        "name": name,
+        "requests": len(latencies),
+        "p50_ms": round(percentile(latencies, 50), 1),
+        "p99_ms": round(percentile(latencies, 99), 1),
+        "max_ms": round(max(latencies, default=0.0), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--prompt-concurrency", type=int, default=4)
+    parser.add_argument("--warmup", type=float, default=1.0)
+    parser.add_argument("--timeout", type=float, default=30)
+    args = parser.parse_args()
+    url = args.url.rstrip("/")
+
+    chapter_latencies(url, args.concurrency, args.concurrency, args.timeout)
+    baseline = chapter_latencies(url, args.requests, args.concurrency, args.timeout)
+    print(summary("/chapter idle", baseline))
+
+    stop = threading.Event()
+    prompt_latencies: List[float] = []
+    prompters = [
+        threading.Thread(
+            target=keep_prompting, args=(url, stop, prompt_latencies, i), daemon=True
+        )
+        for i in range(args.prompt_concurrency)
+    ]
+    for prompter in prompters:
+        prompter.start()
+    # Let the /prompt calls reach the LLM before measuring
+    time.sleep(args.warmup)
+
+    loaded = chapter_latencies(url, args.requests, args.concurrency, args.timeout)
+    stop.set()
+    print(summary(f"/chapter with {args.prompt_concurrency} /prompt", loaded))
+    for prompter in prompters:
+        prompter.join()
+    print(summary("/prompt", prompt_latencies))
+
+    ratio = percentile(loaded, 99) / max(percentile(baseline, 99), 1e-9)
+    print(f"/chapter p99 under load is {ratio:.1f}x the idle p99")
+
+
+if __name__ == "__main__":
+    main()
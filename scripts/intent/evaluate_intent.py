@@ -0,0 +1,73 @@
+"""
+Compare the local intent classifiers against the Gemini classifier.
+
+Run from the repository root:
+
+    python -m scripts.intent.evaluate_intent [--skip-llm] [--show-mistakes]
+"""
+
+import argparse
+import json
+from os import getenv
+from types import SimpleNamespace
+
+from dotenv import load_dotenv
+
+from app.infrastructure.matcher.embedding_gita_matching import EmbeddingGitaMatching
+from app.infrastructure.matcher.full_gita_matching import FullGitaMatching
+from app.infrastructure.matcher.intent_evaluation import evaluate_intent_classifier
+from app.infrastructure.matcher.rule_intent_parser import RuleIntentParser
+from app.infrastructure.searcher.chapter_searcher import ChapterSearcher
+from app.infrastructure.util.json_loader import load_json
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--samples", default="data/intent/intent_eval.json")
+    parser.add_argument("--skip-llm", action="store_true")
+    parser.add_argument("--show-mistakes", action="store_true")
+    args = parser.parse_args()
+
+    load_dotenv()
+    samples = load_json(args.samples)
+
+    llm_collection = None
+    if not args.skip_llm:
+        from app.infrastructure.llm.gemini_llm import GeminiLLM
+
+        llm_intent = GeminiLLM(
+            "gemini-2.0-flash-lite", json.loads(getenv("GEMINI_API_KEYS") or "[]")
+        )
+        llm_intent.setup("intent_classifier")
+        llm_collection = SimpleNamespace(intent_classifier=llm_intent)
+
+    # Only the parts of the container used by `classify`
+    app = SimpleNamespace(
+        llm_collection=llm_collection, chapter_searcher=ChapterSearcher()
+    )
+
+    rule_parser = RuleIntentParser()
+    embedding_matcher = EmbeddingGitaMatching(rule_fast_path=False)
+    embedding_matcher.set_app(app)
+    # Warm up the example embeddings so they are not part of the latency
+    embedding_matcher.classify_local("bab 1")
+
+    classifiers = {
+        "rule": rule_parser.parse,
+        "embedding": embedding_matcher.classify_local,
+    }
+    if llm_collection:
+        gemini_matcher = FullGitaMatching(rule_fast_path=False)
+        gemini_matcher.set_app(app)
+        classifiers["gemini"] = gemini_matcher.classify
+
+    for name, classify in classifiers.items():
+        report = evaluate_intent_classifier(name, classify, samples)
+        print(json.dumps(report.to_dict()))
+        if args.show_mistakes:
+            for mistake in report.mistakes:
+                print("   ", json.dumps(mistake, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Recall@k and QPS of the ANN index family against the exact Flat baseline.
+
+The corpus vectors are read back from the flat index written by
+`GitaSearcher` (build it once with the default INDEX_TYPE=flat). Use
+`--scale` to replicate the corpus with noise and simulate the 10-50x larger
+corpus of additional translations and commentaries.
+
+Run from the repository root:
+
+    python -m scripts.searcher.benchmark_index --scale 20 --k 3
+"""
+
+import argparse
+import time
+
+import faiss
+import numpy as np
+
+from app.infrastructure.searcher.index_factory import (
+    IndexConfig,
+    base_index,
+    create_index,
+)
+
+
+def load_corpus(index_path: str) -> np.ndarray:
+    # The searchers wrap the flat index in an IndexIDMap2
+    index = base_index(faiss.read_index(index_path))
+    return index.reconstruct_n(0, index.ntotal)
+
+
+def scale_corpus(vectors: np.ndarray, scale: int, noise: float, rng) -> np.ndarray:
+    if scale <= 1:
+        return vectors
+    spread = noise * float(np.std(vectors))
+    copies = [vectors] + [
+        vectors + rng.normal(0, spread, vectors.shape).astype("float32")
+        for _ in range(scale - 1)
+    ]
+    return np.ascontiguousarray(np.vstack(copies), dtype="float32")
+
+
+def recall_at_k(expected: np.ndarray, actual: np.ndarray) -> float:
+    hits = 0
+    for truth, found in zip(expected, actual):
+        hits += len(set(truth.tolist()) & set(found.tolist()))
+    return hits / expected.size
+
+
+def run(config: IndexConfig, corpus, queries, k, expected=None):
+    start_time = time.perf_counter()
+    index = create_index(config, corpus)
+    build_seconds = time.perf_counter() - start_time
+
+    results = np.zeros((len(queries), k), dtype="int64")
+    # One query per call, the way the HTTP handlers search
+    start_time = time.perf_counter()
+    for i, query in enumerate(queries):
+        _, I = index.search(query.reshape(1, -1), k)
+        results[i] = I[0]
+    search_seconds = time.perf_counter() - start_time
+
+    return {
+        "type": config.type,
+        "build_s": round(build_seconds, 2),
+        "qps": round(len(queries) / search_seconds, 1),
+        "recall": round(recall_at_k(expected, results), 4)
+        if expected is not None
+        else 1.0,
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--index", default="data/model/gita.index")
+    parser.add_argument("--types", default="flat,hnsw,ivf_flat,ivf_pq")
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--noise", type=float, default=0.05)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--hnsw-m", type=int, default=32)
+    parser.add_argument("--hnsw-ef-search", type=int, default=64)
+    parser.add_argument("--ivf-nprobe", type=int, default=8)
+    parser.add_argument("--pq-m", type=int, default=64)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    corpus = scale_corpus(load_corpus(args.index), args.scale, args.noise, rng)
+    picked = rng.choice(len(corpus), size=min(args.queries, len(corpus)), replace=False)
+    queries = corpus[picked] + rng.normal(
+        0, args.noise * float(np.std(corpus)), (len(picked), corpus.shape[1])
+    ).astype("float32")
+
+    print(f"corpus={corpus.shape[0]} dim={corpus.shape[1]} queries={len(queries)}")
+    baseline = run(IndexConfig(type="flat"), corpus, queries, args.k)
+    for index_type in args.types.split(","):
+        config = IndexConfig(
+            type=index_type,  # type: ignore
+            hnsw_m=args.hnsw_m,
+            hnsw_ef_search=args.hnsw_ef_search,
+            ivf_nprobe=args.ivf_nprobe,
+            pq_m=args.pq_m,
+        )
+        report = run(config, corpus, queries, args.k, baseline["results"])
+        report.pop("results")
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
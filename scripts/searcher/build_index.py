@@ -0,0 +1,135 @@
+"""
+Build or update the chapter and gita indexes offline, before a deploy.
+
+The corpus is read through the same repositories as the server
+(CORPUS_SOURCE, DB_* or CORPUS_JSON_DIR from `.env`) and handed to the
+searchers, which only embed entries that are new or changed since the
+last build. Embedding goes through `PipelineEncoder`: texts are bucketed
+by token length, batches run on a pool of processes, and finished shards
+are checkpointed under --checkpoint-dir, so rerunning the command after a
+crash resumes where it stopped. Throughput is reported in texts/sec.
+
+Run from the repository root, with the same index settings as the server:
+
+    python -m scripts.searcher.build_index --workers 4 --batch-size 32
+"""
+
+import argparse
+import os
+import time
+from os import getenv
+
+from dotenv import load_dotenv
+
+from app.infrastructure.dbclient.mysql_client import MysqlClient
+from app.infrastructure.encoder.pipeline_encoder import PipelineEncoder
+from app.infrastructure.repository.corpus_snapshot import (
+    CorpusSnapshot,
+    json_corpus_loader,
+)
+from app.infrastructure.repository.mysql_chapter_repository import (
+    MysqlChapterRepository,
+)
+from app.infrastructure.repository.mysql_gita_repository import MysqlGitaRepository
+from app.infrastructure.repository.snapshot_chapter_repository import (
+    SnapshotChapterRepository,
+)
+from app.infrastructure.repository.snapshot_gita_repository import (
+    SnapshotGitaRepository,
+)
+from app.infrastructure.searcher.chapter_searcher import ChapterSearcher
+from app.infrastructure.searcher.gita_searcher import GitaSearcher
+from app.infrastructure.searcher.index_factory import IndexConfig
+
+
+def repositories(source: str, json_dir: str):
+    if source == "json":
+        snapshot = CorpusSnapshot(json_corpus_loader(json_dir))
+        return SnapshotChapterRepository(snapshot), SnapshotGitaRepository(snapshot)
+    client = MysqlClient(pool_size=1)
+    return MysqlChapterRepository(client), MysqlGitaRepository(client)
+
+
+def print_progress(name: str):
+    def progress(state: dict):
+        print(
+            f"  {name}: {state['done']}/{state['total']} texts, "
+            f"{state['texts_per_second']} texts/sec",
+            flush=True,
+        )
+
+    return progress
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--searcher", choices=["chapter", "gita", "all"], default="all")
+    parser.add_argument("--source", default=getenv("CORPUS_SOURCE") or "mysql")
+    parser.add_argument(
+        "--json-dir", default=getenv("CORPUS_JSON_DIR") or "data/3-fine-verse_number"
+    )
+    parser.add_argument("--backend", default=getenv("EMBEDDING_BACKEND") or "torch")
+    parser.add_argument("--workers", type=int, default=1)
+    # 0 splits the cores between the workers
+    parser.add_argument("--threads-per-worker", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--shard-size", type=int, default=1024)
+    parser.add_argument("--checkpoint-dir", default="data/model/checkpoints")
+    parser.add_argument("--keep-checkpoints", action="store_true")
+    args = parser.parse_args()
+
+    threads = args.threads_per_worker or max(
+        1, (os.cpu_count() or 1) // max(1, args.workers)
+    )
+    chapter_repository, gita_repository = repositories(args.source, args.json_dir)
+    targets = [
+        (
+            "chapter",
+            ChapterSearcher,
+            getenv("CHAPTER_EMBEDDING_MODEL") or ChapterSearcher.DEFAULT_MODEL,
+            chapter_repository.get_all,
+        ),
+        (
+            "gita",
+            GitaSearcher,
+            getenv("GITA_EMBEDDING_MODEL") or GitaSearcher.DEFAULT_MODEL,
+            gita_repository.get_all,
+        ),
+    ]
+
+    for name, searcher_type, model, load in targets:
+        if args.searcher not in ("all", name):
+            continue
+
+        encoder = PipelineEncoder(
+            model,
+            backend=args.backend,
+            workers=args.workers,
+            threads_per_worker=threads,
+            batch_size=args.batch_size,
+            shard_size=args.shard_size,
+            checkpoint_dir=os.path.join(args.checkpoint_dir, name),
+            on_progress=print_progress(name),
+        )
+        searcher = searcher_type(
+            index_config=IndexConfig.from_env(name.upper()), encoder=encoder
+        )
+        rows = load()
+        print(f"== {name}: {len(rows)} rows, model {encoder.model_id}")
+
+        start_time = time.perf_counter()
+        try:
+            searcher.build_index(rows)
+        finally:
+            encoder.close()
+        print(f"  index: {searcher.last_update}")
+        print(f"  encoder: {encoder.stats()}")
+        print(f"  total: {time.perf_counter() - start_time:.1f}s")
+
+        if not args.keep_checkpoints:
+            encoder.clear_checkpoints()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Calibrate the GitaSearcher relevance cutoff from a labeled query set and
+store it next to the index (data/model/gita.index.json).
+
+The threshold is chosen to maximize F1 on the "relevant" class, so queries
+that only barely retrieve anything are rejected before an LLM generation
+is spent on them.
+
+Run from the repository root, with the same GITA_* index settings as the
+server:
+
+    python -m scripts.searcher.calibrate_threshold [--dry-run]
+"""
+
+import argparse
+from typing import List, Tuple
+
+from dotenv import load_dotenv
+
+from app.infrastructure.searcher.gita_searcher import GitaSearcher
+from app.infrastructure.searcher.index_factory import (
+    IndexConfig,
+    write_relevance_threshold,
+)
+from app.infrastructure.util.json_loader import load_json
+
+
+def evaluate(
+    scored: List[Tuple[float, bool]], config: IndexConfig, threshold: float
+) -> dict:
+    config.relevance_threshold = threshold
+    tp = sum(1 for s, r in scored if r and config.is_relevant(s))
+    fp = sum(1 for s, r in scored if not r and config.is_relevant(s))
+    fn = sum(1 for s, r in scored if r and not config.is_relevant(s))
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0
+    return {
+        "threshold": round(threshold, 4),
+        "precision": round(precision, 4),
+        "recall": round(recall, 4),
+        "f1": round(f1, 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", default="data/searcher/relevance_queries.json")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    load_dotenv()
+    searcher = GitaSearcher(index_config=IndexConfig.from_env("GITA"))
+    if not searcher.builded():
+        print("Build the index first (run the server once).")
+        return
+    searcher.load_index()
+
+    samples = load_json(args.queries)
+    scored = [(searcher.score(x["query"]), x["relevant"]) for x in samples]
+
+    config = IndexConfig.from_dict(searcher.index_config.to_dict())
+    print("current", evaluate(scored, config, searcher.index_config.threshold()))
+
+    # Candidate cutoffs halfway between consecutive observed scores
+    scores = sorted(s for s, _ in scored)
+    candidates = [(a + b) / 2 for a, b in zip(scores, scores[1:])] or scores
+    best = max(
+        (evaluate(scored, config, x) for x in candidates),
+        key=lambda x: (x["f1"], x["precision"]),
+    )
+    print("calibrated", best)
+
+    if not args.dry_run:
+        write_relevance_threshold(
+            searcher.path_prefix + "gita.index", best["threshold"]
+        )
+        print("Saved to", searcher.path_prefix + "gita.index.json")
+
+
+if __name__ == "__main__":
+    main()
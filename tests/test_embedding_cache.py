@@ -0,0 +1,79 @@
+from app.infrastructure.encoder import embedding_cache
+from app.infrastructure.encoder.embedding_cache import EmbeddingCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def key(cache, text):
+    return cache.key("model", True, text)
+
+
+def test_keys_ignore_case_and_whitespace():
+    cache = EmbeddingCache()
+    assert key(cache, "  Apa itu   KARMA ") == key(cache, "apa itu karma")
+    assert cache.key("other-model", True, "karma") != key(cache, "karma")
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = EmbeddingCache(max_size=2)
+    cache.set(key(cache, "a"), [1])
+    cache.set(key(cache, "b"), [2])
+    # "a" becomes the most recently used
+    assert cache.get(key(cache, "a")) == [1]
+    cache.set(key(cache, "c"), [3])
+
+    assert cache.get(key(cache, "b")) is None
+    assert cache.get(key(cache, "a")) == [1]
+    assert cache.get(key(cache, "c")) == [3]
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["size"] == 2
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(embedding_cache.time, "time", clock)
+    cache = EmbeddingCache(ttl=60)
+    cache.set(key(cache, "a"), [1])
+
+    clock.now += 59
+    assert cache.get(key(cache, "a")) == [1]
+    clock.now += 2
+    assert cache.get(key(cache, "a")) is None
+
+    stats = cache.stats()
+    assert stats["expirations"] == 1
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+    assert stats["size"] == 0
+
+
+def test_processes_sharing_a_file_merge_their_entries(tmp_path):
+    path = str(tmp_path / "embeddings.pkl")
+    first = EmbeddingCache(persist_path=path)
+    second = EmbeddingCache(persist_path=path)
+    first.set(key(first, "a"), [1])
+    second.set(key(second, "b"), [2])
+    first.save()
+    second.save()
+
+    loaded = EmbeddingCache(persist_path=path)
+    assert loaded.get(key(loaded, "a")) == [1]
+    assert loaded.get(key(loaded, "b")) == [2]
+
+
+def test_expired_entries_are_not_loaded(tmp_path, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(embedding_cache.time, "time", clock)
+    path = str(tmp_path / "embeddings.pkl")
+    cache = EmbeddingCache(ttl=60, persist_path=path)
+    cache.set(key(cache, "a"), [1])
+    cache.save()
+
+    clock.now += 61
+    assert EmbeddingCache(ttl=60, persist_path=path).stats()["size"] == 0
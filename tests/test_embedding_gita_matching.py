@@ -0,0 +1,32 @@
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("rich")
+
+from app.infrastructure.matcher.embedding_gita_matching import (  # noqa: E402
+    extract_parameters,
+)
+
+
+@pytest.mark.parametrize(
+    "action, text, parameters",
+    [
+        ("get_chapter_summary", "ringkasan bab 18", {"chapter": 18}),
+        ("get_specific_verse", "bab 3 sloka 4", {"chapter": 3, "verse": 4}),
+    ],
+)
+def test_extracts_existing_references(action, text, parameters):
+    assert extract_parameters(action, text, {}) == parameters
+
+
+@pytest.mark.parametrize(
+    "action, text",
+    [
+        ("get_chapter_summary", "ringkasan bab 25"),
+        ("get_chapter_summary", "bab 0"),
+        ("get_specific_verse", "bab 19 sloka 1"),
+        ("get_specific_verse", "bab 2 sloka 0"),
+    ],
+)
+def test_out_of_range_references_are_rejected(action, text):
+    assert extract_parameters(action, text, {}) is None
@@ -0,0 +1,98 @@
+import hashlib
+
+import pytest
+
+np = pytest.importorskip("numpy")
+faiss = pytest.importorskip("faiss")
+
+from app.infrastructure.searcher.artifact_store import open_artifact, write_artifact
+from app.infrastructure.searcher.incremental_index import entry_table, update_index
+from app.infrastructure.searcher.index_factory import IndexConfig
+
+
+class CountingEncoder:
+    """Deterministic embeddings, remembers which texts it was asked for."""
+
+    def __init__(self):
+        self.texts = []
+
+    def __call__(self, texts):
+        self.texts += texts
+        return np.array(
+            [
+                np.frombuffer(hashlib.sha256(x.encode()).digest(), dtype=np.uint8)[
+                    :8
+                ].astype("float32")
+                for x in texts
+            ]
+        )
+
+
+def save(directory, update, keys):
+    write_artifact(
+        str(directory),
+        {"model": "test"},
+        {"entries": entry_table(update, keys)},
+        {"embeddings": update.embeddings},
+    )
+    return open_artifact(str(directory))
+
+
+def nearest_id(index, encode, text):
+    _, I = index.search(encode([text]), 1)
+    return int(I[0][0])
+
+
+@pytest.mark.parametrize("index_type", ["flat", "hnsw"])
+def test_update_reuses_reencodes_and_removes(tmp_path, index_type):
+    config = IndexConfig(type=index_type)
+    encode = CountingEncoder()
+    keys = ["a", "b", "c"]
+    first = update_index(config, keys, ["alpha", "beta", "gamma"], encode)
+    assert first.encoded == 3
+    previous = save(tmp_path / "meta", first, keys)
+
+    encode.texts = []
+    second = update_index(
+        config,
+        ["a", "b", "d"],
+        ["alpha", "beta changed", "delta"],
+        encode,
+        previous=previous,
+        previous_index=first.index,
+    )
+
+    # "a" is unchanged, "b" changed, "c" is gone and "d" is new
+    assert encode.texts == ["beta changed", "delta"]
+    assert (second.reused, second.encoded, second.removed) == (1, 2, 1)
+    assert second.in_place == (index_type == "flat")
+    assert second.ids[:2].tolist() == first.ids[:2].tolist()
+    assert second.ids[2] not in first.ids.tolist()
+    assert second.index.ntotal == 3
+    np.testing.assert_array_equal(second.embeddings[0], first.embeddings[0])
+
+    removed_id = int(first.ids[2])
+    assert nearest_id(second.index, encode, "gamma") != removed_id
+    assert nearest_id(second.index, encode, "beta changed") == int(first.ids[1])
+    # The serving index is never patched
+    assert first.index.ntotal == 3
+
+
+def test_unchanged_corpus_encodes_nothing(tmp_path):
+    config = IndexConfig()
+    encode = CountingEncoder()
+    first = update_index(config, ["a", "b"], ["alpha", "beta"], encode)
+    previous = save(tmp_path / "meta", first, ["a", "b"])
+
+    encode.texts = []
+    second = update_index(
+        config, ["a", "b"], ["alpha", "beta"], encode, previous, first.index
+    )
+    assert encode.texts == []
+    assert second.reused == 2
+
+
+def test_empty_corpus_without_previous_artifact():
+    update = update_index(IndexConfig(type="ivf_flat"), [], [], CountingEncoder())
+    assert update.index.ntotal == 0
+    assert update.embeddings.shape == (0, 8)
@@ -0,0 +1,74 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from app.infrastructure.searcher.artifact_store import open_artifact, write_artifact
+from app.infrastructure.searcher.lexical_index import (
+    LexicalIndex,
+    build_lexical_tables,
+    reciprocal_rank_fusion,
+    tokenize,
+)
+
+DOCUMENTS = [
+    "Arjuna melihat kedua pasukan di medan Kurukṣetra",
+    "Orang yang sthita-prajña tidak goyah oleh suka dan duka",
+    "Lakukan kewajibanmu tanpa terikat pada hasil, itulah karma-yoga",
+    "Pikiran yang gelisah dikendalikan dengan latihan dan ketidakterikatan",
+    "Sañjaya menceritakan kepada Dhṛtarāṣṭra apa yang dilakukan Arjuna",
+]
+
+
+@pytest.fixture
+def lexical(tmp_path):
+    directory = str(tmp_path / "lexical")
+    write_artifact(directory, {}, build_lexical_tables(DOCUMENTS))
+    artifact = open_artifact(directory)
+    return LexicalIndex(artifact.tables["lexicon"], artifact.tables["lexical_docs"])
+
+
+def test_tokenize_folds_diacritics_and_joins_compounds():
+    assert tokenize("Sthita-Prajña yang") == ["sthita", "prajna", "sthitaprajna"]
+    assert tokenize("Sthita-Prajña", compounds=False) == ["sthita", "prajna"]
+
+
+def test_search_ranks_exact_terms_first(lexical):
+    hits, known = lexical.search("sanjaya", 3)
+    assert hits[0][0] == 4
+    assert known
+
+    hits, _ = lexical.search("sthitaprajna", 3)
+    assert [doc for doc, _ in hits] == [1]
+
+
+def test_search_reports_unknown_words(lexical):
+    hits, known = lexical.search("arjuna moksha", 5)
+    assert {doc for doc, _ in hits} == {0, 4}
+    assert not known
+
+
+def test_search_without_known_terms(lexical):
+    assert lexical.search("moksha", 5) == ([], False)
+
+
+def test_scores_are_descending(lexical):
+    hits, _ = lexical.search("arjuna pikiran karma", 5)
+    scores = [score for _, score in hits]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_rrf_prefers_ids_ranked_by_both():
+    dense = [10, 11, 12]
+    lexical = [12, 13, 10]
+    fused = reciprocal_rank_fusion([dense, lexical], k=60)
+    assert fused[:2] == [10, 12]
+    assert set(fused) == {10, 11, 12, 13}
+
+
+def test_rrf_fuses_lexical_hits_with_dense_ranking(lexical):
+    hits, _ = lexical.search("arjuna", 5)
+    lexical_ids = [doc for doc, _ in hits]
+    # A dense ranking that agrees on document 4 lifts it above document 0
+    fused = reciprocal_rank_fusion([[4, 2], lexical_ids], k=60)
+    assert fused[0] == 4
+    assert set(fused) == {0, 2, 4}
@@ -0,0 +1,58 @@
+from app.infrastructure.repository import random_id_table
+from app.infrastructure.repository.random_id_table import RandomIdTable
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class Loader:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return list(self.rows)
+
+
+def test_samples_by_group_without_duplicates():
+    table = RandomIdTable(Loader([(1, 1), (2, 1), (3, 2), (4, 2), (5, 2)]))
+
+    sample = table.sample(10)
+    assert sorted(sample) == [1, 2, 3, 4, 5]
+    assert sorted(table.sample(2, group=2)) in ([3, 4], [3, 5], [4, 5])
+    assert table.sample(3, group=1) in ([1, 2], [2, 1])
+    assert table.sample(3, group=99) == []
+
+
+def test_reloads_after_ttl(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(random_id_table.time, "monotonic", clock)
+    loader = Loader([(1, 1)])
+    table = RandomIdTable(loader, ttl=60)
+
+    assert table.sample(5) == [1]
+    loader.rows = [(1, 1), (2, 1)]
+    clock.now += 59
+    assert table.sample(5) == [1]
+    assert loader.calls == 1
+
+    clock.now += 2
+    assert sorted(table.sample(5)) == [1, 2]
+    assert loader.calls == 2
+
+
+def test_invalidate_forces_a_reload():
+    loader = Loader([(1, 1)])
+    table = RandomIdTable(loader, ttl=3600)
+    table.sample(1)
+
+    loader.rows = [(7, 3)]
+    table.invalidate()
+    assert table.sample(1, group=3) == [7]
+    assert loader.calls == 2
@@ -0,0 +1,62 @@
+import pytest
+
+from app.infrastructure.matcher.intent_evaluation import is_same_intent
+from app.infrastructure.matcher.rule_intent_parser import RuleIntentParser
+from app.infrastructure.util.json_loader import load_json
+
+SAMPLES = load_json("data/intent/intent_eval.json")
+
+
+@pytest.fixture
+def parser():
+    return RuleIntentParser()
+
+
+@pytest.mark.parametrize("sample", SAMPLES, ids=[x["text"] for x in SAMPLES])
+def test_evaluation_samples_are_answered_correctly_or_deferred(parser, sample):
+    result = parser.parse(sample["text"])
+    # None hands the question to the LLM classifier, a wrong answer doesn't
+    assert result is None or is_same_intent(sample, result)
+
+
+def test_answers_most_supported_samples(parser):
+    supported = [x for x in SAMPLES if x["action"] != "unsupported_query"]
+    answered = [x for x in supported if parser.parse(x["text"])]
+    assert len(answered) / len(supported) >= 0.9
+
+
+@pytest.mark.parametrize(
+    "text, action, parameters",
+    [
+        ("Gita 7.7", "get_specific_verse", {"chapter": 7, "verse": 7}),
+        ("bab 18 sloka 66", "get_specific_verse", {"chapter": 18, "verse": 66}),
+        ("bab 18", "get_chapter_summary", {"chapter": 18}),
+        ("ringkasan bab satu", "get_chapter_summary", {"chapter": 1}),
+    ],
+)
+def test_boundary_references(parser, text, action, parameters):
+    result = parser.parse(text)
+    assert result["action"] == action
+    assert result["parameters"] == parameters
+    assert result["source"] == "rule"
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "bab 0",
+        "bab 19",
+        "ringkasan bab 25",
+        "bab 20 sloka 1",
+        "bab 2 sloka 0",
+        "gita 19.1",
+        "gita 2.0",
+        "berapa jumlah sloka pada bab 30?",
+    ],
+)
+def test_out_of_range_references_fall_through(parser, text):
+    assert parser.parse(text) is None
+
+
+def test_summary_needs_every_word_known(parser):
+    assert parser.parse("ringkasan bab 2 karma") is None
@@ -0,0 +1,107 @@
+import asyncio
+import json
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+fastapi = pytest.importorskip("fastapi")
+
+from app.infrastructure.http.static_response_cache import (
+    StaticResponseCache,
+    etag_matches,
+)
+
+
+def request(if_none_match=None):
+    headers = {"if-none-match": if_none_match} if if_none_match else {}
+    return SimpleNamespace(headers=headers)
+
+
+def respond(cache, key, build, if_none_match=None):
+    return asyncio.run(cache.respond(request(if_none_match), key, build))
+
+
+def test_body_and_etag_are_stored_once():
+    cache = StaticResponseCache(max_age=60)
+    calls = []
+
+    def build():
+        calls.append(1)
+        return {"chapter": 1, "name": "Arjuna Viṣāda Yoga"}
+
+    first = respond(cache, "chapter:1", build)
+    second = respond(cache, "chapter:1", build)
+
+    assert len(calls) == 1
+    assert first.body == second.body
+    assert json.loads(first.body)["name"] == "Arjuna Viṣāda Yoga"
+    assert first.headers["ETag"] == second.headers["ETag"]
+    assert first.headers["Cache-Control"] == "public, max-age=60"
+    assert cache.stats()["hits"] == 1
+
+
+def test_matching_if_none_match_returns_304():
+    cache = StaticResponseCache()
+    etag = respond(cache, "chapter", lambda: [1, 2]).headers["ETag"]
+
+    response = respond(cache, "chapter", lambda: [1, 2], if_none_match=etag)
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+
+    response = respond(cache, "chapter", lambda: [1, 2], if_none_match='"other"')
+    assert response.status_code == 200
+    assert cache.stats()["not_modified"] == 1
+
+
+def test_weak_and_listed_etags_match():
+    assert etag_matches('W/"abc"', '"abc"')
+    assert etag_matches('"x", "abc"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches(None, '"abc"')
+
+
+@pytest.mark.parametrize("payload", [None, []])
+def test_missing_items_are_404_and_not_cached(payload):
+    cache = StaticResponseCache()
+    with pytest.raises(fastapi.HTTPException) as error:
+        respond(cache, "chapter:99:verse", lambda: payload)
+    assert error.value.status_code == 404
+    assert cache.stats()["entries"] == 0
+
+
+def test_clear_starts_a_new_generation():
+    cache = StaticResponseCache()
+    respond(cache, "chapter:1", lambda: {"v": 1})
+    cache.clear()
+
+    response = respond(cache, "chapter:1", lambda: {"v": 2})
+    assert json.loads(response.body) == {"v": 2}
+    assert cache.stats()["generation"] == 1
+
+
+def test_build_racing_a_reload_is_not_stored():
+    cache = StaticResponseCache()
+    started = threading.Event()
+    release = threading.Event()
+
+    def build():
+        started.set()
+        release.wait(5)
+        return {"v": "old"}
+
+    async def scenario():
+        pending = asyncio.ensure_future(cache.respond(request(), "chapter:1", build))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+        # The corpus is reloaded while the old payload is being built
+        cache.clear()
+        release.set()
+        return await pending
+
+    response = asyncio.run(scenario())
+    # Answered once, but never served to later requests
+    assert json.loads(response.body) == {"v": "old"}
+    assert cache.stats()["entries"] == 0
+    assert json.loads(respond(cache, "chapter:1", lambda: {"v": "new"}).body) == {
+        "v": "new"
+    }